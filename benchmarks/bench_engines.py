@@ -0,0 +1,84 @@
+"""
+Compares the threaded and async runner engines against the local SEMOSS stand-in.
+
+Usage: `python -m benchmarks.bench_engines --latency 0.2 --cells 10 100 1000`
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from benchmarks.semoss_standin import run_in_background
+from src.runners.runners import (
+    TestSelections,
+    run_selected_tests,
+    run_selected_tests_async,
+)
+from src.runners.scheduler import ProviderLimits, provider_scheduler
+from src.utils.models import Capabilities, DeploymentKeys, Model
+
+STANDIN_PROVIDER = "SEMOSS Stand-in"
+
+
+def make_models(count: int) -> list[Model]:
+    return [
+        Model(
+            name=f"Stand-in Model {i}",
+            type="OpenAI",
+            id=str(uuid.uuid4()),
+            client=STANDIN_PROVIDER,
+            capabilities=Capabilities(),
+        )
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=9099)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--cells", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--max-concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    # The stand-in has no quota, so only the engines' own concurrency limits apply
+    provider_scheduler.limits[STANDIN_PROVIDER] = ProviderLimits(
+        max_concurrency=10_000, rate_per_second=1_000_000, burst=10_000
+    )
+
+    url = run_in_background(args.port, args.latency)
+    deployment_keys = DeploymentKeys(
+        url=url, access_key="standin", secret_key="standin", openai_secret_key="standin"
+    )
+    # Standard Text Test has no confirmer step, so each model is exactly one cell
+    selections = TestSelections(standard_text_test=True)
+
+    print(f"{'cells':>6} {'engine':>9} {'seconds':>9} {'cells/s':>9}")
+    for cells in args.cells:
+        models = make_models(cells)
+
+        start = time.perf_counter()
+        run_selected_tests(
+            models, selections, deployment_keys, batch_size=args.batch_size
+        )
+        threaded = time.perf_counter() - start
+        print(f"{cells:>6} {'threaded':>9} {threaded:>9.2f} {cells / threaded:>9.1f}")
+
+        start = time.perf_counter()
+        asyncio.run(
+            run_selected_tests_async(
+                models,
+                selections,
+                deployment_keys,
+                max_concurrency=args.max_concurrency,
+            )
+        )
+        async_seconds = time.perf_counter() - start
+        print(
+            f"{cells:>6} {'async':>9} {async_seconds:>9.2f} {cells / async_seconds:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Runs the concurrency-sweep load test against stand-in engines with different capacities,
+to check that the knee it reports is where each engine saturates.
+
+Usage: `python -m benchmarks.bench_load --capacity 4 16 --step-seconds 5 --output load.json`
+"""
+
+import argparse
+import json
+from benchmarks.bench_engines import STANDIN_PROVIDER, make_models
+from benchmarks.semoss_standin import (
+    EngineProfile,
+    LatencyProfile,
+    StandinProfile,
+    run_in_background,
+)
+from src.runners.load_test import LoadTest, LoadTestConfig
+from src.utils.models import DeploymentKeys
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=9099)
+    parser.add_argument("--latency", type=float, default=0.2)
+    # One stand-in engine per capacity, ie. the concurrency its knee should be at
+    parser.add_argument("--capacity", type=int, nargs="+", default=[4, 16])
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64]
+    )
+    parser.add_argument("--step-seconds", type=float, default=5)
+    parser.add_argument("--output", help="Where to save the results as JSON")
+    args = parser.parse_args()
+
+    models = make_models(len(args.capacity))
+    for model, capacity in zip(models, args.capacity):
+        model.name = f"{STANDIN_PROVIDER} capacity {capacity}"
+    profile = StandinProfile(
+        engines={
+            model.id: EngineProfile(
+                latency=LatencyProfile(seconds=args.latency), capacity=capacity
+            )
+            for model, capacity in zip(models, args.capacity)
+        }
+    )
+    url = run_in_background(args.port, profile=profile)
+    deployment_keys = DeploymentKeys(
+        url=url, access_key="standin", secret_key="standin", openai_secret_key="standin"
+    )
+
+    load_test = LoadTest(
+        models,
+        LoadTestConfig(concurrency=args.concurrency, step_seconds=args.step_seconds),
+    )
+    load_test.run(deployment_keys)
+    status = load_test.to_status()
+
+    print(f"{'engine':>28} {'conc':>5} {'req/s':>8} {'p50':>7} {'p95':>7} {'errors':>7}")
+    for engine in status.engines:
+        for step in engine.steps:
+            print(
+                f"{engine.model_name:>28} {step.concurrency:>5} {step.throughput:>8.1f} "
+                f"{step.latency['p50']:>7.3f} {step.latency['p95']:>7.3f} "
+                f"{step.error_rate:>7.1%}"
+            )
+        print(f"{engine.model_name:>28} knee: {engine.knee} ({engine.knee_reason})")
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(status.model_dump(), output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+"""
+End-to-end benchmark of the runner against the local SEMOSS and OpenAI stand-ins, across a
+matrix of model counts, test selections, concurrency settings, latency profiles and engines.
+
+Each scenario runs in its own process, with both stand-ins, so peak RSS and thread counts
+aren't carried over from one scenario to the next (they include the stand-ins).
+
+Usage:
+    python -m benchmarks.bench_suite --output baseline.json
+    python -m benchmarks.bench_suite --output current.json --compare baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from itertools import product
+from pathlib import Path
+from typing import Dict, List
+
+PROFILES = {
+    "fast": {"default": {"latency": {"seconds": 0.05}}},
+    "lognormal": {
+        "default": {
+            "latency": {"distribution": "lognormal", "seconds": 0.3, "sigma": 0.5}
+        }
+    },
+    "heavy-tail": {
+        "default": {
+            "latency": {
+                "distribution": "pareto",
+                "seconds": 0.1,
+                "alpha": 1.5,
+                "max_seconds": 10,
+            },
+            "error_rate": 0.02,
+            "rate_limit_rate": 0.01,
+        }
+    },
+}
+
+SELECTIONS = {
+    "text": ["standard_text_test"],
+    "all": [
+        "standard_text_test",
+        "basic_param_values",
+        "prompt_with_image_urls",
+        "tool_calling_with_tool_choice",
+        "structured_json_test",
+    ],
+}
+
+# Higher is worse for every metric except cells_per_second
+COMPARED_METRICS = [
+    "makespan_seconds",
+    "cells_per_second",
+    "p50_seconds",
+    "p95_seconds",
+    "p99_seconds",
+    "peak_rss_mb",
+]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def run_scenario(scenario: dict) -> dict:
+    """Runs one scenario in this process and returns its metrics."""
+    from benchmarks import openai_standin, semoss_standin
+
+    os.environ["OPENAI_BASE_URL"] = openai_standin.run_in_background(
+        free_port(), scenario["confirmer_latency"]
+    )
+    url = semoss_standin.run_in_background(
+        free_port(),
+        profile=semoss_standin.StandinProfile(**scenario["profile_definition"]),
+    )
+
+    from benchmarks.bench_engines import STANDIN_PROVIDER, make_models
+    from src.confirmations.pipeline import confirmation_stage
+    from src.runners import runners
+    from src.runners.plan import build_execution_plan
+    from src.runners.scheduler import ProviderLimits, provider_scheduler
+    from src.utils.models import DeploymentKeys
+    from src.utils.timings import percentile
+
+    provider_scheduler.limits[STANDIN_PROVIDER] = ProviderLimits(
+        max_concurrency=10_000, rate_per_second=1_000_000, burst=10_000
+    )
+    deployment_keys = DeploymentKeys(
+        url=url, access_key="standin", secret_key="standin", openai_secret_key="standin"
+    )
+    models = make_models(scenario["models"])
+    selections = runners.TestSelections(
+        **{test: True for test in SELECTIONS[scenario["selection"]]}
+    )
+
+    # A cell's latency runs from the start of its generation to its final response,
+    # confirmation included
+    started: Dict[tuple, float] = {}
+    finished: Dict[tuple, float] = {}
+    response_cells: Dict[int, tuple] = {}
+    generate_test_cell = runners.generate_test_cell
+    submit_confirmation = confirmation_stage.submit
+
+    def timed_generate(cell, *args, **kwargs):
+        key = (cell.model.id, cell.test)
+        started[key] = time.perf_counter()
+        response, pending = generate_test_cell(cell, *args, **kwargs)
+        if pending:
+            response_cells[id(response)] = key
+        else:
+            finished[key] = time.perf_counter()
+        return response, pending
+
+    def timed_submit(response, pending):
+        key = response_cells.pop(id(response))
+        future = submit_confirmation(response, pending)
+        future.add_done_callback(
+            lambda _: finished.__setitem__(key, time.perf_counter())
+        )
+        return future
+
+    runners.generate_test_cell = timed_generate
+    confirmation_stage.submit = timed_submit
+
+    peak_threads = threading.active_count()
+    sampling = True
+
+    def sample_threads():
+        nonlocal peak_threads
+        while sampling:
+            peak_threads = max(peak_threads, threading.active_count())
+            time.sleep(0.05)
+
+    sampler = threading.Thread(target=sample_threads, daemon=True)
+    sampler.start()
+
+    start = time.perf_counter()
+    if scenario["engine"] == "threaded":
+        results = runners.run_selected_tests(
+            models, selections, deployment_keys, batch_size=scenario["concurrency"]
+        )
+    else:
+        results = asyncio.run(
+            runners.run_selected_tests_async(
+                models,
+                selections,
+                deployment_keys,
+                max_concurrency=scenario["concurrency"],
+            )
+        )
+    makespan = time.perf_counter() - start
+    sampling = False
+    sampler.join()
+
+    latencies = [finished[key] - started[key] for key in finished if key in started]
+    responses = [
+        response
+        for test_results in results.values()
+        for _, response in test_results
+        if response is not None
+    ]
+    cells = len(build_execution_plan(models, selections).cells)
+    return {
+        "cells": cells,
+        "passed": sum(response.success for response in responses),
+        "makespan_seconds": makespan,
+        "cells_per_second": cells / makespan if makespan else 0.0,
+        "p50_seconds": percentile(latencies, 50),
+        "p95_seconds": percentile(latencies, 95),
+        "p99_seconds": percentile(latencies, 99),
+        "mean_seconds": statistics.fmean(latencies) if latencies else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+        "peak_threads": peak_threads,
+    }
+
+
+def scenario_name(scenario: dict) -> str:
+    return (
+        f"{scenario['engine']}/{scenario['profile']}/{scenario['selection']}"
+        f"/models={scenario['models']}/concurrency={scenario['concurrency']}"
+    )
+
+
+def run_in_subprocess(scenario: dict) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            # Every scenario pays the confirmer, and never asks yfinance for the price
+            "CONFIRMATION_CACHE_PATH": os.path.join(tmp, "confirmations.sqlite3"),
+            "CONFIRMATION_CACHE_BYPASS": "true",
+            "REFERENCE_PRICES": json.dumps({"META": 600}),
+            "PIXEL_CASSETTE_MODE": "off",
+        }
+        process = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.bench_suite",
+                "--scenario",
+                json.dumps(scenario),
+            ],
+            capture_output=True,
+            text=True,
+            env=env,
+            cwd=Path(__file__).resolve().parent.parent,
+        )
+    if process.returncode != 0:
+        raise RuntimeError(f"{scenario_name(scenario)} failed:\n{process.stderr}")
+    # The runner prints as it goes, the metrics are the last line
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Returns a line for every metric that got worse than the baseline by more than tolerance."""
+    regressions = []
+    baseline_scenarios = {
+        scenario["name"]: scenario["metrics"] for scenario in baseline["scenarios"]
+    }
+    for scenario in current["scenarios"]:
+        before = baseline_scenarios.get(scenario["name"])
+        if not before:
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = before.get(metric), scenario["metrics"].get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = -change if metric == "cells_per_second" else change
+            if worse > tolerance:
+                regressions.append(
+                    f"{scenario['name']} {metric}: {old:.3f} -> {new:.3f} ({change:+.1%})"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--models", type=int, nargs="+", default=[10, 50])
+    parser.add_argument(
+        "--selections", nargs="+", choices=list(SELECTIONS), default=["text", "all"]
+    )
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[16, 64])
+    parser.add_argument(
+        "--profiles",
+        nargs="+",
+        default=["fast", "lognormal"],
+        help=f"Built-in profiles ({', '.join(PROFILES)}) or stand-in profile JSON files",
+    )
+    parser.add_argument(
+        "--engines", nargs="+", choices=["async", "threaded"], default=["async"]
+    )
+    parser.add_argument("--confirmer-latency", type=float, default=0.1)
+    parser.add_argument("--output", help="Where to save the results as JSON")
+    parser.add_argument("--compare", help="Baseline results JSON to compare against")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="Relative change past which a metric is flagged as a regression",
+    )
+    parser.add_argument("--scenario", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scenario:
+        print(json.dumps(run_scenario(json.loads(args.scenario))))
+        return
+
+    scenarios = []
+    for engine, profile, selection, models, concurrency in product(
+        args.engines, args.profiles, args.selections, args.models, args.concurrency
+    ):
+        if profile in PROFILES:
+            definition = PROFILES[profile]
+        else:
+            with open(profile) as profile_file:
+                definition = json.load(profile_file)
+            profile = Path(profile).stem
+        scenario = {
+            "engine": engine,
+            "profile": profile,
+            "profile_definition": definition,
+            "selection": selection,
+            "models": models,
+            "concurrency": concurrency,
+            "confirmer_latency": args.confirmer_latency,
+        }
+        metrics = run_in_subprocess(scenario)
+        name = scenario_name(scenario)
+        scenarios.append({"name": name, "scenario": scenario, "metrics": metrics})
+        print(
+            f"{name:<55} {metrics['makespan_seconds']:>7.2f}s "
+            f"{metrics['cells_per_second']:>7.1f} cells/s "
+            f"p50 {metrics['p50_seconds']:.2f}s p95 {metrics['p95_seconds']:.2f}s "
+            f"p99 {metrics['p99_seconds']:.2f}s "
+            f"rss {metrics['peak_rss_mb']:.0f}MB threads {metrics['peak_threads']}"
+        )
+
+    results = {"created_at": time.time(), "scenarios": scenarios}
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Checks that a pixel cassette replays runs that don't match the recording: a run is
+recorded against the local SEMOSS stand-in, then replayed without it on fewer models and
+on the same models again. The room pool batches CreateRoom and RemoveUserRoom by timing
+and by how many cells run, so every replayed cell must pass without a cassette miss.
+
+Usage: `python -m benchmarks.check_cassettes`, exits with status 1 if a check fails.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from typing import List
+
+WORK_DIR = tempfile.mkdtemp(prefix="check-cassettes-")
+os.environ["CONFIRMATION_CACHE_BYPASS"] = "true"
+os.environ["REFERENCE_PRICES"] = json.dumps({"META": 600})
+os.environ["RUN_HISTORY_PATH"] = os.path.join(WORK_DIR, "run_history.sqlite3")
+os.environ["CHECKPOINT_DIR"] = os.path.join(WORK_DIR, "checkpoints")
+os.environ["PIXEL_CASSETTE_PATH"] = os.path.join(WORK_DIR, "pixels.cassette.jsonl.gz")
+
+from benchmarks import openai_standin, semoss_standin  # noqa: E402
+from benchmarks.bench_engines import make_models  # noqa: E402
+
+SELECTIONS = {"standard_text_test": True, "tool_calling_with_tool_choice": True}
+
+
+def run(models, deployment_keys, mode: str) -> List[str]:
+    """Runs every selected test on the models, returns the cells that failed."""
+    from src.runners.runners import TestSelections, run_selected_tests_async
+
+    os.environ["PIXEL_CASSETTE_MODE"] = mode
+    results = asyncio.run(
+        run_selected_tests_async(models, TestSelections(**SELECTIONS), deployment_keys)
+    )
+    failures = []
+    for model in models:
+        for test in SELECTIONS:
+            response = getattr(results[model.name], test)
+            if response is None or not response.success:
+                failures.append(
+                    f"{mode} of {len(models)} models: {model.name} {test} failed: "
+                    f"{response.response if response else 'no result'}"
+                )
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=9099)
+    parser.add_argument("--models", type=int, default=3)
+    args = parser.parse_args()
+
+    os.environ["OPENAI_BASE_URL"] = openai_standin.run_in_background(args.port + 1)
+    semoss_url = semoss_standin.run_in_background(args.port)
+    models = make_models(args.models)
+
+    from src.clients.cassettes import get_cassette
+    from src.utils.models import DeploymentKeys
+
+    deployment_keys = DeploymentKeys(
+        url=semoss_url, access_key="standin", secret_key="standin", openai_secret_key="k"
+    )
+    problems = run(models, deployment_keys, "record")
+
+    # Replay never reaches the stand-in, a pixel that isn't in the cassette fails its cell
+    problems += run(models[:-1], deployment_keys, "replay")
+    problems += run(models, deployment_keys, "replay")
+    stats = get_cassette(os.environ["PIXEL_CASSETTE_PATH"], "replay").stats()
+    if stats["misses"]:
+        problems.append(f"replay: {stats['misses']} cassette misses")
+
+    for problem in problems:
+        print(problem)
+    print(f"{stats['replayed']} pixels replayed, {'FAILED' if problems else 'OK'}")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Checks batched and offline confirmation end to end against the local SEMOSS and OpenAI
+stand-ins: every cell must get the verdict for its own response, and an offline job's
+Batch API file must round trip through `parse_batch_results` and the job's
+`apply_batch_results` into its results and the run history.
+
+Half the stand-in engines answer with "FAIL", which the OpenAI stand-in rejects, and each
+verdict quotes the response it judges, so a verdict matched to the wrong cell shows. A
+batch whose cache lookups raise must still fail every one of its cells rather than hang.
+
+Usage: `python -m benchmarks.check_confirmations`, exits with status 1 if a check fails.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from typing import Dict, List
+
+WORK_DIR = tempfile.mkdtemp(prefix="check-confirmations-")
+os.environ["CONFIRMATION_CACHE_BYPASS"] = "true"
+os.environ["REFERENCE_PRICES"] = json.dumps({"META": 600})
+os.environ["RUN_HISTORY_PATH"] = os.path.join(WORK_DIR, "run_history.sqlite3")
+os.environ["CHECKPOINT_DIR"] = os.path.join(WORK_DIR, "checkpoints")
+
+from benchmarks import openai_standin, semoss_standin  # noqa: E402
+from benchmarks.bench_engines import make_models  # noqa: E402
+
+SELECTIONS = {"prompt_with_image_urls": True, "tool_calling_with_tool_choice": True}
+
+
+def expected_success(model_name: str, test: str, failing: set) -> bool:
+    # Tool calling is confirmed on the stand-in's fixed tool result
+    return test == "tool_calling_with_tool_choice" or model_name not in failing
+
+
+def check_results(
+    results: Dict[str, object], models, failing: set, mode: str
+) -> List[str]:
+    """The cells whose verdict doesn't belong to their own response."""
+    problems = []
+    for model in models:
+        for test in SELECTIONS:
+            response = getattr(results[model.name], test)
+            if response is None:
+                problems.append(f"{mode}: {model.name} {test} has no result")
+                continue
+            if response.success != expected_success(model.name, test, failing):
+                problems.append(
+                    f"{mode}: {model.name} {test} success={response.success}, "
+                    f"confirmation: {response.confirmation_response}"
+                )
+            quoted = (response.confirmation_response or "").removeprefix(
+                "Stand-in verdict for: "
+            )
+            if not response.response.startswith(quoted):
+                problems.append(
+                    f"{mode}: {model.name} {test} got the verdict for another "
+                    f"response: {response.confirmation_response}"
+                )
+    return problems
+
+
+def batch_api_output(batch_file: str, openai_url: str) -> List[str]:
+    """Sends each request of a Batch API input file, like the Batch API would."""
+    from openai import OpenAI
+
+    client = OpenAI(base_url=openai_url, api_key="standin")
+    lines = []
+    with open(batch_file) as input_file:
+        for line in input_file:
+            request = json.loads(line)
+            body = client.post(
+                request["url"].removeprefix("/v1"), body=request["body"], cast_to=object
+            )
+            lines.append(
+                json.dumps(
+                    {
+                        "custom_id": request["custom_id"],
+                        "response": {"status_code": 200, "body": body},
+                    }
+                )
+            )
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=9099)
+    parser.add_argument("--models", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=3)
+    args = parser.parse_args()
+
+    openai_url = openai_standin.run_in_background(args.port + 1)
+    os.environ["OPENAI_BASE_URL"] = openai_url
+    models = make_models(args.models)
+    failing = {model.name for model in models[1::2]}
+    semoss_url = semoss_standin.run_in_background(
+        args.port,
+        profile=semoss_standin.StandinProfile(
+            engines={
+                model.id: semoss_standin.EngineProfile(
+                    response=(
+                        "FAIL {engine} can't see the image"
+                        if model.name in failing
+                        else "{engine} sees a car"
+                    )
+                )
+                for model in models
+            }
+        ),
+    )
+
+    from src.confirmations.pipeline import (
+        PendingConfirmation,
+        confirmation_stage,
+        parse_batch_results,
+        pending_offline,
+    )
+    from src.history.run_history import CellFilters, run_history
+    from src.runners.jobs import job_store
+    from src.runners.plan import build_execution_plan
+    from src.runners.runners import TestSelections, run_selected_tests_async
+    from src.utils.models import DeploymentKeys
+
+    deployment_keys = DeploymentKeys(
+        url=semoss_url, access_key="standin", secret_key="standin", openai_secret_key="k"
+    )
+    selections = TestSelections(**SELECTIONS)
+    problems = []
+
+    confirmation_stage.mode = "batched"
+    confirmation_stage.batch_size = args.batch_size
+    batches_before = confirmation_stage.batches_sent
+    results = asyncio.run(run_selected_tests_async(models, selections, deployment_keys))
+    problems += check_results(results, models, failing, "batched")
+    if confirmation_stage.batches_sent == batches_before:
+        problems.append("batched: no batch was sent")
+
+    def broken_lookup(self):
+        raise ValueError("cached confirmation no longer validates")
+
+    lookup = PendingConfirmation.lookup
+    PendingConfirmation.lookup = broken_lookup
+    try:
+        results = asyncio.run(
+            asyncio.wait_for(
+                run_selected_tests_async(models, selections, deployment_keys), 60
+            )
+        )
+    except asyncio.TimeoutError:
+        problems.append("batched: a batch whose lookup raised never finished")
+    else:
+        for model in models:
+            response = results[model.name].prompt_with_image_urls
+            if response is None or response.success:
+                problems.append(
+                    f"batched: {model.name} passed though its lookup raised"
+                )
+    finally:
+        PendingConfirmation.lookup = lookup
+
+    confirmation_stage.mode = "offline"
+    confirmation_stage.batch_file = os.path.join(WORK_DIR, "confirmation_batch.jsonl")
+
+    async def run_offline_job():
+        job = job_store.submit(
+            build_execution_plan(models, selections), deployment_keys
+        )
+        await job.task
+        return job
+
+    job = asyncio.run(run_offline_job())
+    pending = [
+        (model_name, test)
+        for model_name, test_results in job.results.items()
+        for test, response in test_results
+        if response is not None and pending_offline(response)
+    ]
+    if len(pending) != len(models) * len(SELECTIONS):
+        problems.append(f"offline: {len(pending)} cells pending confirmation")
+    run_history.flush()
+    if run_history.cells(CellFilters(run_id=job.job_id)):
+        problems.append("offline: pending cells were recorded in the run history")
+
+    output = batch_api_output(confirmation_stage.batch_file, openai_url)
+    applied = job.apply_batch_results(parse_batch_results(output))
+    if applied != len(pending):
+        problems.append(f"offline: {applied} of {len(pending)} results applied")
+    problems += check_results(job.results, models, failing, "offline")
+
+    run_history.flush()
+    recorded = run_history.cells(CellFilters(run_id=job.job_id), limit=1000)
+    if len(recorded) != len(pending):
+        problems.append(f"offline: {len(recorded)} cells in the run history")
+    for cell in recorded:
+        if cell["success"] != expected_success(cell["model_name"], cell["test"], failing):
+            problems.append(f"offline: history has the wrong verdict for {cell}")
+    status = run_history.run(job.job_id)["status"]
+    if status != "completed":
+        problems.append(f"offline: the run's history status is {status}")
+
+    for problem in problems:
+        print(problem)
+    print(
+        f"{len(models) * len(SELECTIONS)} cells per mode, "
+        f"{'FAILED' if problems else 'OK'}"
+    )
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
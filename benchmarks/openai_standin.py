@@ -0,0 +1,105 @@
+"""
+Minimal local stand-in for the OpenAI Responses API, enough for `responses.parse` with the
+confirmer's structured outputs. Every response is confirmed unless it's empty or contains
+"FAIL", so runs are deterministic. Each verdict quotes the start of the response it judges,
+and batched verdicts come back in reverse order, so a verdict matched to the wrong response
+shows.
+
+Run it on its own with `python -m benchmarks.openai_standin --port 9098` and point
+`OPENAI_BASE_URL` at `http://localhost:9098/v1`.
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import threading
+import time
+import uuid
+import uvicorn
+from fastapi import FastAPI, Request
+
+app = FastAPI(title="OpenAI Stand-in")
+app.state.latency_seconds = 0.0
+app.state.requests = 0
+
+BATCH_RESPONSE = re.compile(r'<response id="([^"]+)">\n(.*?)\n</response>', re.DOTALL)
+
+
+def verdict(model_response: str) -> dict:
+    confirmed = bool(model_response.strip()) and "FAIL" not in model_response
+    return {
+        "confirmation_response": f"Stand-in verdict for: {model_response[:120]}",
+        "confirmed": confirmed,
+    }
+
+
+def parsed_output(body: dict) -> dict:
+    text = body.get("input", "")
+    if not isinstance(text, str):
+        text = json.dumps(text)
+    schema = body.get("text", {}).get("format", {}).get("schema", {})
+    if "verdicts" in schema.get("properties", {}):
+        return {
+            "verdicts": [
+                {"id": response_id, **verdict(model_response)}
+                for response_id, model_response in reversed(
+                    BATCH_RESPONSE.findall(text)
+                )
+            ]
+        }
+    return verdict(text)
+
+
+@app.post("/v1/responses")
+async def responses(request: Request):
+    body = await request.json()
+    app.state.requests += 1
+    await asyncio.sleep(app.state.latency_seconds)
+    return {
+        "id": f"resp_{uuid.uuid4().hex}",
+        "object": "response",
+        "created_at": int(time.time()),
+        "model": body.get("model"),
+        "status": "completed",
+        "parallel_tool_calls": False,
+        "tool_choice": "auto",
+        "tools": [],
+        "output": [
+            {
+                "id": f"msg_{uuid.uuid4().hex}",
+                "type": "message",
+                "role": "assistant",
+                "status": "completed",
+                "content": [
+                    {
+                        "type": "output_text",
+                        "text": json.dumps(parsed_output(body)),
+                        "annotations": [],
+                    }
+                ],
+            }
+        ],
+    }
+
+
+def run_in_background(port: int, latency_seconds: float = 0.0) -> str:
+    """Starts the stand-in on a daemon thread and returns its base url."""
+    app.state.latency_seconds = latency_seconds
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}/v1"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=9098)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    app.state.latency_seconds = args.latency
+    uvicorn.run(app, host="0.0.0.0", port=args.port)
@@ -0,0 +1,326 @@
+"""
+Local stand-in for a SEMOSS Monolith, covering what `ai_server.ServerClient` and the
+testers use: the access key login, and the CreateRoom, AskPlayground, UpdateRoomOptions,
+RunMCPTool, AddToolExecution and RemoveUserRoom pixels.
+
+Latency, errors, rate limits and timeouts are configured per engine ID with a profile:
+{
+    "default": {"latency": {"distribution": "lognormal", "seconds": 0.8, "sigma": 0.6}},
+    "engines": {
+        "<engine id>": {
+            "latency": {"distribution": "pareto", "seconds": 0.5, "alpha": 1.5},
+            "error_rate": 0.02,
+            "rate_limit_rate": 0.05,
+            "timeout_rate": 0.01,
+            "capacity": 8,
+            "response": "{engine} answers: {prompt}"
+        }
+    },
+    "credentials": {"<access key>": "<secret key>"},
+    "seed": 42
+}
+
+Run it on its own with `python -m benchmarks.semoss_standin --port 9099 --profile profile.json`
+and point `DEPLOYMENT_URL` at `http://localhost:9099/Monolith/api`. The profile can also be
+changed while it runs with `PUT /standin/profile`, and `GET /standin/stats` counts pixels.
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import math
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Dict, Literal, Optional
+import uvicorn
+from fastapi import FastAPI, Request, Response
+from pydantic import BaseModel, Field
+
+PIXEL_NAME = re.compile(r"\s*([A-Za-z]+)\(")
+ENGINE = re.compile(r'engine=\["([^"]*)"\]')
+PROMPT = re.compile(r"<encode>(.*?)</encode>", re.DOTALL)
+
+DEFAULT_RESPONSE = "Paris is the capital of France."
+TOOL_RESULT = "The current price of META is $600.00."
+
+STRUCTURED_CONTENT = json.dumps(
+    {
+        "players": [
+            {
+                "name": "Bruno Fernandes",
+                "position": "Midfielder",
+                "country": "Portugal",
+                "skill": 88,
+            },
+            {
+                "name": "Kobbie Mainoo",
+                "position": "Midfielder",
+                "country": "England",
+                "skill": 80,
+            },
+        ]
+    }
+)
+
+
+class LatencyProfile(BaseModel):
+    """
+    - constant: always `seconds`
+    - uniform: between `seconds` and `high`
+    - lognormal: median `seconds`, spread `sigma`
+    - pareto: heavy tail starting at `seconds`, lower `alpha` means a heavier tail
+    Samples are capped at max_seconds.
+    """
+
+    distribution: Literal["constant", "uniform", "lognormal", "pareto"] = "constant"
+    seconds: float = Field(0.0, ge=0)
+    high: Optional[float] = None
+    sigma: float = Field(0.5, gt=0)
+    alpha: float = Field(1.5, gt=0)
+    max_seconds: float = Field(120.0, gt=0)
+
+    def sample(self, rng: random.Random) -> float:
+        if self.distribution == "uniform":
+            seconds = rng.uniform(self.seconds, self.high or self.seconds)
+        elif self.distribution == "lognormal":
+            seconds = rng.lognormvariate(math.log(self.seconds or 1e-6), self.sigma)
+        elif self.distribution == "pareto":
+            seconds = self.seconds * rng.paretovariate(self.alpha)
+        else:
+            seconds = self.seconds
+        return min(seconds, self.max_seconds)
+
+
+class EngineProfile(BaseModel):
+    latency: LatencyProfile = LatencyProfile()
+    error_rate: float = Field(0.0, ge=0, le=1)
+    rate_limit_rate: float = Field(0.0, ge=0, le=1)
+    timeout_rate: float = Field(0.0, ge=0, le=1)
+    timeout_seconds: float = Field(30.0, ge=0)
+    # Model calls the engine serves at once, the rest queue for a slot. None is unlimited
+    capacity: Optional[int] = Field(None, ge=1)
+    # Formatted with {engine} and {prompt}
+    response: str = DEFAULT_RESPONSE
+
+
+class StandinProfile(BaseModel):
+    default: EngineProfile = EngineProfile()
+    engines: Dict[str, EngineProfile] = {}
+    # Accepted access key -> secret key pairs, any credentials are accepted when empty
+    credentials: Dict[str, str] = {}
+    seed: Optional[int] = None
+
+    def for_engine(self, engine: str) -> EngineProfile:
+        return self.engines.get(engine, self.default)
+
+
+class PixelError(Exception):
+    pass
+
+
+app = FastAPI(title="SEMOSS Stand-in")
+app.state.profile = StandinProfile()
+app.state.rng = random.Random()
+app.state.pixels = Counter()
+app.state.outcomes = Counter()
+app.state.slots = {}
+
+
+def set_profile(profile: StandinProfile):
+    app.state.profile = profile
+    app.state.rng = random.Random(profile.seed)
+    app.state.slots = {}
+
+
+def split_pixels(expression: str) -> list[str]:
+    """Splits an expression with several `Pixel(...);` statements, ignoring quoted `;`"""
+    pixels, depth, quoted, current = [], 0, False, []
+    for char in expression:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        if char == ";" and depth == 0 and not quoted:
+            pixels.append("".join(current))
+            current = []
+            continue
+        current.append(char)
+    if "".join(current).strip():
+        pixels.append("".join(current))
+    return [pixel.strip() for pixel in pixels if pixel.strip()]
+
+
+async def model_call(engine: str):
+    """
+    Waits for one of the engine's slots, then its latency, and fails the call at the
+    profile's rates.
+    """
+    profile = app.state.profile.for_engine(engine)
+    if profile.capacity is None:
+        return await sample_model_call(engine, profile)
+    slots = app.state.slots.get(engine)
+    if slots is None:
+        slots = app.state.slots[engine] = asyncio.Semaphore(profile.capacity)
+    async with slots:
+        return await sample_model_call(engine, profile)
+
+
+async def sample_model_call(engine: str, profile: EngineProfile):
+    rng = app.state.rng
+    roll = rng.random()
+    if roll < profile.timeout_rate:
+        app.state.outcomes["timeout"] += 1
+        await asyncio.sleep(profile.timeout_seconds)
+        raise PixelError(f"Request to engine {engine} timed out")
+    await asyncio.sleep(profile.latency.sample(rng))
+    roll -= profile.timeout_rate
+    if roll < profile.rate_limit_rate:
+        app.state.outcomes["rate_limited"] += 1
+        raise PixelError("429 Too Many Requests: rate limit exceeded")
+    roll -= profile.rate_limit_rate
+    if roll < profile.error_rate:
+        app.state.outcomes["error"] += 1
+        raise PixelError(f"Engine {engine} failed to generate a response")
+    app.state.outcomes["ok"] += 1
+    return profile
+
+
+async def pixel_output(pixel: str):
+    match = PIXEL_NAME.match(pixel)
+    # The SDK opens its insight with "META | true"
+    name = match.group(1) if match else pixel.split(" ")[0]
+    app.state.pixels[name] += 1
+    engine_match = ENGINE.search(pixel)
+    engine = engine_match.group(1) if engine_match else ""
+
+    if name == "CreateRoom":
+        return {"roomId": str(uuid.uuid4())}
+    if name == "AskPlayground":
+        profile = await model_call(engine)
+        if "mcpToolID" in pixel or "tool_choice" in pixel:
+            tool_call = {
+                "id": f"call_{uuid.uuid4().hex[:24]}",
+                "name": "get_stock_price",
+                "arguments": {"ticker": "META"},
+            }
+            return {"responseMessage": {"content": "", "tool_responses": [tool_call]}}
+        prompt_match = PROMPT.search(pixel)
+        content = profile.response.format(
+            engine=engine, prompt=prompt_match.group(1) if prompt_match else ""
+        )
+        # Structured output requests get a response that matches the test's schema
+        if '"schema"' in pixel:
+            content = STRUCTURED_CONTENT
+        return {"responseMessage": {"content": content, "tool_responses": []}}
+    if name == "RunMCPTool":
+        return TOOL_RESULT
+    if name == "AddToolExecution":
+        await model_call(engine)
+        return {"response": TOOL_RESULT}
+    if name in ("UpdateRoomOptions", "RemoveUserRoom", "META"):
+        return True
+    raise PixelError(f"The stand-in doesn't support {name}")
+
+
+def authorized(request: Request) -> bool:
+    credentials = app.state.profile.credentials
+    if not credentials:
+        return True
+    if request.cookies.get("SEMOSS_STANDIN") in credentials:
+        return True
+    header = request.headers.get("Authorization", "")
+    if not header.startswith("Basic "):
+        return False
+    access_key, _, secret_key = (
+        base64.b64decode(header.removeprefix("Basic ")).decode().partition(":")
+    )
+    return credentials.get(access_key) == secret_key
+
+
+@app.get("/Monolith/api/config")
+async def config(request: Request, response: Response):
+    if not authorized(request):
+        return {"csrf": False}
+    response.set_cookie("SEMOSS_STANDIN", next(iter(app.state.profile.credentials), ""))
+    return {"loginDetails": {"NATIVE": "standin"}, "csrf": False}
+
+
+@app.post("/Monolith/api/engine/runPixel")
+async def run_pixel(request: Request, response: Response):
+    if not authorized(request):
+        response.status_code = 401
+        return {"errorMessage": "User is not logged in"}
+
+    form = await request.form()
+    expression = form.get("expression", "")
+    insight_id = form.get("insightId")
+    if insight_id == "new":
+        insight_id = str(uuid.uuid4())
+
+    pixel_returns = []
+    for pixel in split_pixels(expression):
+        try:
+            output, operation = await pixel_output(pixel), "OPERATION"
+        except PixelError as e:
+            output, operation = str(e), "ERROR"
+        pixel_returns.append({"output": output, "operationType": [operation]})
+
+    return {"insightID": insight_id, "pixelReturn": pixel_returns}
+
+
+@app.put("/standin/profile")
+async def put_profile(profile: StandinProfile):
+    set_profile(profile)
+    return profile
+
+
+@app.get("/standin/stats")
+async def stats():
+    return {"pixels": app.state.pixels, "outcomes": app.state.outcomes}
+
+
+def constant_profile(latency_seconds: float) -> StandinProfile:
+    return StandinProfile(
+        default=EngineProfile(latency=LatencyProfile(seconds=latency_seconds))
+    )
+
+
+def run_in_background(
+    port: int,
+    latency_seconds: float = 0.0,
+    profile: Optional[StandinProfile] = None,
+) -> str:
+    """
+    Starts the stand-in on a daemon thread and returns its Monolith API url. Without a
+    profile every engine answers after a constant latency_seconds.
+    """
+    set_profile(profile or constant_profile(latency_seconds))
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}/Monolith/api"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=9099)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--profile", help="JSON file with the latency/failure profile")
+    args = parser.parse_args()
+
+    if args.profile:
+        with open(args.profile) as profile_file:
+            set_profile(StandinProfile(**json.load(profile_file)))
+    else:
+        set_profile(constant_profile(args.latency))
+    uvicorn.run(app, host="0.0.0.0", port=args.port)
@@ -0,0 +1,31 @@
+import { NextResponse } from "next/server";
+
+export async function POST(
+  _request: Request,
+  { params }: { params: Promise<{ id: string }> }
+) {
+  try {
+    const { id } = await params;
+    const backendUrl =
+      process.env.NEXT_PUBLIC_BACKEND_URL || "http://localhost:8888";
+    const response = await fetch(`${backendUrl}/api/load-tests/${id}/cancel`, {
+      method: "POST",
+    });
+
+    if (!response.ok) {
+      return NextResponse.json(
+        { error: "Failed to cancel load test" },
+        { status: response.status }
+      );
+    }
+
+    const data = await response.json();
+    return NextResponse.json(data);
+  } catch (error) {
+    console.error("Error cancelling load test:", error);
+    return NextResponse.json(
+      { error: "Internal server error" },
+      { status: 500 }
+    );
+  }
+}
@@ -0,0 +1,50 @@
+import { NextResponse } from "next/server";
+
+export async function POST(request: Request) {
+  try {
+    const {
+      models,
+      test,
+      concurrency,
+      step_seconds,
+      url,
+      access_key,
+      secret_key,
+    } = await request.json();
+
+    const backendUrl =
+      process.env.NEXT_PUBLIC_BACKEND_URL || "http://localhost:8888";
+    const params = new URLSearchParams();
+    if (test) params.set("test", test);
+    if (step_seconds) params.set("step_seconds", String(step_seconds));
+    if (url) params.set("url", url);
+    if (access_key) params.set("access_key", access_key);
+    if (secret_key) params.set("secret_key", secret_key);
+
+    const response = await fetch(
+      `${backendUrl}/api/load-tests?${params.toString()}`,
+      {
+        method: "POST",
+        headers: {
+          "Content-Type": "application/json",
+        },
+        body: JSON.stringify({ models, concurrency }),
+      }
+    );
+
+    const data = await response.json();
+    if (!response.ok) {
+      return NextResponse.json(
+        { error: data.detail || "Failed to start load test" },
+        { status: response.status }
+      );
+    }
+    return NextResponse.json(data);
+  } catch (error) {
+    console.error("Error starting load test:", error);
+    return NextResponse.json(
+      { error: "Internal server error" },
+      { status: 500 }
+    );
+  }
+}
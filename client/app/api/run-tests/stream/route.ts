@@ -0,0 +1,55 @@
+export async function POST(request: Request) {
+  try {
+    const {
+      models,
+      tests,
+      confirmer_model,
+      url,
+      access_key,
+      secret_key,
+      deadline_seconds,
+      rerun,
+      resume_run_id,
+    } = await request.json();
+
+    const backendUrl =
+      process.env.NEXT_PUBLIC_BACKEND_URL || "http://localhost:8888";
+    const params = new URLSearchParams();
+    if (confirmer_model) params.set("confirmer_model", confirmer_model);
+    if (url) params.set("url", url);
+    if (access_key) params.set("access_key", access_key);
+    if (secret_key) params.set("secret_key", secret_key);
+    if (deadline_seconds) params.set("deadline_seconds", String(deadline_seconds));
+    if (rerun) params.set("rerun", rerun);
+    if (resume_run_id) params.set("resume_run_id", resume_run_id);
+
+    const response = await fetch(
+      `${backendUrl}/api/run-tests/stream?${params.toString()}`,
+      {
+        method: "POST",
+        headers: {
+          "Content-Type": "application/json",
+        },
+        body: JSON.stringify({ models, tests }),
+      }
+    );
+
+    if (!response.ok || !response.body) {
+      return Response.json(
+        { error: "Failed to run tests" },
+        { status: response.status }
+      );
+    }
+
+    // Pass the NDJSON events through as they arrive instead of buffering them
+    return new Response(response.body, {
+      headers: {
+        "Content-Type": "application/x-ndjson",
+        "Cache-Control": "no-cache",
+      },
+    });
+  } catch (error) {
+    console.error("Error running tests:", error);
+    return Response.json({ error: "Internal server error" }, { status: 500 });
+  }
+}
@@ -0,0 +1,245 @@
+"use client";
+
+import { useEffect, useState } from "react";
+import { useRouter } from "next/navigation";
+import { useTestStore } from "@/lib/store";
+import type { LoadTestStatus } from "@/lib/types";
+import { LoadTestChart } from "@/components/load-test-chart";
+import { Button } from "@/components/ui/button";
+import { Card } from "@/components/ui/card";
+import { Input } from "@/components/ui/input";
+import { Label } from "@/components/ui/label";
+import { Progress } from "@/components/ui/progress";
+import { Alert, AlertDescription } from "@/components/ui/alert";
+import { AlertCircle, ArrowLeft, Download, Gauge, Loader2 } from "lucide-react";
+
+const POLL_INTERVAL_MS = 2000;
+
+export default function LoadTestPage() {
+  const router = useRouter();
+  const { selectedModels, selectedTests, deploymentUrl, accessKey, secretKey } =
+    useTestStore();
+
+  const [concurrency, setConcurrency] = useState("1, 2, 4, 8, 16, 32, 64");
+  const [stepSeconds, setStepSeconds] = useState("30");
+  const [loadTest, setLoadTest] = useState<LoadTestStatus | null>(null);
+  const [error, setError] = useState<string | null>(null);
+
+  // The load test runs a single test, the first one selected
+  const test = selectedTests[0] ?? "Standard Text Test";
+  const isRunning = loadTest?.status === "running";
+
+  useEffect(() => {
+    if (!loadTest || loadTest.status !== "running") return;
+    const timer = setTimeout(async () => {
+      try {
+        const response = await fetch(`/api/load-tests/${loadTest.load_test_id}`);
+        if (!response.ok) throw new Error("Failed to fetch load test");
+        setLoadTest(await response.json());
+      } catch (err) {
+        setError(err instanceof Error ? err.message : "Failed to fetch load test");
+      }
+    }, POLL_INTERVAL_MS);
+    return () => clearTimeout(timer);
+  }, [loadTest]);
+
+  const handleStart = async () => {
+    const levels = concurrency
+      .split(",")
+      .map((level) => parseInt(level.trim(), 10))
+      .filter((level) => level > 0);
+    if (selectedModels.length === 0 || levels.length === 0) {
+      setError("Please select at least one model and one concurrency level");
+      return;
+    }
+
+    setError(null);
+    try {
+      const response = await fetch("/api/load-tests", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({
+          models: selectedModels,
+          test,
+          concurrency: levels,
+          step_seconds: parseFloat(stepSeconds),
+          url: deploymentUrl,
+          access_key: accessKey,
+          secret_key: secretKey,
+        }),
+      });
+      const data = await response.json();
+      if (!response.ok) throw new Error(data.error || "Failed to start load test");
+      setLoadTest(data);
+    } catch (err) {
+      setError(err instanceof Error ? err.message : "Failed to start load test");
+    }
+  };
+
+  const handleCancel = async () => {
+    if (!loadTest) return;
+    await fetch(`/api/load-tests/${loadTest.load_test_id}/cancel`, {
+      method: "POST",
+    });
+  };
+
+  const handleExportJSON = () => {
+    if (!loadTest) return;
+    const blob = new Blob([JSON.stringify(loadTest, null, 2)], {
+      type: "application/json",
+    });
+    const url = URL.createObjectURL(blob);
+    const link = document.createElement("a");
+    link.href = url;
+    link.download = `load-test-${new Date().toISOString().split("T")[0]}.json`;
+    document.body.appendChild(link);
+    link.click();
+    document.body.removeChild(link);
+    URL.revokeObjectURL(url);
+  };
+
+  return (
+    <main className="min-h-screen bg-background p-4 md:p-8">
+      <div className="max-w-6xl mx-auto space-y-6">
+        <div className="flex items-center justify-between">
+          <div>
+            <h1 className="text-4xl font-bold mb-2 flex items-center gap-3">
+              <Gauge className="w-8 h-8 text-accent" />
+              Load Test
+            </h1>
+            <p className="text-muted-foreground">
+              Runs {test} closed loop against {selectedModels.length} selected
+              model{selectedModels.length === 1 ? "" : "s"} at each concurrency
+              level, one model at a time
+            </p>
+          </div>
+          {loadTest && (
+            <Button onClick={handleExportJSON} variant="outline" className="gap-2">
+              <Download className="w-4 h-4" />
+              Export JSON
+            </Button>
+          )}
+        </div>
+
+        {error && (
+          <Alert
+            variant="destructive"
+            className="bg-destructive/10 border-destructive/30 text-destructive"
+          >
+            <AlertCircle className="h-4 w-4" />
+            <AlertDescription>{error}</AlertDescription>
+          </Alert>
+        )}
+
+        <Card className="p-6 bg-card border-border/50 shadow-sm">
+          <div className="grid grid-cols-1 md:grid-cols-3 gap-4 items-end">
+            <div className="space-y-2">
+              <Label htmlFor="concurrency">Concurrency levels</Label>
+              <Input
+                id="concurrency"
+                value={concurrency}
+                onChange={(e) => setConcurrency(e.target.value)}
+                disabled={isRunning}
+              />
+            </div>
+            <div className="space-y-2">
+              <Label htmlFor="step-seconds">Seconds per level</Label>
+              <Input
+                id="step-seconds"
+                type="number"
+                min={1}
+                value={stepSeconds}
+                onChange={(e) => setStepSeconds(e.target.value)}
+                disabled={isRunning}
+              />
+            </div>
+            {isRunning ? (
+              <Button onClick={handleCancel} variant="outline" className="gap-2">
+                <Loader2 className="w-4 h-4 animate-spin" />
+                Cancel
+              </Button>
+            ) : (
+              <Button onClick={handleStart} className="gap-2">
+                <Gauge className="w-4 h-4" />
+                Start Load Test
+              </Button>
+            )}
+          </div>
+        </Card>
+
+        {loadTest && (
+          <div className="space-y-2">
+            <div className="flex justify-between text-sm text-muted-foreground">
+              <span>
+                {loadTest.steps_completed} of {loadTest.steps_total} levels
+                complete
+                {loadTest.current && ` (running ${loadTest.current})`}
+                {!isRunning && ` (${loadTest.status})`}
+              </span>
+              {loadTest.error && (
+                <span className="text-destructive">{loadTest.error}</span>
+              )}
+            </div>
+            <Progress
+              value={
+                loadTest.steps_total
+                  ? (loadTest.steps_completed / loadTest.steps_total) * 100
+                  : 100
+              }
+            />
+          </div>
+        )}
+
+        {loadTest && loadTest.engines.some((engine) => engine.steps.length) && (
+          <>
+            <div className="grid grid-cols-1 lg:grid-cols-2 gap-6">
+              <LoadTestChart
+                engines={loadTest.engines}
+                title="Throughput (successful requests/s)"
+                unit="/s"
+                value={(step) => step.throughput}
+              />
+              <LoadTestChart
+                engines={loadTest.engines}
+                title="p95 Latency"
+                unit="s"
+                value={(step) => step.latency.p95}
+              />
+            </div>
+
+            <Card className="p-6 bg-card border-border/50 shadow-sm">
+              <h3 className="text-lg font-semibold mb-4">Knees</h3>
+              <div className="space-y-3">
+                {loadTest.engines.map((engine) => (
+                  <div
+                    key={engine.model_id}
+                    className="flex justify-between gap-4 text-sm border-b border-border/50 pb-3"
+                  >
+                    <span className="font-medium">{engine.model_name}</span>
+                    <span className="text-muted-foreground text-right">
+                      {engine.knee !== null
+                        ? `Concurrency ${engine.knee}: ${engine.knee_reason}`
+                        : engine.knee_reason ||
+                          (engine.steps.length
+                            ? "No knee within the tested levels"
+                            : "Not run yet")}
+                    </span>
+                  </div>
+                ))}
+              </div>
+            </Card>
+          </>
+        )}
+
+        <Button
+          onClick={() => router.push("/")}
+          variant="outline"
+          className="gap-2 bg-transparent"
+        >
+          <ArrowLeft className="w-4 h-4" />
+          Back to Test Selection
+        </Button>
+      </div>
+    </main>
+  );
+}
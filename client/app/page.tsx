@@ -3,6 +3,7 @@
 import { useEffect, useState } from "react";
 import { useRouter } from "next/navigation";
 import { useTestStore } from "@/lib/store";
+import { readRunEvents } from "@/lib/run-events";
 import { ModelSelector } from "@/components/model-selector";
 import { TestSelector } from "@/components/test-selector";
 import { DeploymentConfig } from "@/components/deployment-config";
@@ -10,7 +11,7 @@ import { ConfirmerModelSelector } from "@/components/confirmer-model-selector";
 import { ThemeToggle } from "@/components/theme-toggle";
 import { Button } from "@/components/ui/button";
 import { Card } from "@/components/ui/card";
-import { AlertCircle, Loader2, Zap } from "lucide-react";
+import { AlertCircle, Gauge, Loader2, Zap } from "lucide-react";
 import { Alert, AlertDescription } from "@/components/ui/alert";
 
 export default function Home() {
@@ -30,7 +31,10 @@ export default function Home() {
     setDeploymentConfig,
     setIsLoading,
     setError,
-    setResults,
+    startRun,
+    mergeResult,
+    setProgress,
+    setSummary,
   } = useTestStore();
 
   const [isLoadingInitial, setIsLoadingInitial] = useState(true);
@@ -68,7 +72,7 @@ export default function Home() {
     setError(null);
 
     try {
-      const response = await fetch("/api/run-tests", {
+      const response = await fetch("/api/run-tests/stream", {
         method: "POST",
         headers: { "Content-Type": "application/json" },
         body: JSON.stringify({
@@ -82,9 +86,26 @@ export default function Home() {
       });
 
       if (!response.ok) throw new Error("Failed to run tests");
-      const data = await response.json();
-      setResults(data);
-      router.push("/results");
+
+      // Results are merged into the store as each cell finishes, the results
+      // page is shown as soon as the plan arrives
+      await readRunEvents(response, (event) => {
+        switch (event.event) {
+          case "plan":
+            startRun(event.plan);
+            router.push("/results");
+            break;
+          case "result":
+            mergeResult(event.model_name, event.test, event.result);
+            break;
+          case "progress":
+            setProgress(event);
+            break;
+          case "summary":
+            setSummary(event);
+            break;
+        }
+      });
     } catch (err) {
       setError(err instanceof Error ? err.message : "Failed to run tests");
     } finally {
@@ -203,6 +224,16 @@ export default function Home() {
                       )}
                       {isLoading ? "Running Tests..." : "Run Tests"}
                     </Button>
+                    <Button
+                      onClick={() => router.push("/load-test")}
+                      disabled={isLoading || selectedModels.length === 0}
+                      size="lg"
+                      variant="outline"
+                      className="w-full gap-2 mt-3"
+                    >
+                      <Gauge className="w-4 h-4" />
+                      Load Test Selected Models
+                    </Button>
                   </div>
                 </div>
               </Card>
@@ -4,12 +4,15 @@ import { useRouter } from "next/navigation";
 import { useTestStore } from "@/lib/store";
 import { ModelResults } from "@/components/model-results";
 import { ExportButtons } from "@/components/export-buttons";
+import { TimingSummaryCard } from "@/components/timing-summary";
 import { Button } from "@/components/ui/button";
+import { Progress } from "@/components/ui/progress";
 import { ArrowLeft } from "lucide-react";
 
 export default function ResultsPage() {
   const router = useRouter();
-  const { results, resetSelections } = useTestStore();
+  const { results, progress, summary, isLoading, resetSelections } =
+    useTestStore();
 
   if (!results) {
     return (
@@ -37,12 +40,40 @@ export default function ResultsPage() {
           <div>
             <h1 className="text-4xl font-bold mb-2">Test Results</h1>
             <p className="text-muted-foreground">
-              Completed on {new Date().toLocaleString()}
+              {isLoading
+                ? "Running tests..."
+                : `Completed on ${new Date().toLocaleString()}`}
             </p>
           </div>
           <ExportButtons results={results} />
         </div>
 
+        {progress && (
+          <div className="mb-8 space-y-2">
+            <div className="flex justify-between text-sm text-muted-foreground">
+              <span>
+                {progress.completed} of {progress.total} tests complete
+                {summary &&
+                  ` (${summary.passed} passed, ${summary.failed} failed${
+                    summary.timed_out ? `, ${summary.timed_out} timed out` : ""
+                  }, ${summary.skipped} skipped)`}
+              </span>
+              <span>{progress.elapsed_seconds.toFixed(1)}s</span>
+            </div>
+            <Progress
+              value={
+                progress.total ? (progress.completed / progress.total) * 100 : 100
+              }
+            />
+          </div>
+        )}
+
+        {summary?.timings && (
+          <div className="mb-8">
+            <TimingSummaryCard timings={summary.timings} />
+          </div>
+        )}
+
         <div className="space-y-6 mb-8">
           {Object.entries(results).map(([modelName, testResults]) => (
             <ModelResults
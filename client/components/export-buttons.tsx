@@ -28,6 +28,7 @@ export function ExportButtons({ results }: ExportButtonsProps) {
   const handleExportExcel = () => {
     const workbook = XLSX.utils.book_new();
     const sheetData: any[] = [];
+    const timingData: any[] = [];
 
     Object.entries(results).forEach(([modelName, testResults]) => {
       Object.entries(testResults).forEach(([testKey, result]) => {
@@ -40,6 +41,23 @@ export function ExportButtons({ results }: ExportButtonsProps) {
             Client: result.client,
             "Pixel Calls": result.pixel?.join("; ") || "-",
             "Confirmation Response": result.confirmation_response || "-",
+            "Total Seconds": (result.timings ?? []).reduce(
+              (total, timing) => total + timing.seconds,
+              0
+            ),
+            Retries: result.retries ?? 0,
+            Hedges: result.hedges ?? 0,
+            "Timed Out": result.timed_out ? "Yes" : "No",
+            "Circuit Open": result.circuit_open ? "Yes" : "No",
+          });
+          (result.timings ?? []).forEach((timing) => {
+            timingData.push({
+              Model: modelName,
+              Test: testKey.replace(/_/g, " "),
+              Phase: timing.phase,
+              Name: timing.name || "-",
+              Seconds: timing.seconds,
+            });
           });
         }
       });
@@ -47,6 +65,13 @@ export function ExportButtons({ results }: ExportButtonsProps) {
 
     const worksheet = XLSX.utils.json_to_sheet(sheetData);
     XLSX.utils.book_append_sheet(workbook, worksheet, "Test Results");
+    if (timingData.length > 0) {
+      XLSX.utils.book_append_sheet(
+        workbook,
+        XLSX.utils.json_to_sheet(timingData),
+        "Timings"
+      );
+    }
     XLSX.writeFile(
       workbook,
       `test-results-${new Date().toISOString().split("T")[0]}.xlsx`
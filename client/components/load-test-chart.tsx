@@ -0,0 +1,107 @@
+"use client";
+
+import type { EngineLoadResult, LoadStep } from "@/lib/types";
+import { Card } from "@/components/ui/card";
+import {
+  ChartContainer,
+  ChartLegend,
+  ChartLegendContent,
+  ChartTooltip,
+  ChartTooltipContent,
+  type ChartConfig,
+} from "@/components/ui/chart";
+import {
+  CartesianGrid,
+  Line,
+  LineChart,
+  ReferenceLine,
+  XAxis,
+  YAxis,
+} from "recharts";
+
+interface LoadTestChartProps {
+  engines: EngineLoadResult[];
+  title: string;
+  unit: string;
+  value: (step: LoadStep) => number;
+}
+
+// Engines are keyed by position, model IDs don't make valid CSS variable names
+const engineKey = (index: number) => `engine${index}`;
+
+export function LoadTestChart({
+  engines,
+  title,
+  unit,
+  value,
+}: LoadTestChartProps) {
+  const config: ChartConfig = Object.fromEntries(
+    engines.map((engine, index) => [
+      engineKey(index),
+      {
+        label: engine.model_name,
+        color: `var(--chart-${(index % 5) + 1})`,
+      },
+    ])
+  );
+
+  // One row per concurrency level of the ladder, with each engine's value at it
+  const levels = Array.from(
+    new Set(
+      engines.flatMap((engine) => engine.steps.map((s) => s.concurrency))
+    )
+  ).sort((a, b) => a - b);
+  const data = levels.map((concurrency) => {
+    const row: Record<string, number> = { concurrency };
+    engines.forEach((engine, index) => {
+      const step = engine.steps.find((s) => s.concurrency === concurrency);
+      if (step) row[engineKey(index)] = value(step);
+    });
+    return row;
+  });
+
+  return (
+    <Card className="p-6 bg-card border-border/50 shadow-sm">
+      <h3 className="text-lg font-semibold mb-4">{title}</h3>
+      <ChartContainer config={config} className="h-72 w-full aspect-auto">
+        <LineChart data={data} margin={{ left: 8, right: 16 }}>
+          <CartesianGrid vertical={false} />
+          <XAxis
+            dataKey="concurrency"
+            tickLine={false}
+            axisLine={false}
+          />
+          <YAxis tickLine={false} axisLine={false} unit={unit} width={64} />
+          <ChartTooltip
+            content={
+              <ChartTooltipContent
+                labelFormatter={(concurrency) => `Concurrency ${concurrency}`}
+              />
+            }
+          />
+          <ChartLegend content={<ChartLegendContent />} />
+          {engines.map((engine, index) =>
+            engine.knee !== null ? (
+              <ReferenceLine
+                key={`knee-${engine.model_id}`}
+                x={engine.knee}
+                stroke={`var(--color-${engineKey(index)})`}
+                strokeDasharray="4 4"
+              />
+            ) : null
+          )}
+          {engines.map((engine, index) => (
+            <Line
+              key={engine.model_id}
+              dataKey={engineKey(index)}
+              type="monotone"
+              stroke={`var(--color-${engineKey(index)})`}
+              strokeWidth={2}
+              dot
+            />
+          ))}
+        </LineChart>
+      </ChartContainer>
+    </Card>
+  );
+}
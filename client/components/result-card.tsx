@@ -1,6 +1,13 @@
 import type { StandardResponse } from "@/lib/types";
 import { Card } from "@/components/ui/card";
-import { CheckCircle2, AlertCircle, Zap } from "lucide-react";
+import {
+  CheckCircle2,
+  AlertCircle,
+  Clock,
+  Timer,
+  Unplug,
+  Zap,
+} from "lucide-react";
 
 interface ResultCardProps {
   testName: string;
@@ -10,6 +17,9 @@ interface ResultCardProps {
 export function ResultCard({ testName, result }: ResultCardProps) {
   if (!result) return null;
 
+  const timings = result.timings ?? [];
+  const totalSeconds = timings.reduce((total, timing) => total + timing.seconds, 0);
+
   return (
     <Card className="p-4 border border-border">
       <div className="space-y-3">
@@ -17,6 +27,10 @@ export function ResultCard({ testName, result }: ResultCardProps) {
           <h3 className="font-semibold text-sm">{testName}</h3>
           {result.success ? (
             <CheckCircle2 className="w-5 h-5 text-green-600 flex-shrink-0 mt-0.5" />
+          ) : result.timed_out ? (
+            <Timer className="w-5 h-5 text-amber-600 flex-shrink-0 mt-0.5" />
+          ) : result.circuit_open ? (
+            <Unplug className="w-5 h-5 text-muted-foreground flex-shrink-0 mt-0.5" />
           ) : (
             <AlertCircle className="w-5 h-5 text-red-600 flex-shrink-0 mt-0.5" />
           )}
@@ -29,6 +43,12 @@ export function ResultCard({ testName, result }: ResultCardProps) {
           </p>
         </div>
 
+        {(result.retries || result.hedges) ? (
+          <p className="text-xs text-muted-foreground">
+            Retries: {result.retries ?? 0} · Hedged requests: {result.hedges ?? 0}
+          </p>
+        ) : null}
+
         {result.pixel && result.pixel.length > 0 && (
           <div className="bg-blue-50 dark:bg-blue-950 rounded p-3 border border-blue-200 dark:border-blue-800">
             <div className="flex items-center gap-2 mb-2">
@@ -50,10 +70,35 @@ export function ResultCard({ testName, result }: ResultCardProps) {
           </div>
         )}
 
+        {timings.length > 0 && (
+          <div className="bg-muted rounded p-3">
+            <div className="flex items-center gap-2 mb-2">
+              <Clock className="w-4 h-4 text-muted-foreground" />
+              <p className="text-xs font-semibold text-muted-foreground">
+                Timings ({totalSeconds.toFixed(2)}s)
+              </p>
+            </div>
+            <div className="space-y-1">
+              {timings.map((timing, idx) => (
+                <div
+                  key={idx}
+                  className="flex justify-between text-xs font-mono text-muted-foreground"
+                >
+                  <span>
+                    {timing.phase}
+                    {timing.name ? ` ${timing.name}` : ""}
+                  </span>
+                  <span>{(timing.seconds * 1000).toFixed(0)} ms</span>
+                </div>
+              ))}
+            </div>
+          </div>
+        )}
+
         {result.confirmation_response && (
           <div className="bg-emerald-50 dark:bg-emerald-950 rounded p-3 border border-emerald-200 dark:border-emerald-800">
             <p className="text-xs font-semibold text-emerald-700 dark:text-emerald-300 mb-1">
-              Confirmation:
+              Confirmation{result.confirmation_cached ? " (cached)" : ""}:
             </p>
             <p className="text-sm break-words line-clamp-3 text-emerald-700 dark:text-emerald-300">
               {result.confirmation_response}
@@ -0,0 +1,72 @@
+import type { PhaseSummary, TimingSummary } from "@/lib/types";
+import { Card } from "@/components/ui/card";
+import { Clock } from "lucide-react";
+
+interface TimingSummaryCardProps {
+  timings: TimingSummary;
+}
+
+function formatMs(seconds: number) {
+  return `${(seconds * 1000).toFixed(0)} ms`;
+}
+
+function TimingTable({
+  title,
+  rows,
+}: {
+  title: string;
+  rows: Record<string, Record<string, PhaseSummary>>;
+}) {
+  const entries = Object.entries(rows);
+  if (entries.length === 0) return null;
+
+  return (
+    <div className="space-y-2">
+      <p className="text-xs font-semibold text-muted-foreground">{title}</p>
+      <div className="space-y-3">
+        {entries.map(([name, phases]) => (
+          <div key={name} className="bg-muted rounded p-3">
+            <p className="text-sm font-semibold mb-2">{name}</p>
+            <div className="space-y-1">
+              {Object.entries(phases).map(([phase, stats]) => (
+                <div
+                  key={phase}
+                  className="flex justify-between text-xs font-mono text-muted-foreground"
+                >
+                  <span>
+                    {phase} ({stats.count})
+                  </span>
+                  <span>
+                    p50 {formatMs(stats.p50)} / p95 {formatMs(stats.p95)}
+                  </span>
+                </div>
+              ))}
+            </div>
+          </div>
+        ))}
+      </div>
+    </div>
+  );
+}
+
+export function TimingSummaryCard({ timings }: TimingSummaryCardProps) {
+  if (
+    Object.keys(timings.by_model).length === 0 &&
+    Object.keys(timings.by_test).length === 0
+  ) {
+    return null;
+  }
+
+  return (
+    <Card className="p-4 border border-border">
+      <div className="flex items-center gap-2 mb-4">
+        <Clock className="w-4 h-4 text-muted-foreground" />
+        <h2 className="font-semibold">Timings</h2>
+      </div>
+      <div className="grid gap-6 grid-cols-1 md:grid-cols-2">
+        <TimingTable title="By model" rows={timings.by_model} />
+        <TimingTable title="By test" rows={timings.by_test} />
+      </div>
+    </Card>
+  );
+}
@@ -0,0 +1,29 @@
+import type { RunEvent } from "./types";
+
+/**
+ * Reads an NDJSON response body and calls onEvent for each event as it arrives.
+ */
+export async function readRunEvents(
+  response: Response,
+  onEvent: (event: RunEvent) => void
+) {
+  if (!response.body) throw new Error("Response has no body");
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    const lines = buffer.split("\n");
+    buffer = lines.pop() ?? "";
+    for (const line of lines) {
+      if (line.trim()) onEvent(JSON.parse(line));
+    }
+  }
+
+  if (buffer.trim()) onEvent(JSON.parse(buffer));
+}
@@ -1,11 +1,32 @@
 import { create } from "zustand";
-import type { Model, RunTestsResponse } from "./types";
+import type {
+  ExecutionPlan,
+  Model,
+  RunProgress,
+  RunSummary,
+  RunTestsResponse,
+  SkippedCell,
+  StandardResponse,
+  TestResults,
+} from "./types";
+
+const emptyTestResults = (): TestResults => ({
+  standard_text_test: null,
+  prompt_with_image_urls: null,
+  basic_param_values: null,
+  tool_calling_with_tool_choice: null,
+  structured_json_test: null,
+  prompt_with_base64_images: null,
+});
 
 interface TestStore {
   // Data
   models: Model[];
   availableTests: string[];
   results: RunTestsResponse | null;
+  skipped: SkippedCell[];
+  progress: RunProgress | null;
+  summary: RunSummary | null;
 
   // Selection state
   selectedModels: string[];
@@ -35,6 +56,14 @@ interface TestStore {
   setIsLoading: (loading: boolean) => void;
   setError: (error: string | null) => void;
   setResults: (results: RunTestsResponse) => void;
+  startRun: (plan: ExecutionPlan) => void;
+  mergeResult: (
+    modelName: string,
+    test: keyof TestResults,
+    result: StandardResponse
+  ) => void;
+  setProgress: (progress: RunProgress) => void;
+  setSummary: (summary: RunSummary) => void;
   clearResults: () => void;
   resetSelections: () => void;
 }
@@ -43,6 +72,9 @@ export const useTestStore = create<TestStore>((set) => ({
   models: [],
   availableTests: [],
   results: null,
+  skipped: [],
+  progress: null,
+  summary: null,
   selectedModels: [],
   selectedTests: [],
   confirmerModel: "gpt-4.1-nano",
@@ -79,7 +111,35 @@ export const useTestStore = create<TestStore>((set) => ({
 
   setResults: (results) => set({ results }),
 
-  clearResults: () => set({ results: null }),
+  startRun: (plan) => {
+    // Reused cells are streamed back as results too, so they count towards the total
+    const cells = [...plan.cells, ...(plan.reused ?? [])];
+    set({
+      results: Object.fromEntries(
+        cells.map((cell) => [cell.model.name, emptyTestResults()])
+      ),
+      skipped: plan.skipped,
+      progress: { completed: 0, total: cells.length, elapsed_seconds: 0 },
+      summary: null,
+    });
+  },
+
+  mergeResult: (modelName, test, result) =>
+    set((state) => ({
+      results: {
+        ...state.results,
+        [modelName]: {
+          ...(state.results?.[modelName] ?? emptyTestResults()),
+          [test]: result,
+        },
+      },
+    })),
+
+  setProgress: (progress) => set({ progress }),
+  setSummary: (summary) => set({ summary }),
+
+  clearResults: () =>
+    set({ results: null, skipped: [], progress: null, summary: null }),
 
   resetSelections: () =>
     set({
@@ -87,5 +147,8 @@ export const useTestStore = create<TestStore>((set) => ({
       selectedTests: [],
       confirmerModel: "gpt-4.1-nano",
       results: null,
+      skipped: [],
+      progress: null,
+      summary: null,
     }),
 }));
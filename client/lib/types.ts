@@ -5,6 +5,12 @@ export interface Model {
   client: string;
 }
 
+export interface PhaseTiming {
+  phase: string;
+  name: string | null;
+  seconds: number;
+}
+
 export interface StandardResponse {
   model_name: string;
   model_id: string;
@@ -13,6 +19,12 @@ export interface StandardResponse {
   success: boolean;
   pixel: string[];
   confirmation_response: string | null;
+  confirmation_cached?: boolean;
+  timings?: PhaseTiming[];
+  retries?: number;
+  hedges?: number;
+  timed_out?: boolean;
+  circuit_open?: boolean;
 }
 
 export interface TestResults {
@@ -27,3 +39,105 @@ export interface TestResults {
 export interface RunTestsResponse {
   [modelName: string]: TestResults;
 }
+
+export interface RunProgress {
+  completed: number;
+  total: number;
+  elapsed_seconds: number;
+}
+
+export interface PhaseSummary {
+  count: number;
+  p50: number;
+  p95: number;
+}
+
+export interface TimingSummary {
+  by_model: Record<string, Record<string, PhaseSummary>>;
+  by_test: Record<string, Record<string, PhaseSummary>>;
+}
+
+export interface RunSummary {
+  total: number;
+  passed: number;
+  failed: number;
+  timed_out?: number;
+  skipped: number;
+  reused?: number;
+  elapsed_seconds: number;
+  timings?: TimingSummary;
+}
+
+export interface PlannedCell {
+  model: Model;
+  test: keyof TestResults;
+}
+
+export interface SkippedCell extends PlannedCell {
+  reason: string;
+}
+
+export interface ReusedCell extends PlannedCell {
+  fingerprint: string;
+  source: "history" | "checkpoint";
+  response: StandardResponse;
+}
+
+export type RerunMode = "all" | "failed" | "changed";
+
+export interface ExecutionPlan {
+  cells: PlannedCell[];
+  skipped: SkippedCell[];
+  reused?: ReusedCell[];
+  resumed_from?: string | null;
+}
+
+export type RunEvent =
+  | { event: "plan"; plan: ExecutionPlan; run_id?: string }
+  | {
+      event: "result";
+      model_name: string;
+      test: keyof TestResults;
+      result: StandardResponse;
+    }
+  | ({ event: "progress" } & RunProgress)
+  | ({ event: "summary" } & RunSummary);
+
+export interface LoadStep {
+  concurrency: number;
+  seconds: number;
+  requests: number;
+  errors: number;
+  error_rate: number;
+  throughput: number;
+  retries: number;
+  latency: Record<"p50" | "p90" | "p95" | "p99" | "max", number>;
+}
+
+export interface EngineLoadResult {
+  model_id: string;
+  model_name: string;
+  client: string;
+  steps: LoadStep[];
+  knee: number | null;
+  knee_reason: string | null;
+}
+
+export interface LoadTestStatus {
+  load_test_id: string;
+  status: "running" | "completed" | "cancelled" | "failed";
+  config: {
+    test: string;
+    concurrency: number[];
+    step_seconds: number;
+    knee_latency_factor: number;
+    knee_error_rate: number;
+  };
+  created_at: number;
+  finished_at: number | null;
+  current: string | null;
+  steps_completed: number;
+  steps_total: number;
+  engines: EngineLoadResult[];
+  error: string | null;
+}
@@ -1,11 +1,29 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from server_src.router import router
+from src.history.run_history import run_history
+from src.rooms.room_pool import close_room_pools
+from src.runners.jobs import job_store
+from src.utils.tracing import CORRELATION_HEADER, correlation_id, new_correlation_id
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    for job in job_store.list():
+        job_store.cancel(job.job_id)
+    # Delete idle and retired SEMOSS rooms so runs don't leave orphaned rooms behind
+    close_room_pools()
+    # Write the cells still queued for the run history
+    run_history.flush(timeout=10)
+
 
 app = FastAPI(
     title="SEMOSS Playground Testing API",
     description="API for testing SEMOSS functionality",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -14,11 +32,30 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[CORRELATION_HEADER],
 )
 
 app.include_router(router)
 
 
+@app.middleware("http")
+async def assign_correlation_id(request: Request, call_next):
+    """
+    Tags the request with the caller's X-Correlation-ID, or a new one, so the runs of
+    concurrent requests can be told apart in their traces and job statuses.
+    """
+    request_correlation_id = (
+        request.headers.get(CORRELATION_HEADER) or new_correlation_id()
+    )
+    token = correlation_id.set(request_correlation_id)
+    try:
+        response = await call_next(request)
+    finally:
+        correlation_id.reset(token)
+    response.headers[CORRELATION_HEADER] = request_correlation_id
+    return response
+
+
 @app.get("/")
 async def root():
     """Root endpoint providing basic API information"""
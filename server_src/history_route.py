@@ -0,0 +1,78 @@
+import time
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query
+from src.history.run_history import CellFilters, TrendBucket, run_history
+
+router = APIRouter()
+
+# Trends cover the last 30 days unless since is set
+TREND_WINDOW_SECONDS = 30 * 86400
+
+# The queries run on FastAPI's thread pool, so they're plain functions
+
+
+@router.get("/api/history/runs")
+def list_runs(limit: int = 50, before: Optional[float] = None):
+    """The newest runs, page back with before set to the last run's started_at."""
+    return run_history.runs(limit, before)
+
+
+@router.get("/api/history/runs/{run_id}")
+def get_run(run_id: str, limit: int = 1000):
+    run = run_history.run(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"Run {run_id} not found")
+    cells = run_history.cells(CellFilters(run_id=run_id), limit, include_blobs=True)
+    return {"run": run, "cells": cells}
+
+
+@router.get("/api/history/cells")
+def list_cells(
+    model_id: Optional[str] = None,
+    test: Optional[str] = None,
+    client: Optional[str] = None,
+    success: Optional[bool] = None,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    limit: int = 100,
+    include_blobs: bool = False,
+):
+    """
+    The newest matching cells, page back with until set to the last cell's created_at.
+    Times are Unix timestamps.
+    """
+    filters = CellFilters(model_id, test, client, success, since, until)
+    return run_history.cells(filters, limit, include_blobs)
+
+
+def trend_since(since: Optional[float]) -> float:
+    return time.time() - TREND_WINDOW_SECONDS if since is None else since
+
+
+@router.get("/api/history/pass-rates")
+def pass_rates(
+    model_id: Optional[str] = None,
+    test: Optional[str] = None,
+    client: Optional[str] = None,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    bucket: TrendBucket = "day",
+):
+    """Pass rate per model and hour, day or week."""
+    filters = CellFilters(model_id, test, client, since=trend_since(since), until=until)
+    return run_history.pass_rates(filters, bucket)
+
+
+@router.get("/api/history/latency")
+def latency_percentiles(
+    model_id: Optional[str] = None,
+    test: Optional[str] = None,
+    client: Optional[str] = None,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    bucket: TrendBucket = "day",
+    percentiles: List[float] = Query([50, 95, 99]),
+):
+    """Percentiles of the cells' total seconds per model and hour, day or week."""
+    filters = CellFilters(model_id, test, client, since=trend_since(since), until=until)
+    return run_history.latency_percentiles(filters, bucket, tuple(percentiles))
@@ -0,0 +1,107 @@
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from src.confirmations.pipeline import parse_batch_results
+from src.utils.models import Model, get_model_by_id
+from src.runners.incremental import RerunMode, plan_reruns
+from src.runners.plan import build_execution_plan
+from src.runners.jobs import JobLimitError, JobStatus, job_store
+from server_src.run_tests_route import (
+    MaxConcurrency,
+    resolve_keys,
+    resolve_run_id,
+    resolve_test_selections,
+)
+
+router = APIRouter()
+
+
+@router.post("/api/jobs", response_model=JobStatus)
+async def submit_job(
+    models: List[str],
+    tests: List[str],
+    confirmer_model: Optional[str] = "gpt-4.1-nano",
+    openai_secret_key: Optional[str] = None,
+    url: Optional[str] = None,
+    access_key: Optional[str] = None,
+    secret_key: Optional[str] = None,
+    max_concurrency: MaxConcurrency = 64,
+    deadline_seconds: Optional[float] = None,
+    rerun: RerunMode = "all",
+    resume_run_id: Optional[str] = None,
+):
+    """
+    Starts a run in the background and returns its job ID right away. The job ID is also
+    its run ID, to resume the job with if it doesn't finish.
+    """
+    deployment_keys = resolve_keys(openai_secret_key, url, access_key, secret_key)
+    resume_run_id = resolve_run_id(resume_run_id)
+
+    model_selections: List[Model] = [get_model_by_id(model_id) for model_id in models]
+    plan = await run_in_threadpool(
+        plan_reruns,
+        build_execution_plan(model_selections, resolve_test_selections(tests)),
+        confirmer_model,
+        rerun,
+        resume_run_id,
+    )
+
+    try:
+        job = job_store.submit(
+            plan, deployment_keys, confirmer_model, max_concurrency, deadline_seconds
+        )
+    except JobLimitError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return job.to_status(include_results=False)
+
+
+@router.get("/api/jobs", response_model=List[JobStatus])
+async def list_jobs():
+    return [job.to_status(include_results=False) for job in job_store.list()]
+
+
+@router.get("/api/jobs/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str):
+    """
+    Returns the job's status along with the results of the cells finished so far.
+    """
+    return get_job_or_404(job_id).to_status()
+
+
+@router.get("/api/jobs/{job_id}/result")
+async def get_job_result(job_id: str):
+    """
+    Returns the final results in the same shape as /api/run-tests.
+    """
+    job = get_job_or_404(job_id)
+    if not job.finished:
+        raise HTTPException(
+            status_code=409, detail=f"Job is still {job.status}, poll its status first."
+        )
+    return job.results
+
+
+@router.post("/api/jobs/{job_id}/cancel", response_model=JobStatus)
+async def cancel_job(job_id: str):
+    get_job_or_404(job_id)
+    return job_store.cancel(job_id).to_status(include_results=False)
+
+
+@router.post("/api/jobs/{job_id}/batch-results", response_model=JobStatus)
+async def apply_job_batch_results(job_id: str, request: Request):
+    """
+    Fills in the job's cells left pending by offline confirmation from an OpenAI Batch API
+    output file, sent as the request body.
+    """
+    job = get_job_or_404(job_id)
+    body = await request.body()
+    confirmations = parse_batch_results(body.decode().splitlines())
+    await run_in_threadpool(job.apply_batch_results, confirmations)
+    return job.to_status()
+
+
+def get_job_or_404(job_id: str):
+    job = job_store.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job
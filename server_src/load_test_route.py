@@ -0,0 +1,83 @@
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException
+from src.runners.load_test import (
+    LoadTestConfig,
+    LoadTestLimitError,
+    LoadTestStatus,
+    load_test_store,
+)
+from src.runners.plan import TESTERS
+from src.runners.runners import map_test_name_to_field
+from src.utils.models import Model, get_model_by_id
+from server_src.run_tests_route import resolve_keys
+
+router = APIRouter()
+
+
+@router.post("/api/load-tests", response_model=LoadTestStatus)
+def submit_load_test(
+    models: List[str],
+    concurrency: List[int] = [1, 2, 4, 8, 16, 32, 64],
+    test: str = "Standard Text Test",
+    step_seconds: float = 30.0,
+    knee_latency_factor: float = 1.5,
+    knee_error_rate: float = 0.05,
+    openai_secret_key: Optional[str] = None,
+    url: Optional[str] = None,
+    access_key: Optional[str] = None,
+    secret_key: Optional[str] = None,
+):
+    """
+    Starts a concurrency sweep of one test against each model in the background and
+    returns its ID right away. Each model runs the test closed loop for step_seconds at
+    each concurrency, and gets the knee where its latency or error rate jumped.
+    """
+    deployment_keys = resolve_keys(openai_secret_key, url, access_key, secret_key)
+    test_field = map_test_name_to_field(test) or test
+    if test_field not in TESTERS:
+        raise HTTPException(status_code=400, detail=f"Test {test} can't be load tested")
+    if not concurrency or min(concurrency) < 1 or max(concurrency) > 256:
+        raise HTTPException(
+            status_code=400, detail="Concurrency levels must be between 1 and 256"
+        )
+
+    model_selections: List[Model] = [get_model_by_id(model_id) for model_id in models]
+    config = LoadTestConfig(
+        test=test_field,
+        concurrency=sorted(set(concurrency)),
+        step_seconds=step_seconds,
+        knee_latency_factor=knee_latency_factor,
+        knee_error_rate=knee_error_rate,
+    )
+    try:
+        load_test = load_test_store.submit(model_selections, config, deployment_keys)
+    except LoadTestLimitError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return load_test.to_status()
+
+
+@router.get("/api/load-tests", response_model=List[LoadTestStatus])
+def list_load_tests():
+    return [load_test.to_status() for load_test in load_test_store.list()]
+
+
+@router.get("/api/load-tests/{load_test_id}", response_model=LoadTestStatus)
+def get_load_test(load_test_id: str):
+    """
+    Returns the sweep's status with the steps finished so far, its machine-readable result
+    once it's completed.
+    """
+    return get_load_test_or_404(load_test_id).to_status()
+
+
+@router.post("/api/load-tests/{load_test_id}/cancel", response_model=LoadTestStatus)
+def cancel_load_test(load_test_id: str):
+    get_load_test_or_404(load_test_id)
+    return load_test_store.cancel(load_test_id).to_status()
+
+
+def get_load_test_or_404(load_test_id: str):
+    load_test = load_test_store.get(load_test_id)
+    if not load_test:
+        raise HTTPException(status_code=404, detail="Load test not found or expired")
+    return load_test
@@ -0,0 +1,198 @@
+from typing import List
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from src.clients.clients import client_pool_stats
+from src.confirmations.confirmation_cache import confirmation_cache
+from src.confirmations.pipeline import confirmation_stage
+from src.confirmations.reference_data import reference_data
+from src.rooms.room_pool import room_pool_stats
+from src.runners.circuit_breaker import circuit_breakers
+from src.runners.jobs import job_store
+from src.runners.scheduler import provider_scheduler
+from src.utils.metrics import registry, render_family
+
+router = APIRouter()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def provider_metrics() -> List[str]:
+    providers = provider_scheduler.stats()
+    families = [
+        ("queued", "gauge", "Cells waiting for the provider's capacity"),
+        ("in_flight", "gauge", "Cells the provider is running"),
+        ("max_concurrency", "gauge", "The provider's concurrency cap"),
+        ("dispatched", "counter", "Cells handed to the provider"),
+        ("rate_limited", "counter", "Rate limit errors from the provider"),
+        ("queued_seconds", "counter", "Time cells spent queued for the provider"),
+    ]
+    lines = []
+    for stat, metric_type, help_text in families:
+        name = f"playground_provider_{stat}"
+        if metric_type == "counter":
+            name += "_total"
+        lines += render_family(
+            name,
+            metric_type,
+            help_text,
+            [({"provider": provider}, stats[stat]) for provider, stats in providers.items()],
+        )
+    return lines
+
+
+def circuit_metrics() -> List[str]:
+    circuits = circuit_breakers.stats()
+    samples = [
+        (kind[:-1], key, stats)
+        for kind, by_key in circuits.items()
+        for key, stats in by_key.items()
+    ]
+    return [
+        *render_family(
+            "playground_circuit_open",
+            "gauge",
+            "1 while the engine's or provider's circuit is open or half open",
+            [
+                ({"kind": kind, "key": key}, int(stats["state"] != "closed"))
+                for kind, key, stats in samples
+            ],
+        ),
+        *render_family(
+            "playground_circuit_opened_total",
+            "counter",
+            "Times the circuit opened",
+            [({"kind": kind, "key": key}, stats["opened"]) for kind, key, stats in samples],
+        ),
+        *render_family(
+            "playground_circuit_rejected_total",
+            "counter",
+            "Cells failed without running because the circuit was open",
+            [({"kind": kind, "key": key}, stats["rejected"]) for kind, key, stats in samples],
+        ),
+    ]
+
+
+def confirmation_metrics() -> List[str]:
+    stage = confirmation_stage.stats()
+    cache = confirmation_cache.stats()
+    return [
+        *render_family(
+            "playground_confirmation_backlog",
+            "gauge",
+            "Responses waiting for a confirmation worker or a batch",
+            [({}, stage["backlog"])],
+        ),
+        *render_family(
+            "playground_confirmation_in_flight",
+            "gauge",
+            "Confirmations in progress",
+            [({}, stage["in_flight"])],
+        ),
+        *render_family(
+            "playground_confirmation_workers",
+            "gauge",
+            "Confirmation worker threads",
+            [({}, stage["workers"])],
+        ),
+        *render_family(
+            "playground_confirmation_cache_entries",
+            "gauge",
+            "Verdicts in the confirmation cache",
+            [({}, cache["entries"])],
+        ),
+        *render_family(
+            "playground_confirmation_cache_lookups_total",
+            "counter",
+            "Confirmation cache lookups, by result",
+            [({"result": "hit"}, cache["hits"]), ({"result": "miss"}, cache["misses"])],
+        ),
+    ]
+
+
+def pool_metrics() -> List[str]:
+    rooms = room_pool_stats()
+    clients = client_pool_stats()
+    lines = []
+    for stat in ("idle", "in_use", "pending", "retired"):
+        lines += render_family(
+            f"playground_rooms_{stat}",
+            "gauge",
+            f"Rooms {stat.replace('_', ' ')} per SEMOSS deployment",
+            [({"url": pool["url"]}, pool[stat]) for pool in rooms],
+        )
+    for stat in ("created", "deleted", "recycled", "acquired"):
+        lines += render_family(
+            f"playground_rooms_{stat}_total",
+            "counter",
+            f"Rooms {stat} per SEMOSS deployment",
+            [({"url": pool["url"]}, pool[stat]) for pool in rooms],
+        )
+    lines += render_family(
+        "playground_rooms_max_wait_seconds",
+        "gauge",
+        "Longest a cell waited for a room",
+        [({"url": pool["url"]}, pool["max_wait_seconds"]) for pool in rooms],
+    )
+    for stat in ("size", "max_size"):
+        lines += render_family(
+            f"playground_client_pool_{stat}",
+            "gauge",
+            f"Client pool {stat.replace('_', ' ')}",
+            [({"pool": pool}, stats[stat]) for pool, stats in clients.items()],
+        )
+    lines += render_family(
+        "playground_client_pool_lookups_total",
+        "counter",
+        "Client pool lookups, by result",
+        [
+            ({"pool": pool, "result": result}, stats[key])
+            for pool, stats in clients.items()
+            for result, key in (("hit", "hits"), ("miss", "misses"))
+        ],
+    )
+    lines += render_family(
+        "playground_client_pool_evictions_total",
+        "counter",
+        "Clients evicted from the pool",
+        [({"pool": pool}, stats["evictions"]) for pool, stats in clients.items()],
+    )
+    return lines
+
+
+def run_metrics() -> List[str]:
+    jobs = {}
+    for job in job_store.list():
+        jobs[job.status] = jobs.get(job.status, 0) + 1
+    prices = reference_data.stats()
+    return [
+        *render_family(
+            "playground_jobs",
+            "gauge",
+            "Jobs kept by the server, by status",
+            [({"status": status}, count) for status, count in jobs.items()],
+        ),
+        *render_family(
+            "playground_reference_data_lookups_total",
+            "counter",
+            "Reference price lookups, by result",
+            [({"result": "hit"}, prices["hits"]), ({"result": "miss"}, prices["misses"])],
+        ),
+    ]
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """
+    Prometheus text format. Counters and histograms are recorded as cells, pixels and
+    confirmations finish; queues and pools are read from their stats when scraped. Some
+    of those stats query SQLite, so scrapes run on FastAPI's thread pool.
+    """
+    lines = [
+        *registry.collect(),
+        *provider_metrics(),
+        *circuit_metrics(),
+        *confirmation_metrics(),
+        *pool_metrics(),
+        *run_metrics(),
+    ]
+    return PlainTextResponse("\n".join(lines) + "\n", media_type=CONTENT_TYPE)
@@ -1,12 +1,68 @@
 from fastapi import APIRouter
 from server_src.get_models_tests_route import router as get_models_and_tests_router
 from server_src.run_tests_route import router as run_tests_router
+from server_src.jobs_route import router as jobs_router
+from server_src.metrics_route import router as metrics_router
+from server_src.history_route import router as history_router
+from server_src.load_test_route import router as load_test_router
+from src.clients.clients import client_pool_stats
+from src.clients.cassettes import cassette_stats
+from src.history.run_history import run_history
+from src.rooms.room_pool import room_pool_stats
+from src.runners.circuit_breaker import circuit_breakers
+from src.runners.scheduler import provider_scheduler
+from src.confirmations.pipeline import confirmation_stage
+from src.confirmations.confirmation_cache import confirmation_cache
+from src.confirmations.reference_data import reference_data
+from src.utils.tracing import tracer
 
 router = APIRouter()
 router.include_router(get_models_and_tests_router)
 router.include_router(run_tests_router)
+router.include_router(jobs_router)
+router.include_router(metrics_router)
+router.include_router(history_router)
+router.include_router(load_test_router)
 
 
 @router.get("/api/health")
 async def health_check():
     return {"status": "healthy", "message": "API is running"}
+
+
+# The confirmation cache and run history stats query SQLite, so this runs on FastAPI's
+# thread pool rather than blocking the event loop
+@router.get("/api/stats")
+def stats():
+    return {
+        "clients": client_pool_stats(),
+        "cassettes": cassette_stats(),
+        "rooms": room_pool_stats(),
+        "providers": provider_scheduler.stats(),
+        "circuits": circuit_breakers.stats(),
+        "confirmations": confirmation_stage.stats(),
+        "confirmation_cache": confirmation_cache.stats(),
+        "reference_data": reference_data.stats(),
+        "tracing": tracer.stats(),
+        "history": run_history.stats(),
+    }
+
+
+@router.get("/api/reference-data")
+async def get_reference_data():
+    return reference_data.stats()
+
+
+@router.put("/api/reference-data/{ticker}")
+async def pin_reference_price(ticker: str, price: float):
+    """
+    Pins the price the confirmer checks responses against, so runs can be reproduced.
+    """
+    reference_data.pin(ticker, price)
+    return reference_data.stats()
+
+
+@router.delete("/api/reference-data/{ticker}")
+async def unpin_reference_price(ticker: str):
+    reference_data.unpin(ticker)
+    return reference_data.stats()
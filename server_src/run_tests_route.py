@@ -1,16 +1,32 @@
+import json
 import os
-from typing import List, Optional
-from fastapi import APIRouter, HTTPException
+from typing import Annotated, List, Literal, Optional
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from src.utils.models import Model, get_model_by_id
 from src.runners.runners import (
     TestSelections,
     run_selected_tests,
+    run_selected_tests_async,
     map_test_name_to_field,
 )
+from src.runners.incremental import (
+    InvalidRunIdError,
+    RerunMode,
+    checkpoint_run_id,
+    plan_reruns,
+)
+from src.runners.plan import ExecutionPlan, build_execution_plan
+from src.runners.streaming import stream_run_events
+from src.utils.timings import summarize_result_timings
 from src.utils.models import DeploymentKeys
 
 router = APIRouter()
 
+# Cells run at once by the async engine, each one holds a worker thread while it runs
+MaxConcurrency = Annotated[int, Query(ge=1, le=256)]
+
 
 @router.post("/api/run-tests")
 async def run_tests(
@@ -21,21 +37,132 @@ async def run_tests(
     url: Optional[str] = None,
     access_key: Optional[str] = None,
     secret_key: Optional[str] = None,
+    engine: Literal["async", "threaded"] = "async",
+    max_concurrency: MaxConcurrency = 64,
+    deadline_seconds: Optional[float] = None,
+    rerun: RerunMode = "all",
+    resume_run_id: Optional[str] = None,
+    include_timings: bool = False,
 ):
+    """
+    Runs every selected test on every selected model, returns test results keyed by model
+    name. With include_timings they're under "results", next to the run's p50/p95 per
+    phase under "timings".
+    """
+    deployment_keys = resolve_keys(openai_secret_key, url, access_key, secret_key)
+    resume_run_id = resolve_run_id(resume_run_id)
+
+    model_selections: List[Model] = [get_model_by_id(model_id) for model_id in models]
+    test_selections = resolve_test_selections(tests)
+
+    if engine == "threaded":
+        # The original runner, run off the event loop so it doesn't block other requests
+        results = await run_in_threadpool(
+            run_selected_tests,
+            model_selections,
+            test_selections,
+            deployment_keys,
+            confirmer_model,
+            None,
+            deadline_seconds,
+            rerun,
+            resume_run_id,
+        )
+    else:
+        results = await run_selected_tests_async(
+            model_selections,
+            test_selections,
+            deployment_keys,
+            confirmer_model,
+            max_concurrency,
+            deadline_seconds,
+            rerun,
+            resume_run_id,
+        )
+    if include_timings:
+        return {"results": results, "timings": summarize_result_timings(results)}
+    return results
 
+
+@router.post("/api/run-tests/stream")
+async def run_tests_stream(
+    models: List[str],
+    tests: List[str],
+    confirmer_model: Optional[str] = "gpt-4.1-nano",
+    openai_secret_key: Optional[str] = None,
+    url: Optional[str] = None,
+    access_key: Optional[str] = None,
+    secret_key: Optional[str] = None,
+    max_concurrency: MaxConcurrency = 64,
+    progress_interval: float = 2.0,
+    deadline_seconds: Optional[float] = None,
+    rerun: RerunMode = "all",
+    resume_run_id: Optional[str] = None,
+):
+    """
+    Same as /api/run-tests, but streams NDJSON events (plan, result, progress, summary)
+    so each cell's result is sent as soon as it finishes.
+    """
     deployment_keys = resolve_keys(openai_secret_key, url, access_key, secret_key)
+    resume_run_id = resolve_run_id(resume_run_id)
+
+    model_selections: List[Model] = [get_model_by_id(model_id) for model_id in models]
+    plan = await run_in_threadpool(
+        plan_reruns,
+        build_execution_plan(model_selections, resolve_test_selections(tests)),
+        confirmer_model,
+        rerun,
+        resume_run_id,
+    )
 
+    async def ndjson():
+        async for event in stream_run_events(
+            plan,
+            deployment_keys,
+            confirmer_model,
+            max_concurrency,
+            progress_interval,
+            deadline_seconds,
+        ):
+            yield json.dumps(event) + "\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
+@router.post("/api/run-tests/plan", response_model=ExecutionPlan)
+def plan_tests(
+    models: List[str],
+    tests: List[str],
+    confirmer_model: Optional[str] = "gpt-4.1-nano",
+    rerun: RerunMode = "all",
+    resume_run_id: Optional[str] = None,
+):
+    """
+    Returns the model x test cells /api/run-tests would run for the same selections,
+    the cells it would reuse earlier results for and the ones it would skip as unsupported.
+    """
+    resume_run_id = resolve_run_id(resume_run_id)
     model_selections: List[Model] = [get_model_by_id(model_id) for model_id in models]
+    plan = build_execution_plan(model_selections, resolve_test_selections(tests))
+    return plan_reruns(plan, confirmer_model, rerun, resume_run_id)
+
+
+def resolve_test_selections(tests: List[str]) -> TestSelections:
     test_selections = TestSelections()
     for test_name in tests:
         field_name = map_test_name_to_field(test_name)
         if field_name:
             setattr(test_selections, field_name, True)
+    return test_selections
 
-    results = run_selected_tests(
-        model_selections, test_selections, deployment_keys, confirmer_model
-    )
-    return results
+
+def resolve_run_id(run_id: Optional[str]) -> Optional[str]:
+    if not run_id:
+        return None
+    try:
+        return checkpoint_run_id(run_id)
+    except InvalidRunIdError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 def resolve_keys(
@@ -0,0 +1,208 @@
+import gzip
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from typing import Dict, List, Literal, Optional, Tuple
+import requests
+from src.clients.clients import SessionServerClient
+
+CassetteMode = Literal["off", "record", "replay"]
+
+# Room IDs are passed both as roomId=["..."] and, by UpdateRoomOptions, roomId="..."
+ROOM_ID = re.compile(r'roomId=(\[[^\]]*\]|"[^"]*")')
+# The room pool's CreateRoom and RemoveUserRoom statements, batched by pool timing
+ROOM_STATEMENT = re.compile(r"\s*(CreateRoom\(\)|RemoveUserRoom\(roomId=\[[^\]]*\]\));")
+
+
+def normalize_pixel(pixel: str) -> str:
+    """
+    The pixel with its room IDs abstracted, so a recording matches the same pixel sent
+    to whichever room the pool hands out on replay.
+    """
+    return ROOM_ID.sub('roomId=["<room>"]', pixel.strip())
+
+
+def room_pixel_returns(pixel: str) -> Optional[List[dict]]:
+    """
+    The pixelReturn of a pixel made only of CreateRoom and RemoveUserRoom statements, None
+    for any other pixel. The pool batches these by timing and by how many cells run, so
+    they're answered on replay rather than looked up.
+    """
+    pixel_returns = []
+    position = 0
+    while position < len(pixel.rstrip()):
+        match = ROOM_STATEMENT.match(pixel, position)
+        if not match:
+            return None
+        output = (
+            {"roomId": str(uuid.uuid4())}
+            if match.group(1).startswith("CreateRoom")
+            else True
+        )
+        pixel_returns.append({"output": output, "operationType": ["OPERATION"]})
+        position = match.end()
+    return pixel_returns or None
+
+
+class CassetteMissError(Exception):
+    pass
+
+
+def _open(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class Cassette:
+    """
+    runPixel responses and their latency keyed by normalized pixel, stored as JSON lines
+    (gzipped when the path ends in .gz). A pixel recorded several times is replayed in
+    the order it was recorded, wrapping around once every recording has been used.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._recordings: Dict[str, List[Tuple[dict, float]]] = {}
+        self._next: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.loaded = False
+        self.recorded = 0
+        self.replayed = 0
+        self.misses = 0
+
+    def load(self) -> "Cassette":
+        with _open(self.path, "r") as cassette_file:
+            for line in cassette_file:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._recordings.setdefault(entry["pixel"], []).append(
+                        (entry["response"], entry["seconds"])
+                    )
+        self.loaded = True
+        return self
+
+    def record(self, pixel: str, response: dict, seconds: float):
+        line = json.dumps(
+            {"pixel": normalize_pixel(pixel), "seconds": seconds, "response": response},
+            separators=(",", ":"),
+        )
+        with self._lock:
+            with _open(self.path, "a") as cassette_file:
+                cassette_file.write(line + "\n")
+            self.recorded += 1
+
+    def play(self, pixel: str) -> Tuple[dict, float]:
+        key = normalize_pixel(pixel)
+        with self._lock:
+            recordings = self._recordings.get(key)
+            if not recordings:
+                self.misses += 1
+                raise CassetteMissError(f"No recording for pixel: {key}")
+            index = self._next.get(key, 0)
+            self._next[key] = (index + 1) % len(recordings)
+            self.replayed += 1
+        return recordings[index]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "path": self.path,
+                "pixels": len(self._recordings),
+                "recorded": self.recorded,
+                "replayed": self.replayed,
+                "misses": self.misses,
+            }
+
+
+class RecordingServerClient(SessionServerClient):
+    """
+    SessionServerClient that logs every pixel, its response and its latency. The pool's
+    room pixels aren't logged, replay answers them itself.
+    """
+
+    def __init__(self, *args, cassette: Cassette, **kwargs):
+        self.cassette = cassette
+        super().__init__(*args, **kwargs)
+
+    def post_pixel(
+        self, payload: str, insight_id: str, timeout: Optional[float] = None
+    ) -> dict:
+        start = time.perf_counter()
+        response = super().post_pixel(payload, insight_id, timeout)
+        if room_pixel_returns(payload) is None:
+            self.cassette.record(payload, response, time.perf_counter() - start)
+        return response
+
+
+class ReplayServerClient(SessionServerClient):
+    """
+    Serves pixels from a cassette without a SEMOSS instance, instantly or after the
+    recorded latency. Room pixels are answered without the cassette and rooms created on
+    replay get fresh IDs, so a replay doesn't depend on how the pool batched them.
+    """
+
+    def __init__(self, base: str, cassette: Cassette, recorded_latency: bool = False):
+        # No login, nothing is sent to the server
+        self.main_url = base
+        self.cur_insight = self.insight_id = "replay"
+        self.cassette = cassette
+        self.recorded_latency = recorded_latency
+
+    def post_pixel(
+        self, payload: str, insight_id: str, timeout: Optional[float] = None
+    ) -> dict:
+        pixel_returns = room_pixel_returns(payload)
+        if pixel_returns is not None:
+            return {"insightID": insight_id, "pixelReturn": pixel_returns}
+        response, seconds = self.cassette.play(payload)
+        if self.recorded_latency:
+            if timeout is not None and seconds > timeout:
+                time.sleep(timeout)
+                raise requests.Timeout(f"Recorded pixel took {seconds:.2f}s")
+            time.sleep(seconds)
+        response = json.loads(json.dumps(response))
+        for pixel_return in response.get("pixelReturn", []):
+            output = pixel_return.get("output")
+            if isinstance(output, dict) and "roomId" in output:
+                output["roomId"] = str(uuid.uuid4())
+        return response
+
+    def close(self):
+        pass
+
+
+def cassette_settings() -> Tuple[CassetteMode, str, bool]:
+    """
+    Reads PIXEL_CASSETTE_MODE (off, record or replay), PIXEL_CASSETTE_PATH and
+    PIXEL_CASSETTE_LATENCY (instant or recorded).
+    """
+    return (
+        os.getenv("PIXEL_CASSETTE_MODE", "off"),
+        os.getenv("PIXEL_CASSETTE_PATH", "pixels.cassette.jsonl.gz"),
+        os.getenv("PIXEL_CASSETTE_LATENCY", "instant") == "recorded",
+    )
+
+
+_cassettes: Dict[str, Cassette] = {}
+_cassettes_lock = threading.Lock()
+
+
+def get_cassette(path: str, mode: CassetteMode) -> Cassette:
+    with _cassettes_lock:
+        cassette = _cassettes.get(path)
+        if cassette is None:
+            cassette = Cassette(path)
+            _cassettes[path] = cassette
+        # A cassette recorded earlier in the process is read back once it's replayed
+        if mode == "replay" and not cassette.loaded:
+            cassette.load()
+        return cassette
+
+
+def cassette_stats() -> Dict[str, dict]:
+    with _cassettes_lock:
+        return {path: cassette.stats() for path, cassette in _cassettes.items()}
@@ -1,20 +1,235 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+import requests
+from requests.adapters import HTTPAdapter
 from ai_server import ServerClient
 from openai import OpenAI
+from src.rooms.room_pool import retire_room_pool
 from src.utils.models import DeploymentKeys
 
 
+class SessionServerClient(ServerClient):
+    """
+    ServerClient that sends pixels over a keep-alive requests.Session so that pooled clients
+    reuse their connections across testers, models and runs.
+
+    The SDK checks the login before every pixel; here the login is validated once when the
+    client is created and the pool's TTL bounds how long a session is reused.
+
+    Every tester using the client sends its pixels to the insight created at login. Their
+    state lives in their own rooms, named by every pixel, so sharing it is safe. The ID is
+    kept in insight_id rather than read from the SDK's mutable cur_insight, so concurrent
+    testers can't race on it.
+    """
+
+    def __init__(self, *args, pool_maxsize: int = 64, **kwargs):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        super().__init__(*args, **kwargs)
+        self.insight_id = self.cur_insight
+
+    def run_pixel(
+        self,
+        payload: str,
+        insight_id: Optional[str] = None,
+        full_response: Optional[bool] = False,
+        timeout: Optional[float] = None,
+    ):
+        if insight_id is None:
+            insight_id = self.insight_id
+
+        response_dict = self.post_pixel(payload, insight_id, timeout)
+        if "ERROR" in response_dict["pixelReturn"][0]["operationType"]:
+            raise Exception(response_dict["pixelReturn"][0]["output"])
+
+        if full_response:
+            return response_dict
+        return self.get_pixel_output(response_dict)
+
+    def post_pixel(
+        self, payload: str, insight_id: str, timeout: Optional[float] = None
+    ) -> dict:
+        """
+        Sends the pixel and returns the raw runPixel response. Raises requests.Timeout if
+        SEMOSS doesn't answer within timeout seconds.
+        """
+        headers = self.required_headers.copy()
+        headers["Content-Type"] = "application/x-www-form-urlencoded; charset=UTF-8"
+
+        response = self.session.post(
+            self.main_url + "/engine/runPixel",
+            cookies=self.cookies,
+            data={"expression": payload, "insightId": insight_id},
+            headers=headers,
+            timeout=timeout,
+        )
+        return response.json()
+
+    def close(self):
+        self.session.close()
+
+
+class ClientPool:
+    """
+    Thread-safe LRU cache of clients with a TTL, shared by every tester in the process.
+    on_evict is called with each client dropped from the cache, under the cache's lock.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 32,
+        ttl_seconds: float = 1800,
+        on_evict: Optional[Callable[[Any], None]] = None,
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.on_evict = on_evict
+        self._clients: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str, factory: Callable[[], Any]) -> Any:
+        with self._lock:
+            client = self._get_fresh(key)
+            if client is not None:
+                self.hits += 1
+                return client
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Build outside the pool lock so a slow login doesn't block other keys,
+        # while concurrent misses on the same key still only build one client.
+        with key_lock:
+            with self._lock:
+                client = self._get_fresh(key)
+                if client is not None:
+                    self.hits += 1
+                    return client
+                self.misses += 1
+
+            client = factory()
+
+            with self._lock:
+                self._clients[key] = (time.monotonic(), client)
+                self._clients.move_to_end(key)
+                while len(self._clients) > self.max_size:
+                    # Evicted clients may still be in use by a running tester, so
+                    # they're left to be garbage collected rather than closed.
+                    _, (_, evicted) = self._clients.popitem(last=False)
+                    self._evicted(evicted)
+            return client
+
+    def _get_fresh(self, key: str) -> Any:
+        entry = self._clients.get(key)
+        if entry is None:
+            return None
+        created_at, client = entry
+        if time.monotonic() - created_at > self.ttl_seconds:
+            del self._clients[key]
+            self._evicted(client)
+            return None
+        self._clients.move_to_end(key)
+        return client
+
+    def _evicted(self, client: Any):
+        self.evictions += 1
+        if self.on_evict:
+            try:
+                self.on_evict(client)
+            except Exception as e:
+                print(f"Failed to clean up evicted client: {e}")
+
+    def _close(self, client: Any):
+        close = getattr(client, "close", None)
+        if close:
+            try:
+                close()
+            except Exception as e:
+                print(f"Failed to close pooled client: {e}")
+
+    def clear(self):
+        with self._lock:
+            for _, client in self._clients.values():
+                self._close(client)
+            self._clients.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._clients),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# An evicted SEMOSS client's rooms are deleted once its testers release them
+semoss_client_pool = ClientPool(on_evict=retire_room_pool)
+openai_client_pool = ClientPool()
+
+
+def _hash_key(*parts: str) -> str:
+    return hashlib.sha256("\x00".join(parts).encode("utf-8")).hexdigest()
+
+
 def get_semoss_client(deployment_keys: DeploymentKeys) -> ServerClient:
+    # Imported here, the cassette clients are built on SessionServerClient
+    from src.clients.cassettes import (
+        RecordingServerClient,
+        ReplayServerClient,
+        cassette_settings,
+        get_cassette,
+    )
 
-    print("Creating SEMOSS client with deployment keys:", deployment_keys.model_dump())
+    cassette_mode, cassette_path, recorded_latency = cassette_settings()
 
-    client = ServerClient(
-        base=deployment_keys.url,
-        access_key=deployment_keys.access_key,
-        secret_key=deployment_keys.secret_key,
+    def create_client() -> ServerClient:
+        if cassette_mode == "replay":
+            print("Replaying SEMOSS pixels from:", cassette_path)
+            return ReplayServerClient(
+                deployment_keys.url,
+                get_cassette(cassette_path, cassette_mode),
+                recorded_latency,
+            )
+        print("Creating SEMOSS client for:", deployment_keys.url)
+        if cassette_mode == "record":
+            return RecordingServerClient(
+                base=deployment_keys.url,
+                access_key=deployment_keys.access_key,
+                secret_key=deployment_keys.secret_key,
+                cassette=get_cassette(cassette_path, cassette_mode),
+            )
+        return SessionServerClient(
+            base=deployment_keys.url,
+            access_key=deployment_keys.access_key,
+            secret_key=deployment_keys.secret_key,
+        )
+
+    key = _hash_key(
+        cassette_mode,
+        deployment_keys.url,
+        deployment_keys.access_key,
+        deployment_keys.secret_key,
     )
-    return client
+    return semoss_client_pool.get(key, create_client)
 
 
 def get_openai_client(deployment_key: str) -> OpenAI:
-    client = OpenAI(api_key=deployment_key)
-    return client
+    return openai_client_pool.get(
+        _hash_key(deployment_key), lambda: OpenAI(api_key=deployment_key)
+    )
+
+
+def client_pool_stats() -> dict:
+    return {
+        "semoss": semoss_client_pool.stats(),
+        "openai": openai_client_pool.stats(),
+    }
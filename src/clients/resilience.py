@@ -0,0 +1,266 @@
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+import requests
+from pydantic import BaseModel, Field
+from src.runners.scheduler import is_rate_limit_error
+from src.utils.deadline import Deadline
+from src.utils.metrics import pixel_hedges_total, pixel_retries_total
+from src.utils.timings import percentile
+
+# Pixels that can be sent again without changing the outcome of the test. AddToolExecution
+# records a tool result in the room and RunMCPTool may have side effects, so neither is
+# ever repeated.
+IDEMPOTENT_PIXELS = {"AskPlayground", "UpdateRoomOptions"}
+
+TRANSIENT_ERROR = re.compile(
+    r"timed? ?out|timeout|temporarily unavailable|service unavailable|bad gateway"
+    r"|gateway timeout|\b50[234]\b|connection (reset|refused|aborted)|remote end closed",
+    re.IGNORECASE,
+)
+
+
+CONNECTION_REFUSED = re.compile(
+    r"connection refused|failed to establish a new connection", re.IGNORECASE
+)
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """Errors worth retrying: rate limits, timeouts, dropped connections and 5xx."""
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    return is_rate_limit_error(error) or bool(TRANSIENT_ERROR.search(str(error)))
+
+
+def is_unsent_error(error: BaseException) -> bool:
+    """
+    Errors that mean SEMOSS never took the call: the connection couldn't be made, or the
+    call was rate limited. After a timeout, a dropped connection or a 5xx it may have.
+    """
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    return is_rate_limit_error(error) or bool(CONNECTION_REFUSED.search(str(error)))
+
+
+def is_hedgeable(pixel_name: Optional[str], pixel: str) -> bool:
+    """
+    Only plain AskPlayground pixels are hedged. A duplicate tool calling AskPlayground would
+    leave a second, unanswered tool call in the room.
+    """
+    return pixel_name == "AskPlayground" and "mcpToolID" not in pixel
+
+
+def is_retryable(pixel_name: Optional[str], pixel: str, error: BaseException) -> bool:
+    """
+    Plain AskPlayground pixels are retried on any transient error, a duplicate is no worse
+    than a hedge. Other idempotent pixels are only retried if the first call never reached
+    SEMOSS, since a duplicate tool calling AskPlayground would leave an unanswered tool
+    call in the room.
+    """
+    if is_hedgeable(pixel_name, pixel):
+        return is_transient_error(error)
+    return pixel_name in IDEMPOTENT_PIXELS and is_unsent_error(error)
+
+
+class RetryPolicy(BaseModel):
+    max_attempts: int = Field(3, ge=1)
+    base_delay_seconds: float = Field(0.5, ge=0)
+    max_delay_seconds: float = Field(8.0, ge=0)
+
+    def backoff(self, retry: int, rng: random.Random) -> float:
+        """Exponential backoff with full jitter, retry counts from 0."""
+        return rng.uniform(
+            0, min(self.max_delay_seconds, self.base_delay_seconds * 2**retry)
+        )
+
+
+class HedgePolicy(BaseModel):
+    enabled: bool = False
+    # The duplicate is sent once the request has taken longer than this percentile of the
+    # engine's recent latencies
+    percentile: float = Field(95.0, gt=0, le=100)
+    min_delay_seconds: float = Field(1.0, ge=0)
+    max_delay_seconds: float = Field(60.0, ge=0)
+    # Latencies needed before an engine is hedged, until then all engines' are used
+    min_samples: int = Field(20, ge=1)
+    window: int = Field(200, ge=1)
+
+
+class CallCounts:
+    """Retries and hedges of one tester's pixels, recorded on its StandardResponse."""
+
+    def __init__(self):
+        self.retries = 0
+        self.hedges = 0
+
+
+class LatencyWindow:
+    """Recent successful latencies of a pixel type, per engine and across engines."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._samples: Dict[Tuple[str, str], Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, pixel_name: str, engine_id: str, seconds: float):
+        with self._lock:
+            for key in ((pixel_name, engine_id), (pixel_name, "")):
+                self._samples.setdefault(key, deque(maxlen=self.size)).append(seconds)
+
+    def percentile(
+        self, pixel_name: str, engine_id: str, pct: float, min_samples: int
+    ) -> Optional[float]:
+        with self._lock:
+            for key in ((pixel_name, engine_id), (pixel_name, "")):
+                samples = self._samples.get(key)
+                if samples and len(samples) >= min_samples:
+                    return percentile(list(samples), pct)
+        return None
+
+
+class ResilientPixelRunner:
+    """
+    Sends a pixel with classified retries: errors `is_retryable` allows for the pixel are
+    retried with exponential backoff and jitter, anything else is raised right away.
+
+    With hedging enabled, a plain AskPlayground that's still running after the engine's
+    percentile latency gets a duplicate, and the first successful answer is kept. The
+    slower request is left to finish in the background.
+    """
+
+    def __init__(
+        self,
+        retry: RetryPolicy = RetryPolicy(),
+        hedge: HedgePolicy = HedgePolicy(),
+        hedge_workers: int = 128,
+    ):
+        self.retry = retry
+        self.hedge = hedge
+        self.hedge_workers = hedge_workers
+        self.latencies = LatencyWindow(hedge.window)
+        self._rng = random.Random()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.hedge_workers, thread_name_prefix="pixel-hedge"
+                )
+            return self._executor
+
+    def run(
+        self,
+        send: Callable[[], Any],
+        pixel: str,
+        pixel_name: Optional[str],
+        engine_id: str,
+        provider: str,
+        counts: CallCounts,
+        cancel_event: Optional[threading.Event] = None,
+        deadline: Optional[Deadline] = None,
+        on_error: Optional[Callable[[Exception], None]] = None,
+    ) -> Any:
+        """
+        Calls send until it succeeds or fails for good. on_error is called with every
+        failed attempt's error, the last one is raised. No retry is made that would wait
+        past the deadline.
+        """
+        retry = 0
+        while True:
+            try:
+                return self._send(send, pixel, pixel_name, engine_id, provider, counts)
+            except Exception as e:
+                if on_error:
+                    on_error(e)
+                if retry + 1 >= self.retry.max_attempts or not is_retryable(
+                    pixel_name, pixel, e
+                ):
+                    raise
+                delay = self.retry.backoff(retry, self._rng)
+                remaining = deadline.remaining() if deadline else None
+                if remaining is not None and delay >= remaining:
+                    raise
+                print(
+                    f"Retrying {pixel_name} for {engine_id} in {delay:.2f}s "
+                    f"after: {str(e)[:200]}"
+                )
+                # A cancelled run stops instead of waiting out the backoff
+                if cancel_event and cancel_event.wait(delay):
+                    raise
+                if not cancel_event:
+                    time.sleep(delay)
+                retry += 1
+                counts.retries += 1
+                pixel_retries_total.inc(provider, pixel_name)
+
+    def _send(
+        self,
+        send: Callable[[], Any],
+        pixel: str,
+        pixel_name: Optional[str],
+        engine_id: str,
+        provider: str,
+        counts: CallCounts,
+    ) -> Any:
+        delay = None
+        if self.hedge.enabled and is_hedgeable(pixel_name, pixel):
+            delay = self.latencies.percentile(
+                pixel_name, engine_id, self.hedge.percentile, self.hedge.min_samples
+            )
+        if delay is None:
+            return self._timed_send(send, pixel_name, engine_id)
+
+        delay = min(max(delay, self.hedge.min_delay_seconds), self.hedge.max_delay_seconds)
+        executor = self._get_executor()
+        primary = executor.submit(self._timed_send, send, pixel_name, engine_id)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+
+        counts.hedges += 1
+        hedge = executor.submit(self._timed_send, send, pixel_name, engine_id)
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    error = e
+                    continue
+                pixel_hedges_total.inc(
+                    provider, pixel_name, "hedge" if future is hedge else "primary"
+                )
+                return result
+        raise error
+
+    def _timed_send(
+        self, send: Callable[[], Any], pixel_name: Optional[str], engine_id: str
+    ) -> Any:
+        start = time.perf_counter()
+        result = send()
+        if pixel_name:
+            self.latencies.record(pixel_name, engine_id, time.perf_counter() - start)
+        return result
+
+
+pixel_runner = ResilientPixelRunner(
+    retry=RetryPolicy(
+        max_attempts=int(os.getenv("PIXEL_RETRY_ATTEMPTS", "3")),
+        base_delay_seconds=float(os.getenv("PIXEL_RETRY_BASE_SECONDS", "0.5")),
+        max_delay_seconds=float(os.getenv("PIXEL_RETRY_MAX_SECONDS", "8")),
+    ),
+    hedge=HedgePolicy(
+        enabled=os.getenv("PIXEL_HEDGE", "false").lower() == "true",
+        percentile=float(os.getenv("PIXEL_HEDGE_PERCENTILE", "95")),
+        min_delay_seconds=float(os.getenv("PIXEL_HEDGE_MIN_SECONDS", "1")),
+    ),
+)
@@ -0,0 +1,173 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+from src.tests.response_models import StandardConfirmation
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def cache_key(model: str, kind: str, instructions: str, model_response: str) -> str:
+    """
+    Content address of a confirmation: the same response, judged by the same confirmer
+    model against the same instructions, gets the same verdict.
+    """
+    return _sha256(
+        "\n".join([model, kind, _sha256(instructions), _sha256(model_response)])
+    )
+
+
+class ConfirmationCache:
+    """
+    Confirmer verdicts stored in SQLite so re-running a suite only pays the confirmer for
+    responses that changed. Entries older than max_age_seconds are dropped, and past
+    max_entries the least recently used ones go first.
+
+    With bypass set, every confirmation goes to the confirmer and refreshes its entry.
+    """
+
+    def __init__(
+        self,
+        path: str = "confirmation_cache.sqlite3",
+        max_entries: int = 100_000,
+        max_age_seconds: float = 7 * 24 * 3600,
+        bypass: bool = False,
+        evict_every: int = 100,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_seconds
+        self.bypass = bypass
+        self.evict_every = evict_every
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS confirmations (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    confirmation TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used_at REAL NOT NULL
+                )
+                """
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS confirmations_last_used_at "
+                "ON confirmations (last_used_at)"
+            )
+            self._evict()
+        return self._connection
+
+    def get(self, key: str) -> Optional[StandardConfirmation]:
+        if self.bypass:
+            return None
+        try:
+            row = self._get(key)
+        except sqlite3.Error as e:
+            print(f"Confirmation cache lookup failed: {e}")
+            return None
+        return StandardConfirmation.model_validate_json(row[0]) if row else None
+
+    def _get(self, key: str) -> Optional[tuple]:
+        with self._lock:
+            connection = self._connect()
+            now = time.time()
+            row = connection.execute(
+                "SELECT confirmation FROM confirmations WHERE key = ? AND created_at > ?",
+                (key, now - self.max_age_seconds),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            connection.execute(
+                "UPDATE confirmations SET last_used_at = ? WHERE key = ?", (now, key)
+            )
+            connection.commit()
+            self.hits += 1
+            return row
+
+    def put(
+        self, key: str, model: str, kind: str, confirmation: StandardConfirmation
+    ):
+        try:
+            self._put(key, model, kind, confirmation)
+        except sqlite3.Error as e:
+            print(f"Confirmation cache write failed: {e}")
+
+    def _put(
+        self, key: str, model: str, kind: str, confirmation: StandardConfirmation
+    ):
+        with self._lock:
+            connection = self._connect()
+            now = time.time()
+            connection.execute(
+                "INSERT OR REPLACE INTO confirmations VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, kind, confirmation.model_dump_json(), now, now),
+            )
+            self._writes += 1
+            if self._writes % self.evict_every == 0:
+                self._evict()
+            connection.commit()
+
+    def _evict(self):
+        connection = self._connection
+        expired = connection.execute(
+            "DELETE FROM confirmations WHERE created_at <= ?",
+            (time.time() - self.max_age_seconds,),
+        ).rowcount
+        overflow = connection.execute(
+            """
+            DELETE FROM confirmations WHERE key IN (
+                SELECT key FROM confirmations ORDER BY last_used_at DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_entries,),
+        ).rowcount
+        connection.commit()
+        self.evictions += expired + overflow
+
+    def clear(self):
+        with self._lock:
+            connection = self._connect()
+            connection.execute("DELETE FROM confirmations")
+            connection.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            entries = (
+                self._connect().execute("SELECT COUNT(*) FROM confirmations").fetchone()[0]
+            )
+            return {
+                "path": self.path,
+                "bypass": self.bypass,
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+
+confirmation_cache = ConfirmationCache(
+    path=os.getenv("CONFIRMATION_CACHE_PATH", "confirmation_cache.sqlite3"),
+    max_entries=int(os.getenv("CONFIRMATION_CACHE_MAX_ENTRIES", "100000")),
+    max_age_seconds=float(os.getenv("CONFIRMATION_CACHE_MAX_AGE_SECONDS", "604800")),
+    bypass=os.getenv("CONFIRMATION_CACHE_BYPASS", "false").lower() == "true",
+)
@@ -0,0 +1,198 @@
+import json
+import re
+from typing import Any, Callable, Iterator, List
+
+# A compiled schema: yields an error message for each violation found in the value at path
+Validator = Callable[[Any, str], Iterator[str]]
+
+ANNOTATIONS = {"$schema", "$id", "title", "description", "default", "examples"}
+
+JSON_TYPES: dict[str, Callable[[Any], bool]] = {
+    "object": lambda value: isinstance(value, dict),
+    "array": lambda value: isinstance(value, list),
+    "string": lambda value: isinstance(value, str),
+    "boolean": lambda value: isinstance(value, bool),
+    "null": lambda value: value is None,
+    "number": lambda value: (
+        isinstance(value, (int, float)) and not isinstance(value, bool)
+    ),
+    "integer": lambda value: (
+        (isinstance(value, int) and not isinstance(value, bool))
+        or (isinstance(value, float) and value.is_integer())
+    ),
+}
+
+
+def json_type_name(value: Any) -> str:
+    if isinstance(value, bool):
+        return "boolean"
+    if value is None:
+        return "null"
+    if isinstance(value, dict):
+        return "object"
+    if isinstance(value, list):
+        return "array"
+    if isinstance(value, str):
+        return "string"
+    return "integer" if isinstance(value, int) else "number"
+
+
+def compile_schema(schema: dict) -> Validator:
+    """
+    Compiles a JSON schema into a validator once, so checking a response is only the
+    walk over its value. Covers the keywords the tests' schemas use: type, enum, const,
+    properties, required, additionalProperties, items, min/maxItems, min/maxLength,
+    pattern, minimum, maximum and anyOf. Any other keyword raises, rather than being
+    silently ignored and letting responses pass unchecked.
+    """
+    checks: List[Validator] = []
+
+    unsupported = set(schema) - ANNOTATIONS - {
+        "type",
+        "enum",
+        "const",
+        "properties",
+        "required",
+        "additionalProperties",
+        "items",
+        "minItems",
+        "maxItems",
+        "minLength",
+        "maxLength",
+        "pattern",
+        "minimum",
+        "maximum",
+        "anyOf",
+    }
+    if unsupported:
+        raise ValueError(f"Unsupported schema keywords: {sorted(unsupported)}")
+
+    types = schema.get("type", [])
+    types = types if isinstance(types, list) else [types]
+    type_checks = [JSON_TYPES[name] for name in types]
+    expected = " or ".join(types)
+
+    if "enum" in schema:
+        options = schema["enum"]
+
+        def check_enum(value, path):
+            if value not in options:
+                yield f"{path}: {json.dumps(value)} is not one of {json.dumps(options)}"
+
+        checks.append(check_enum)
+
+    if "const" in schema:
+        const = schema["const"]
+
+        def check_const(value, path):
+            if value != const:
+                yield f"{path}: expected {json.dumps(const)}"
+
+        checks.append(check_const)
+
+    properties = {
+        name: compile_schema(subschema)
+        for name, subschema in schema.get("properties", {}).items()
+    }
+    required = schema.get("required", [])
+    additional = schema.get("additionalProperties", True)
+    additional_validator = (
+        compile_schema(additional) if isinstance(additional, dict) else None
+    )
+    if properties or required or additional is not True:
+
+        def check_object(value, path):
+            if not isinstance(value, dict):
+                return
+            for name in required:
+                if name not in value:
+                    yield f"{path}: missing required property '{name}'"
+            for name, item in value.items():
+                if name in properties:
+                    yield from properties[name](item, f"{path}.{name}")
+                elif additional is False:
+                    yield f"{path}: unexpected property '{name}'"
+                elif additional_validator:
+                    yield from additional_validator(item, f"{path}.{name}")
+
+        checks.append(check_object)
+
+    items = compile_schema(schema["items"]) if "items" in schema else None
+    min_items = schema.get("minItems")
+    max_items = schema.get("maxItems")
+    if items or min_items is not None or max_items is not None:
+
+        def check_array(value, path):
+            if not isinstance(value, list):
+                return
+            if min_items is not None and len(value) < min_items:
+                yield f"{path}: expected at least {min_items} items, got {len(value)}"
+            if max_items is not None and len(value) > max_items:
+                yield f"{path}: expected at most {max_items} items, got {len(value)}"
+            if items:
+                for i, item in enumerate(value):
+                    yield from items(item, f"{path}[{i}]")
+
+        checks.append(check_array)
+
+    min_length = schema.get("minLength")
+    max_length = schema.get("maxLength")
+    pattern = re.compile(schema["pattern"]) if "pattern" in schema else None
+    if min_length is not None or max_length is not None or pattern:
+
+        def check_string(value, path):
+            if not isinstance(value, str):
+                return
+            if min_length is not None and len(value) < min_length:
+                yield f"{path}: shorter than {min_length} characters"
+            if max_length is not None and len(value) > max_length:
+                yield f"{path}: longer than {max_length} characters"
+            if pattern and not pattern.search(value):
+                yield f"{path}: does not match {pattern.pattern!r}"
+
+        checks.append(check_string)
+
+    minimum = schema.get("minimum")
+    maximum = schema.get("maximum")
+    if minimum is not None or maximum is not None:
+
+        def check_number(value, path):
+            if not JSON_TYPES["number"](value):
+                return
+            if minimum is not None and value < minimum:
+                yield f"{path}: {value} is less than the minimum of {minimum}"
+            if maximum is not None and value > maximum:
+                yield f"{path}: {value} is greater than the maximum of {maximum}"
+
+        checks.append(check_number)
+
+    if "anyOf" in schema:
+        any_of = [compile_schema(subschema) for subschema in schema["anyOf"]]
+
+        def check_any_of(value, path):
+            if not any(not list(option(value, path)) for option in any_of):
+                yield f"{path}: does not match any of the allowed schemas"
+
+        checks.append(check_any_of)
+
+    def validate(value, path="$"):
+        if type_checks and not any(check(value) for check in type_checks):
+            # Nothing else about a value of the wrong type is worth reporting
+            yield f"{path}: expected {expected}, got {json_type_name(value)}"
+            return
+        for check in checks:
+            yield from check(value, path)
+
+    return validate
+
+
+def validate_json(text: str, validator: Validator) -> List[str]:
+    """
+    Parses a response and checks it against a compiled schema. Returns the errors found,
+    with the line and column of a parse error or the path of each schema violation.
+    """
+    try:
+        value = json.loads(text)
+    except json.JSONDecodeError as e:
+        return [f"Invalid JSON: {e.msg} at line {e.lineno} column {e.colno}"]
+    return list(validator(value, "$"))
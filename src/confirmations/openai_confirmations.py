@@ -1,71 +1,120 @@
-from typing import Optional
-import yfinance as yf
+from typing import Literal, Optional
+from openai import NOT_GIVEN
 from src.clients.clients import get_openai_client
-from src.tests.response_models import StandardConfirmation
+from src.confirmations.reference_data import ReferenceDataProvider, reference_data
+from src.tests.response_models import BatchConfirmation, StandardConfirmation
+from src.utils.constants import REFERENCE_TICKER
 from src.utils.models import DeploymentKeys
 
 
+ConfirmationKind = Literal["image", "json_structure", "tool_calling"]
+
+BATCH_INSTRUCTIONS = (
+    " Several responses are given below, each wrapped in a <response id=...> tag."
+    " Judge each response on its own and return exactly one verdict per response, with its id."
+)
+
+
+class ReferenceDataUnavailableError(Exception):
+    pass
+
+
 class OpenAIConfirmations:
     def __init__(
-        self, deployment_keys: DeploymentKeys, model: Optional[str] = "gpt-4.1-nano"
+        self,
+        deployment_keys: DeploymentKeys,
+        model: Optional[str] = "gpt-4.1-nano",
+        reference_data: ReferenceDataProvider = reference_data,
     ):
         self.model = model
         self.openai_client = get_openai_client(deployment_keys.openai_secret_key)
+        self.reference_data = reference_data
 
-    def confirm_image_response(self, model_response: str) -> StandardConfirmation:
-        system_prompt = (
-            f"The following response was generated by an AI model based on image inputs. "
-            f"Please confirm if the response describes a vehicle."
-            "If the model response does not include a description of a vehicle, mark confirmed as false."
+    def instructions(self, kind: ConfirmationKind) -> str:
+        if kind == "image":
+            return (
+                f"The following response was generated by an AI model based on image inputs. "
+                f"Please confirm if the response describes a vehicle."
+                "If the model response does not include a description of a vehicle, mark confirmed as false."
+            )
+        if kind == "json_structure":
+            return (
+                "The following response was generated by an AI model. "
+                "Please confirm if the response is a valid JSON structure."
+                "Also confirm that the JSON lists soccer players with their name, position, country, and skill rating."
+                "Ensure there is no additional text outside the JSON."
+            )
+        stock_price = self.fetch_stock_data(REFERENCE_TICKER)
+        if stock_price is None:
+            # A verdict judged without the price would be cached like any other
+            raise ReferenceDataUnavailableError(
+                f"No reference price for {REFERENCE_TICKER} to confirm against"
+            )
+        return (
+            "The following response was generated by an AI model using tool calling. "
+            f"Please confirm that the response includes the current stock price of {REFERENCE_TICKER}."
+            f"Please confirm that the stock price in the response is within a few dollars of ${stock_price}."
         )
+
+    def confirm(
+        self,
+        kind: ConfirmationKind,
+        model_response: str,
+        timeout: Optional[float] = None,
+    ) -> StandardConfirmation:
         response = self.openai_client.responses.parse(
             model=self.model,
             input=model_response,
-            instructions=system_prompt,
+            instructions=self.instructions(kind),
             text_format=StandardConfirmation,
+            timeout=NOT_GIVEN if timeout is None else timeout,
         )
 
         return response.output_parsed
 
-    def confirm_json_structure(self, model_response: str) -> StandardConfirmation:
-        system_prompt = (
-            "The following response was generated by an AI model. "
-            "Please confirm if the response is a valid JSON structure."
-            "Also confirm that the JSON lists soccer players with their name, position, country, and skill rating."
-            "Ensure there is no additional text outside the JSON."
+    def confirm_batch(
+        self,
+        kind: ConfirmationKind,
+        model_responses: list[str],
+        timeout: Optional[float] = None,
+    ) -> list[Optional[StandardConfirmation]]:
+        """
+        Confirms several responses of the same kind with a single confirmer call. Verdicts
+        are matched back to the responses by id, None for any response the confirmer skipped.
+        """
+        batch_input = "\n\n".join(
+            f'<response id="{i}">\n{model_response}\n</response>'
+            for i, model_response in enumerate(model_responses)
         )
         response = self.openai_client.responses.parse(
             model=self.model,
-            input=model_response,
-            instructions=system_prompt,
-            text_format=StandardConfirmation,
+            input=batch_input,
+            instructions=self.instructions(kind) + BATCH_INSTRUCTIONS,
+            text_format=BatchConfirmation,
+            timeout=NOT_GIVEN if timeout is None else timeout,
         )
 
-        return response.output_parsed
+        verdicts = {verdict.id: verdict for verdict in response.output_parsed.verdicts}
+        return [
+            StandardConfirmation(
+                confirmation_response=verdicts[str(i)].confirmation_response,
+                confirmed=verdicts[str(i)].confirmed,
+            )
+            if str(i) in verdicts
+            else None
+            for i in range(len(model_responses))
+        ]
 
-    def fetch_stock_data(self, ticker_symbol: str):
-        try:
-            ticker = yf.Ticker(ticker_symbol)
-            stock_info = ticker.info
-            return stock_info.get("currentPrice", None)
+    def confirm_image_response(self, model_response: str) -> StandardConfirmation:
+        return self.confirm("image", model_response)
+
+    def confirm_json_structure(self, model_response: str) -> StandardConfirmation:
+        return self.confirm("json_structure", model_response)
 
-        except Exception as e:
-            return {"error": str(e)}
+    def fetch_stock_data(self, ticker_symbol: str) -> Optional[float]:
+        return self.reference_data.get_price(ticker_symbol)
 
     def confirm_tool_calling_response(
         self, model_response: str
     ) -> StandardConfirmation:
-        stock_price = self.fetch_stock_data("META")
-        system_prompt = (
-            "The following response was generated by an AI model using tool calling. "
-            "Please confirm that the response includes the current stock price of META."
-            f"Please confirm that the stock price in the response is within a few dollars of ${stock_price}."
-        )
-        response = self.openai_client.responses.parse(
-            model=self.model,
-            input=model_response,
-            instructions=system_prompt,
-            text_format=StandardConfirmation,
-        )
-
-        return response.output_parsed
+        return self.confirm("tool_calling", model_response)
@@ -0,0 +1,515 @@
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Literal, Optional, Tuple
+from openai import APITimeoutError
+from pydantic import BaseModel
+from src.confirmations.confirmation_cache import cache_key, confirmation_cache
+from src.confirmations.openai_confirmations import (
+    ConfirmationKind,
+    OpenAIConfirmations,
+)
+from src.tests.response_models import (
+    PhaseTiming,
+    StandardConfirmation,
+    StandardResponse,
+)
+from src.utils.deadline import Deadline, DeadlineExceeded, timeouts
+from src.utils.metrics import (
+    confirmations_total,
+    confirmer_errors_total,
+    confirmer_seconds,
+)
+from src.utils.timings import timed
+from src.utils.tracing import current_span, tracer
+
+
+class PendingConfirmation:
+    def __init__(
+        self,
+        confirmer: OpenAIConfirmations,
+        kind: ConfirmationKind,
+        model_response: str,
+        deadline: Optional[Deadline] = None,
+    ):
+        self.confirmer = confirmer
+        self.kind = kind
+        self.model_response = model_response
+        # The run's deadline, the confirmer call is limited by what's left of it
+        self.deadline = deadline or Deadline()
+        self.cached = False
+        self._cache_key: Optional[str] = None
+        # Added to the response's timings once it's confirmed
+        self.timings: List[PhaseTiming] = []
+        # The cell's span, the confirmation is traced under it on whichever thread runs it
+        self.span = current_span()
+
+    def run(self) -> StandardConfirmation:
+        with tracer.activate(self.span):
+            confirmation = self.lookup()
+            if confirmation is None:
+                try:
+                    with timed(
+                        self.timings,
+                        "confirmation",
+                        kind=self.kind,
+                        model=self.confirmer.model,
+                    ):
+                        confirmation = self.confirmer.confirm(
+                            self.kind,
+                            self.model_response,
+                            self.deadline.timeout(timeouts.confirmation_seconds),
+                        )
+                except Exception:
+                    confirmer_errors_total.inc(self.kind, "inline")
+                    raise
+                finally:
+                    confirmer_seconds.observe(self.timings[-1].seconds, self.kind, "inline")
+                self.store(confirmation)
+        return confirmation
+
+    def instructions(self) -> str:
+        if self.kind != "tool_calling":
+            return self.confirmer.instructions(self.kind)
+        # The tool calling instructions include the reference price
+        with timed(self.timings, "reference_data"):
+            return self.confirmer.instructions(self.kind)
+
+    def cache_key(self) -> str:
+        if self._cache_key is None:
+            self._cache_key = cache_key(
+                self.confirmer.model,
+                self.kind,
+                self.instructions(),
+                self.model_response,
+            )
+        return self._cache_key
+
+    def lookup(self) -> Optional[StandardConfirmation]:
+        """Returns the cached verdict for this response, if it was confirmed before."""
+        with tracer.activate(self.span):
+            key = self.cache_key()
+            with timed(self.timings, "confirmation_cache"):
+                confirmation = confirmation_cache.get(key)
+        self.cached = confirmation is not None
+        return confirmation
+
+    def store(self, confirmation: StandardConfirmation):
+        confirmation_cache.put(
+            self.cache_key(), self.confirmer.model, self.kind, confirmation
+        )
+
+    def batch_key(self) -> tuple:
+        """Confirmations with the same key can share one confirmer request."""
+        return (id(self.confirmer.openai_client), self.confirmer.model, self.kind)
+
+    def batch_request(self, custom_id: str) -> dict:
+        """The confirmation as a line of an OpenAI Batch API input file."""
+        schema = StandardConfirmation.model_json_schema()
+        schema["additionalProperties"] = False
+        return {
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/responses",
+            "body": {
+                "model": self.confirmer.model,
+                "instructions": self.instructions(),
+                "input": self.model_response,
+                "text": {
+                    "format": {
+                        "type": "json_schema",
+                        "name": "StandardConfirmation",
+                        "schema": schema,
+                        "strict": True,
+                    }
+                },
+            },
+        }
+
+
+def apply_confirmation(
+    standard_response: StandardResponse,
+    confirmation: StandardConfirmation,
+    pending: Optional[PendingConfirmation] = None,
+) -> StandardResponse:
+    return standard_response.model_copy(
+        update={
+            "success": confirmation.confirmed,
+            "confirmation_response": confirmation.confirmation_response,
+            "confirmation_cached": bool(pending and pending.cached),
+            "timings": [
+                *standard_response.timings,
+                *(pending.timings if pending else []),
+            ],
+        }
+    )
+
+
+OFFLINE_PENDING = "Pending offline confirmation: "
+
+ConfirmationMode = Literal["inline", "batched", "offline"]
+
+QueuedConfirmation = Tuple[StandardResponse, PendingConfirmation, Future]
+
+
+def pending_offline(response: StandardResponse) -> bool:
+    """Whether the response is waiting for its offline confirmation, so it isn't final."""
+    return (response.confirmation_response or "").startswith(OFFLINE_PENDING)
+
+
+def parse_batch_results(lines: Iterable[str]) -> Dict[str, StandardConfirmation]:
+    """
+    Reads an OpenAI Batch API output file for requests written in offline mode, keyed by
+    custom_id. Failed requests are left out.
+    """
+    confirmations = {}
+    for line in lines:
+        if not line.strip():
+            continue
+        entry = json.loads(line)
+        body = (entry.get("response") or {}).get("body") or {}
+        for item in body.get("output", []):
+            if item.get("type") != "message":
+                continue
+            for content in item.get("content", []):
+                if content.get("type") == "output_text":
+                    confirmations[entry["custom_id"]] = (
+                        StandardConfirmation.model_validate_json(content["text"])
+                    )
+    return confirmations
+
+
+def apply_batch_results(
+    results: Dict[str, BaseModel], confirmations: Dict[str, StandardConfirmation]
+) -> List[Tuple[str, str, StandardResponse]]:
+    """
+    Fills in the cells of a run's results (model name -> TestResults) that are pending
+    offline confirmation. Returns the (model name, test, response) of each cell confirmed.
+    """
+    applied = []
+    for model_name, test_results in results.items():
+        for test, response in test_results:
+            if not isinstance(response, StandardResponse) or not pending_offline(response):
+                continue
+            custom_id = response.confirmation_response.removeprefix(OFFLINE_PENDING)
+            if custom_id in confirmations:
+                confirmed = apply_confirmation(response, confirmations[custom_id])
+                setattr(test_results, test, confirmed)
+                applied.append((model_name, test, confirmed))
+    return applied
+
+
+class ConfirmationStage:
+    """
+    Second stage of a run: confirms generated responses on its own worker pool, so the
+    generation workers move on to the next cell instead of waiting on the confirmer.
+
+    Modes:
+    - inline: one confirmer request per response
+    - batched: responses of the same kind and confirmer are grouped into one request, sent
+      once batch_size are waiting or the oldest has waited flush_seconds
+    - offline: requests are appended to batch_file for the OpenAI Batch API and the cells
+      are returned pending, to be filled in later with `apply_batch_results`
+    """
+
+    def __init__(
+        self,
+        workers: int = 16,
+        mode: ConfirmationMode = "inline",
+        batch_size: int = 20,
+        flush_seconds: float = 0.5,
+        batch_file: str = "confirmation_batch.jsonl",
+    ):
+        self.workers = workers
+        self.mode = mode
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.batch_file = batch_file
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._batches: Dict[tuple, List[QueuedConfirmation]] = {}
+        self._batch_started: Dict[tuple, float] = {}
+        self._flusher: Optional[threading.Thread] = None
+        self.backlog = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.total_seconds = 0.0
+        self.batches_sent = 0
+        self.offline_written = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="confirmation"
+                )
+            return self._executor
+
+    def submit(
+        self, standard_response: StandardResponse, pending: PendingConfirmation
+    ) -> "Future[StandardResponse]":
+        if self.mode == "offline":
+            try:
+                confirmation = pending.lookup()
+                if not confirmation:
+                    return self._write_offline(standard_response, pending)
+            except Exception as e:
+                # ie. the instructions' reference price is missing
+                confirmation = e
+            future: Future = Future()
+            future.set_result(self._finish(standard_response, confirmation, pending))
+            return future
+
+        with self._lock:
+            self.backlog += 1
+        if self.mode == "batched":
+            return self._add_to_batch(standard_response, pending)
+        future = self._get_executor().submit(self._confirm, standard_response, pending)
+        future.add_done_callback(self._drop_cancelled)
+        return future
+
+    def _add_to_batch(
+        self, standard_response: StandardResponse, pending: PendingConfirmation
+    ) -> "Future[StandardResponse]":
+        future: Future = Future()
+        future.add_done_callback(self._drop_cancelled)
+        key = pending.batch_key()
+        with self._lock:
+            batch = self._batches.setdefault(key, [])
+            if not batch:
+                self._batch_started[key] = time.monotonic()
+            batch.append((standard_response, pending, future))
+            full = None
+            if len(batch) >= self.batch_size:
+                full = self._batches.pop(key)
+                del self._batch_started[key]
+            elif self._flusher is None:
+                self._flusher = threading.Thread(
+                    target=self._flush_loop, name="confirmation-flusher", daemon=True
+                )
+                self._flusher.start()
+        if full:
+            self._get_executor().submit(self._confirm_batch, full)
+        return future
+
+    def _flush_loop(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                due = [
+                    key
+                    for key, started in self._batch_started.items()
+                    if now - started >= self.flush_seconds
+                ]
+                batches = [self._batches.pop(key) for key in due]
+                for key in due:
+                    del self._batch_started[key]
+                wait = min(
+                    [
+                        started + self.flush_seconds - now
+                        for started in self._batch_started.values()
+                    ],
+                    default=self.flush_seconds,
+                )
+            for batch in batches:
+                self._get_executor().submit(self._confirm_batch, batch)
+            time.sleep(max(wait, 0.01))
+
+    def _write_offline(
+        self, standard_response: StandardResponse, pending: PendingConfirmation
+    ) -> "Future[StandardResponse]":
+        custom_id = f"{standard_response.model_id}-{pending.kind}-{uuid.uuid4().hex[:8]}"
+        line = json.dumps(pending.batch_request(custom_id))
+        with self._lock:
+            with open(self.batch_file, "a") as batch_file:
+                batch_file.write(line + "\n")
+            self.offline_written += 1
+        confirmations_total.inc(pending.kind, "offline")
+        future: Future = Future()
+        future.set_result(
+            standard_response.model_copy(
+                update={
+                    "success": False,
+                    "confirmation_response": OFFLINE_PENDING + custom_id,
+                    "timings": [*standard_response.timings, *pending.timings],
+                }
+            )
+        )
+        return future
+
+    def _drop_cancelled(self, future: Future):
+        if future.cancelled():
+            with self._lock:
+                self.backlog -= 1
+
+    def _confirm(
+        self, standard_response: StandardResponse, pending: PendingConfirmation
+    ) -> StandardResponse:
+        with self._lock:
+            self.backlog -= 1
+            self.in_flight += 1
+        start = time.monotonic()
+        try:
+            confirmation = pending.run()
+        except Exception as e:
+            confirmation = e
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self.total_seconds += time.monotonic() - start
+        return self._finish(standard_response, confirmation, pending)
+
+    def _confirm_batch(self, batch: List[QueuedConfirmation]):
+        # Cells whose run was cancelled while they waited for the batch are dropped
+        batch = [item for item in batch if item[2].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        with self._lock:
+            self.backlog -= len(batch)
+            self.in_flight += len(batch)
+        start = time.monotonic()
+        try:
+            self._run_batch(batch)
+        except Exception as e:
+            # Every future is RUNNING by now, one left unresolved would hang its run
+            print(f"Confirmation batch failed: {e}")
+            for standard_response, pending, future in batch:
+                if future.done():
+                    continue
+                try:
+                    future.set_result(self._finish(standard_response, e, pending))
+                except Exception:
+                    future.set_exception(e)
+        finally:
+            with self._lock:
+                self.in_flight -= len(batch)
+                self.total_seconds += (time.monotonic() - start) * len(batch)
+
+    def _run_batch(self, batch: List[QueuedConfirmation]):
+        uncached = []
+        for standard_response, pending, future in batch:
+            try:
+                confirmation = pending.lookup()
+            except Exception as e:
+                future.set_result(self._finish(standard_response, e, pending))
+                continue
+            if confirmation:
+                future.set_result(self._finish(standard_response, confirmation, pending))
+            else:
+                uncached.append((standard_response, pending, future))
+
+        # Cells whose run's deadline expired while they waited fail on their own, the rest
+        # share the shortest of their remaining budgets
+        live, limits = [], []
+        for standard_response, pending, future in uncached:
+            try:
+                limits.append(pending.deadline.timeout(timeouts.confirmation_seconds))
+            except DeadlineExceeded as e:
+                future.set_result(self._finish(standard_response, e, pending))
+                continue
+            live.append((standard_response, pending, future))
+        uncached = live
+        timeout = min((limit for limit in limits if limit is not None), default=None)
+
+        confirmations = []
+        if uncached:
+            confirmer, kind = uncached[0][1].confirmer, uncached[0][1].kind
+            spans = [
+                tracer.start_span(
+                    "batch",
+                    pending.span,
+                    category="confirmation",
+                    kind=kind,
+                    model=confirmer.model,
+                    batch_size=len(uncached),
+                )
+                for _, pending, _ in uncached
+            ]
+            batch_start = time.perf_counter()
+            try:
+                confirmations = confirmer.confirm_batch(
+                    kind,
+                    [pending.model_response for _, pending, _ in uncached],
+                    timeout,
+                )
+            except Exception as e:
+                confirmer_errors_total.inc(kind, "batch")
+                confirmations = [e] * len(uncached)
+            batch_timing = PhaseTiming(
+                phase="confirmation",
+                name="batch",
+                seconds=time.perf_counter() - batch_start,
+            )
+            confirmer_seconds.observe(batch_timing.seconds, kind, "batch")
+            for (_, pending, _), span in zip(uncached, spans):
+                pending.timings.append(batch_timing)
+                if span:
+                    span.end()
+        with self._lock:
+            self.batches_sent += int(bool(uncached))
+
+        for (standard_response, pending, future), confirmation in zip(
+            uncached, confirmations
+        ):
+            if confirmation is None:
+                confirmation = ValueError(
+                    "Confirmer returned no verdict for this response"
+                )
+            elif isinstance(confirmation, StandardConfirmation):
+                pending.store(confirmation)
+            future.set_result(self._finish(standard_response, confirmation, pending))
+
+    def _finish(
+        self,
+        standard_response: StandardResponse,
+        confirmation: StandardConfirmation | Exception,
+        pending: PendingConfirmation,
+    ) -> StandardResponse:
+        if isinstance(confirmation, Exception):
+            with self._lock:
+                self.failed += 1
+            confirmations_total.inc(pending.kind, "error")
+            return standard_response.model_copy(
+                update={
+                    "success": False,
+                    "confirmation_response": f"Confirmation failed: {confirmation}",
+                    "timings": [*standard_response.timings, *pending.timings],
+                    "timed_out": standard_response.timed_out
+                    or isinstance(confirmation, (APITimeoutError, DeadlineExceeded)),
+                }
+            )
+
+        with self._lock:
+            self.completed += 1
+        confirmations_total.inc(
+            pending.kind, "confirmed" if confirmation.confirmed else "rejected"
+        )
+        return apply_confirmation(standard_response, confirmation, pending)
+
+    def stats(self) -> dict:
+        with self._lock:
+            finished = self.completed + self.failed
+            return {
+                "mode": self.mode,
+                "workers": self.workers,
+                "backlog": self.backlog,
+                "in_flight": self.in_flight,
+                "completed": self.completed,
+                "failed": self.failed,
+                "avg_seconds": self.total_seconds / finished if finished else 0.0,
+                "batches_sent": self.batches_sent,
+                "offline_written": self.offline_written,
+            }
+
+
+confirmation_stage = ConfirmationStage(
+    int(os.getenv("CONFIRMATION_WORKERS", "16")),
+    mode=os.getenv("CONFIRMATION_MODE", "inline"),
+    batch_size=int(os.getenv("CONFIRMATION_BATCH_SIZE", "20")),
+    flush_seconds=float(os.getenv("CONFIRMATION_FLUSH_SECONDS", "0.5")),
+    batch_file=os.getenv("CONFIRMATION_BATCH_FILE", "confirmation_batch.jsonl"),
+)
@@ -0,0 +1,135 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+
+def fetch_stock_price(ticker_symbol: str) -> Optional[float]:
+    # yfinance pulls in pandas, so it's only imported once a price is actually fetched
+    import yfinance as yf
+
+    return yf.Ticker(ticker_symbol).info.get("currentPrice", None)
+
+
+class ReferenceDataProvider:
+    """
+    Reference prices the confirmer checks responses against, cached for ttl_seconds so
+    every confirmation in a run shares one lookup. Concurrent lookups of the same ticker
+    wait on the fetch in progress instead of starting their own.
+
+    Pinned prices are returned as-is and never fetched, so runs can be reproduced and
+    work offline.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 300,
+        pinned: Optional[Dict[str, float]] = None,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.pinned: Dict[str, float] = dict(pinned or {})
+        self._cache: Dict[str, Tuple[Optional[float], float]] = {}
+        self._ticker_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.fetches = 0
+        self.fetch_seconds = 0.0
+        self.last_fetch_seconds: Optional[float] = None
+
+    def _ticker_lock(self, ticker: str) -> threading.Lock:
+        with self._lock:
+            return self._ticker_locks.setdefault(ticker, threading.Lock())
+
+    def _fresh(self, ticker: str) -> bool:
+        entry = self._cache.get(ticker)
+        return entry is not None and time.monotonic() - entry[1] < self.ttl_seconds
+
+    def get_price(self, ticker: str) -> Optional[float]:
+        """
+        Returns the ticker's price, fetching it when it isn't cached or has expired. If the
+        fetch fails the last known price is returned, None if there is none.
+        """
+        if ticker in self.pinned:
+            with self._lock:
+                self.hits += 1
+            return self.pinned[ticker]
+
+        with self._ticker_lock(ticker):
+            if self._fresh(ticker):
+                with self._lock:
+                    self.hits += 1
+                return self._cache[ticker][0]
+
+            with self._lock:
+                self.misses += 1
+            start = time.monotonic()
+            try:
+                price = fetch_stock_price(ticker)
+            except Exception as e:
+                print(f"Failed to fetch the price of {ticker}: {e}")
+                with self._lock:
+                    self.errors += 1
+                entry = self._cache.get(ticker)
+                return entry[0] if entry else None
+
+            elapsed = time.monotonic() - start
+            with self._lock:
+                self.fetches += 1
+                self.fetch_seconds += elapsed
+                self.last_fetch_seconds = elapsed
+            self._cache[ticker] = (price, time.monotonic())
+            return price
+
+    def prefetch(self, ticker: str):
+        """Fetches the price in the background so it's cached before a confirmation needs it."""
+        if ticker in self.pinned or self._fresh(ticker):
+            return
+        threading.Thread(
+            target=self.get_price,
+            args=(ticker,),
+            name=f"prefetch-{ticker}",
+            daemon=True,
+        ).start()
+
+    def pin(self, ticker: str, price: float):
+        self.pinned[ticker] = price
+
+    def unpin(self, ticker: str):
+        self.pinned.pop(ticker, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "pinned": dict(self.pinned),
+                "cached": {
+                    ticker: price for ticker, (price, _) in self._cache.items()
+                },
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "errors": self.errors,
+                "fetches": self.fetches,
+                "avg_fetch_seconds": (
+                    self.fetch_seconds / self.fetches if self.fetches else 0.0
+                ),
+                "last_fetch_seconds": self.last_fetch_seconds,
+            }
+
+
+def load_pinned_prices() -> Dict[str, float]:
+    """
+    Reads pinned prices from the REFERENCE_PRICES environment variable, a JSON object keyed
+    by ticker, ie. {"META": 612.5}
+    """
+    raw = os.getenv("REFERENCE_PRICES")
+    return {ticker: float(price) for ticker, price in json.loads(raw).items()} if raw else {}
+
+
+reference_data = ReferenceDataProvider(
+    ttl_seconds=float(os.getenv("REFERENCE_PRICE_TTL_SECONDS", "300")),
+    pinned=load_pinned_prices(),
+)
@@ -0,0 +1,530 @@
+import hashlib
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, List, Literal, Optional, Tuple
+from src.runners.plan import ExecutionPlan, PlannedCell
+from src.tests.response_models import StandardResponse
+from src.utils.tracing import correlation_id
+
+TrendBucket = Literal["hour", "day", "week"]
+BUCKET_SECONDS = {"hour": 3600, "day": 86400, "week": 7 * 86400}
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS runs (
+        run_id TEXT PRIMARY KEY,
+        correlation_id TEXT,
+        engine TEXT NOT NULL,
+        confirmer_model TEXT,
+        started_at REAL NOT NULL,
+        finished_at REAL,
+        status TEXT NOT NULL,
+        total INTEGER NOT NULL,
+        skipped INTEGER NOT NULL,
+        passed INTEGER NOT NULL DEFAULT 0,
+        failed INTEGER NOT NULL DEFAULT 0,
+        reused INTEGER NOT NULL DEFAULT 0,
+        resumed_from TEXT,
+        timed_out INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS runs_started_at ON runs (started_at)",
+    """
+    CREATE TABLE IF NOT EXISTS cells (
+        id INTEGER PRIMARY KEY,
+        run_id TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        model_id TEXT NOT NULL,
+        model_name TEXT NOT NULL,
+        test TEXT NOT NULL,
+        client TEXT NOT NULL,
+        success INTEGER NOT NULL,
+        timed_out INTEGER NOT NULL,
+        circuit_open INTEGER NOT NULL,
+        total_seconds REAL NOT NULL,
+        retries INTEGER NOT NULL,
+        hedges INTEGER NOT NULL,
+        response_hash TEXT NOT NULL,
+        pixel_hash TEXT NOT NULL,
+        confirmation_response TEXT,
+        confirmation_cached INTEGER NOT NULL,
+        timings TEXT NOT NULL,
+        fingerprint TEXT
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS cells_run_id ON cells (run_id)",
+    "CREATE INDEX IF NOT EXISTS cells_created_at ON cells (created_at)",
+    # Cover the trend and latency queries so they're answered from the index alone
+    "CREATE INDEX IF NOT EXISTS cells_model ON cells "
+    "(model_id, created_at, success, total_seconds)",
+    "CREATE INDEX IF NOT EXISTS cells_test ON cells "
+    "(test, created_at, success, total_seconds)",
+    "CREATE INDEX IF NOT EXISTS cells_client ON cells "
+    "(client, created_at, success, total_seconds)",
+    "CREATE INDEX IF NOT EXISTS cells_success ON cells (success, created_at)",
+    # Response text and pixels, stored once per distinct content
+    """
+    CREATE TABLE IF NOT EXISTS blobs (
+        hash TEXT PRIMARY KEY,
+        content TEXT NOT NULL
+    )
+    """,
+]
+
+CELL_COLUMNS = [
+    "run_id",
+    "created_at",
+    "model_id",
+    "model_name",
+    "test",
+    "client",
+    "success",
+    "timed_out",
+    "circuit_open",
+    "total_seconds",
+    "retries",
+    "hedges",
+    "confirmation_response",
+    "confirmation_cached",
+    "timings",
+    "fingerprint",
+]
+# Columns added since the first version of the schema, added to existing databases
+MIGRATIONS = {
+    "runs": {
+        "reused": "INTEGER NOT NULL DEFAULT 0",
+        "resumed_from": "TEXT",
+        "timed_out": "INTEGER NOT NULL DEFAULT 0",
+    },
+    "cells": {"fingerprint": "TEXT"},
+}
+MIGRATED_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS cells_fingerprint ON cells (fingerprint, created_at)",
+]
+# The status of a run whose every cell has a result, timed_out if any of them timed out.
+# The cell UPDATE sets timed_out before the CASE sees it
+FINISHED_STATUS = "CASE WHEN timed_out > 0 THEN 'timed_out' ELSE 'completed' END"
+INSERT_CELL = (
+    f"INSERT INTO cells ({', '.join(CELL_COLUMNS)}, response_hash, pixel_hash) "
+    f"VALUES ({', '.join('?' * (len(CELL_COLUMNS) + 2))})"
+)
+
+
+def _nearest_rank(pct: float) -> str:
+    """
+    SQL for the rank src.utils.timings.percentile picks among `count` sorted values,
+    rounding half to even like Python's round().
+    """
+    position = f"({float(pct) / 100!r} * count)"
+    whole = f"CAST({position} AS INTEGER)"
+    rounded = (
+        f"({whole} + ({position} - {whole} > 0.5 "
+        f"OR ({position} - {whole} = 0.5 AND {whole} % 2 = 1)))"
+    )
+    return f"MIN(count, MAX(1, {rounded}))"
+
+
+def _blob(content: str) -> Tuple[str, str]:
+    return hashlib.sha256(content.encode()).hexdigest(), content
+
+
+class CellFilters:
+    """The WHERE clause of a cell query, from the filters that are set."""
+
+    def __init__(
+        self,
+        model_id: Optional[str] = None,
+        test: Optional[str] = None,
+        client: Optional[str] = None,
+        success: Optional[bool] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        run_id: Optional[str] = None,
+    ):
+        clauses = []
+        self.params: list = []
+        for column, value in (
+            ("model_id", model_id),
+            ("test", test),
+            ("client", client),
+            ("run_id", run_id),
+        ):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                self.params.append(value)
+        if success is not None:
+            clauses.append("success = ?")
+            self.params.append(int(success))
+        if since is not None:
+            clauses.append("created_at >= ?")
+            self.params.append(since)
+        if until is not None:
+            clauses.append("created_at < ?")
+            self.params.append(until)
+        self.where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+
+class RunHistory:
+    """
+    Every run and its cells, persisted to SQLite so results outlive the HTTP response.
+    Cells are queued by the runner and written in batches by a background thread, so
+    recording never holds up a run. Response text and pixels go to a content-addressed
+    blob table, which keeps the cell rows small and the indexed queries fast.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = "run_history.sqlite3",
+        batch_size: int = 200,
+        flush_seconds: float = 0.5,
+    ):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._reader: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.runs_recorded = 0
+        self.cells_recorded = 0
+        self.write_errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        for statement in SCHEMA:
+            connection.execute(statement)
+        self._migrate(connection)
+        connection.commit()
+        return connection
+
+    def _migrate(self, connection: sqlite3.Connection):
+        for table, columns in MIGRATIONS.items():
+            existing = {row[1] for row in connection.execute(f"PRAGMA table_info({table})")}
+            for column, definition in columns.items():
+                if column not in existing:
+                    connection.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+        for statement in MIGRATED_INDEXES:
+            connection.execute(statement)
+
+    def _read(self, sql: str, params: list = ()) -> List[tuple]:
+        with self._lock:
+            if self._reader is None:
+                self._reader = self._connect()
+            return self._reader.execute(sql, params).fetchall()
+
+    def _read_dicts(self, sql: str, params: list = ()) -> List[dict]:
+        with self._lock:
+            if self._reader is None:
+                self._reader = self._connect()
+            cursor = self._reader.execute(sql, params)
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def _submit(self, item: tuple):
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._write_loop, name="run-history", daemon=True
+                )
+                self._writer.start()
+        self._queue.put(item)
+
+    def start_run(
+        self,
+        plan: ExecutionPlan,
+        engine: str,
+        confirmer_model: Optional[str],
+        run_id: Optional[str] = None,
+    ) -> str:
+        run_id = run_id or str(uuid.uuid4())
+        self._submit(
+            (
+                "run",
+                (
+                    run_id,
+                    correlation_id.get(),
+                    engine,
+                    confirmer_model,
+                    time.time(),
+                    None,
+                    "running",
+                    len(plan.cells),
+                    len(plan.skipped),
+                    0,
+                    0,
+                    len(plan.reused),
+                    plan.resumed_from,
+                    0,
+                ),
+            )
+        )
+        return run_id
+
+    def record_cell(
+        self,
+        run_id: str,
+        cell: PlannedCell,
+        response: StandardResponse,
+        fingerprint: Optional[str] = None,
+    ):
+        self._submit(("cell", (run_id, cell, response, fingerprint, time.time())))
+
+    def finish_run(self, run_id: str):
+        """
+        The run is completed, timed_out if any of its cells timed out, or incomplete if it
+        stopped before every cell finished.
+        """
+        self._submit(("finish", (time.time(), run_id)))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Waits until everything queued so far is written."""
+        if not self.enabled or self._writer is None:
+            return True
+        done = threading.Event()
+        self._queue.put(("flush", done))
+        return done.wait(timeout)
+
+    def _write_loop(self):
+        connection = self._connect()
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_seconds
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(
+                        self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                    )
+                except queue.Empty:
+                    break
+            try:
+                self._write(connection, batch)
+            except sqlite3.Error as e:
+                self.write_errors += 1
+                print(f"Run history write failed: {e}")
+            for kind, item in batch:
+                if kind == "flush":
+                    item.set()
+
+    def _write(self, connection: sqlite3.Connection, batch: List[tuple]):
+        with connection:
+            for kind, item in batch:
+                if kind == "run":
+                    connection.execute(
+                        "INSERT OR REPLACE INTO runs VALUES "
+                        "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        item,
+                    )
+                    self.runs_recorded += 1
+                elif kind == "cell":
+                    run_id, cell, response, fingerprint, created_at = item
+                    response_blob = _blob(response.response)
+                    pixel_blob = _blob(json.dumps(response.pixel))
+                    connection.executemany(
+                        "INSERT OR IGNORE INTO blobs VALUES (?, ?)",
+                        [response_blob, pixel_blob],
+                    )
+                    connection.execute(
+                        INSERT_CELL,
+                        (
+                            run_id,
+                            created_at,
+                            cell.model.id,
+                            cell.model.name,
+                            cell.test,
+                            cell.model.client,
+                            int(response.success),
+                            int(response.timed_out),
+                            int(response.circuit_open),
+                            sum(timing.seconds for timing in response.timings),
+                            response.retries,
+                            response.hedges,
+                            response.confirmation_response,
+                            int(response.confirmation_cached),
+                            json.dumps([timing.model_dump() for timing in response.timings]),
+                            fingerprint,
+                            response_blob[0],
+                            pixel_blob[0],
+                        ),
+                    )
+                    # A cell confirmed offline can arrive after its run finished
+                    connection.execute(
+                        "UPDATE runs SET passed = passed + ?, failed = failed + ?, "
+                        "timed_out = timed_out + ?, status = CASE "
+                        "WHEN finished_at IS NULL THEN status "
+                        f"WHEN passed + failed + 1 >= total THEN {FINISHED_STATUS} "
+                        "ELSE 'incomplete' END WHERE run_id = ?",
+                        (
+                            int(response.success),
+                            int(not response.success),
+                            int(response.timed_out),
+                            run_id,
+                        ),
+                    )
+                    self.cells_recorded += 1
+                elif kind == "finish":
+                    connection.execute(
+                        "UPDATE runs SET finished_at = ?, status = CASE "
+                        f"WHEN passed + failed >= total THEN {FINISHED_STATUS} "
+                        "ELSE 'incomplete' END WHERE run_id = ?",
+                        item,
+                    )
+
+    def runs(self, limit: int = 50, before: Optional[float] = None) -> List[dict]:
+        """The newest runs, started before `before` when it's set."""
+        where, params = ("WHERE started_at < ?", [before]) if before else ("", [])
+        return self._read_dicts(
+            f"SELECT * FROM runs {where} ORDER BY started_at DESC LIMIT ?",
+            [*params, limit],
+        )
+
+    def run(self, run_id: str) -> Optional[dict]:
+        runs = self._read_dicts("SELECT * FROM runs WHERE run_id = ?", [run_id])
+        return runs[0] if runs else None
+
+    def cells(
+        self,
+        filters: CellFilters,
+        limit: int = 100,
+        include_blobs: bool = False,
+    ) -> List[dict]:
+        """
+        The newest matching cells, page back by setting the filters' until to the last
+        cell's created_at. Response text and pixels are only joined in with include_blobs.
+        """
+        columns = ", ".join(f"cells.{column}" for column in ["id", *CELL_COLUMNS])
+        joins = ""
+        if include_blobs:
+            columns += ", responses.content AS response, pixels.content AS pixel"
+            joins = (
+                "JOIN blobs AS responses ON responses.hash = cells.response_hash "
+                "JOIN blobs AS pixels ON pixels.hash = cells.pixel_hash"
+            )
+        cells = self._read_dicts(
+            f"SELECT {columns} FROM cells {joins} {filters.where} "
+            "ORDER BY cells.created_at DESC LIMIT ?",
+            [*filters.params, limit],
+        )
+        for cell in cells:
+            for flag in ("success", "timed_out", "circuit_open", "confirmation_cached"):
+                cell[flag] = bool(cell[flag])
+            cell["timings"] = json.loads(cell["timings"])
+            if include_blobs:
+                cell["pixel"] = json.loads(cell["pixel"])
+        return cells
+
+    def latest_results(
+        self, fingerprints: List[str], since: float
+    ) -> Dict[str, StandardResponse]:
+        """The newest response recorded since `since` for each fingerprint that has one."""
+        results = {}
+        columns = ", ".join(f"cells.{column}" for column in CELL_COLUMNS)
+        for start in range(0, len(fingerprints), 500):
+            chunk = fingerprints[start : start + 500]
+            # SQLite takes the bare columns from the row MAX() picked
+            for row in self._read_dicts(
+                f"""
+                SELECT {columns}, responses.content AS response, pixels.content AS pixel,
+                       MAX(cells.created_at)
+                FROM cells
+                JOIN blobs AS responses ON responses.hash = cells.response_hash
+                JOIN blobs AS pixels ON pixels.hash = cells.pixel_hash
+                WHERE cells.fingerprint IN ({", ".join("?" * len(chunk))})
+                  AND cells.created_at >= ?
+                GROUP BY cells.fingerprint
+                """,
+                [*chunk, since],
+            ):
+                results[row["fingerprint"]] = StandardResponse(
+                    model_name=row["model_name"],
+                    model_id=row["model_id"],
+                    client=row["client"],
+                    response=row["response"],
+                    success=bool(row["success"]),
+                    pixel=json.loads(row["pixel"]),
+                    confirmation_response=row["confirmation_response"],
+                    confirmation_cached=bool(row["confirmation_cached"]),
+                    timings=json.loads(row["timings"]),
+                    retries=row["retries"],
+                    hedges=row["hedges"],
+                    timed_out=bool(row["timed_out"]),
+                    circuit_open=bool(row["circuit_open"]),
+                )
+        return results
+
+    def pass_rates(self, filters: CellFilters, bucket: TrendBucket = "day") -> List[dict]:
+        """Passed / total per model and time bucket, oldest bucket first."""
+        seconds = BUCKET_SECONDS[bucket]
+        rows = self._read_dicts(
+            f"""
+            SELECT model_id, CAST(created_at / {seconds} AS INTEGER) * {seconds} AS bucket,
+                   COUNT(*) AS total, SUM(success) AS passed
+            FROM cells {filters.where}
+            GROUP BY model_id, bucket
+            ORDER BY bucket, model_id
+            """,
+            filters.params,
+        )
+        return [{**row, "pass_rate": row["passed"] / row["total"]} for row in rows]
+
+    def latency_percentiles(
+        self,
+        filters: CellFilters,
+        bucket: TrendBucket = "day",
+        percentiles: Tuple[float, ...] = (50, 95, 99),
+    ) -> List[dict]:
+        """
+        Nearest-rank percentiles of the cells' total seconds per model and time bucket.
+        SQLite ranks the cells within each bucket, so only one row per bucket is read.
+        """
+        seconds = BUCKET_SECONDS[bucket]
+        columns = ", ".join(
+            f"MAX(CASE WHEN rank = {_nearest_rank(pct)} THEN total_seconds END) "
+            f'AS "p{pct:g}"'
+            for pct in percentiles
+        )
+        return self._read_dicts(
+            f"""
+            SELECT model_id, bucket, count, {columns}
+            FROM (
+                SELECT model_id, bucket, total_seconds,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY model_id, bucket ORDER BY total_seconds
+                       ) AS rank,
+                       COUNT(*) OVER (PARTITION BY model_id, bucket) AS count
+                FROM (
+                    SELECT model_id, total_seconds,
+                           CAST(created_at / {seconds} AS INTEGER) * {seconds} AS bucket
+                    FROM cells {filters.where}
+                )
+            )
+            GROUP BY model_id, bucket
+            ORDER BY bucket, model_id
+            """,
+            filters.params,
+        )
+
+    def stats(self) -> dict:
+        return {
+            "path": self.path,
+            "enabled": self.enabled,
+            "queued": self._queue.qsize(),
+            "runs_recorded": self.runs_recorded,
+            "cells_recorded": self.cells_recorded,
+            "write_errors": self.write_errors,
+        }
+
+
+run_history = RunHistory(path=os.getenv("RUN_HISTORY_PATH", "run_history.sqlite3"))
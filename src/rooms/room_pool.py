@@ -0,0 +1,315 @@
+import atexit
+import threading
+import time
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+from ai_server import ServerClient
+from src.utils.constants import CREATE_ROOM_PIXEL, DELETE_ROOM_PIXEL
+from src.utils.deadline import Deadline, timeouts
+
+
+class RoomPool:
+    """
+    Pool of SEMOSS rooms for a single client.
+
+    Rooms are created ahead of time in bulk (several CreateRoom pixels in one runPixel call) on
+    a background thread and handed out to testers. A room that never had a pixel run in it is
+    recycled as-is. Rooms with history can't be shared safely, so they're retired and deleted
+    in batches on a background thread. A sweep every SWEEP_INTERVAL_SECONDS deletes partial
+    batches and idle rooms past their TTL. Everything left over is deleted on shutdown.
+    """
+
+    def __init__(
+        self,
+        client: ServerClient,
+        batch_size: int = 10,
+        max_idle: int = 50,
+        idle_ttl_seconds: float = 900,
+    ):
+        self.client = client
+        self.batch_size = batch_size
+        self.max_idle = max_idle
+        self.idle_ttl_seconds = idle_ttl_seconds
+
+        self._idle: Deque[Tuple[float, str]] = deque()
+        self._retired: List[str] = []
+        self._in_use = 0
+        self._lock = threading.Lock()
+        self._room_available = threading.Condition(self._lock)
+        self._pending = 0
+        self._filling = False
+        self._deleting = False
+        # Set once the pool's client is evicted, the sweeps then delete all of its rooms
+        self.closed = False
+
+        self.created = 0
+        self.deleted = 0
+        self.recycled = 0
+        self.acquired = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def prewarm(self, count: int):
+        """Creates rooms in the background until `count` rooms are idle or being created."""
+        with self._lock:
+            if self.closed:
+                return
+            available = len(self._idle) + self._pending
+            self._pending += max(0, min(count, self.max_idle) - available)
+            if self._pending == 0 or self._filling:
+                return
+            self._filling = True
+        threading.Thread(target=self._fill, name="room-pool-prewarm", daemon=True).start()
+
+    def _fill(self):
+        while True:
+            with self._lock:
+                count = min(self._pending, self.batch_size)
+                if count <= 0:
+                    self._filling = False
+                    return
+            try:
+                rooms = self._create_rooms(count, timeouts.pixel_seconds)
+            except Exception as e:
+                print(f"Failed to prewarm rooms: {e}")
+                with self._lock:
+                    self._pending = 0
+                    self._filling = False
+                    self._room_available.notify_all()
+                return
+
+            now = time.monotonic()
+            with self._lock:
+                self._pending = max(0, self._pending - count)
+                self._idle.extend((now, room_id) for room_id in rooms)
+                self._room_available.notify_all()
+
+    def _create_rooms(self, count: int, timeout: Optional[float]) -> List[str]:
+        if count == 1:
+            room_id = self.client.run_pixel(CREATE_ROOM_PIXEL, timeout=timeout).get(
+                "roomId", None
+            )
+            rooms = [room_id] if room_id else []
+        else:
+            response = self.client.run_pixel(
+                CREATE_ROOM_PIXEL * count, full_response=True, timeout=timeout
+            )
+            rooms = []
+            for pixel_return in response.get("pixelReturn", []):
+                output = pixel_return.get("output")
+                if isinstance(output, dict) and output.get("roomId"):
+                    rooms.append(output["roomId"])
+
+        if not rooms:
+            raise ValueError("Failed to create room")
+        with self._lock:
+            self.created += len(rooms)
+        return rooms
+
+    def acquire(self, deadline: Optional[Deadline] = None) -> str:
+        """
+        Hands out an idle room, or creates one. Waiting for the prewarm thread and creating
+        the room are both limited by what's left of the caller's deadline.
+        """
+        deadline = deadline or Deadline()
+        start = time.monotonic()
+        room_id = None
+        with self._lock:
+            self._retire_expired()
+            # Wait for a room the prewarm thread is already creating rather than
+            # creating a second one alongside it.
+            while not self._idle and self._pending > 0:
+                if not self._room_available.wait(timeout=deadline.cap(30)):
+                    break
+            if self._idle:
+                _, room_id = self._idle.popleft()
+            self._in_use += 1
+
+        if room_id is None:
+            try:
+                room_id = self._create_rooms(
+                    1, deadline.timeout(timeouts.pixel_seconds)
+                )[0]
+            except Exception:
+                with self._lock:
+                    self._in_use -= 1
+                raise
+
+        waited = time.monotonic() - start
+        with self._lock:
+            self.acquired += 1
+            self.total_wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        return room_id
+
+    def release(self, room_id: str, reusable: bool = False):
+        """
+        Returns a room to the pool. Only rooms that never had a pixel run in them should be
+        marked reusable, every other room is retired and deleted with the next batch.
+        """
+        with self._lock:
+            self._in_use -= 1
+            if reusable and not self.closed and len(self._idle) < self.max_idle:
+                self._idle.append((time.monotonic(), room_id))
+                self.recycled += 1
+                self._room_available.notify()
+            else:
+                self._retired.append(room_id)
+            if len(self._retired) < self.batch_size or self._deleting:
+                return
+            self._deleting = True
+        threading.Thread(
+            target=self._drain,
+            args=(self.batch_size,),
+            name="room-pool-cleanup",
+            daemon=True,
+        ).start()
+
+    def _drain(self, min_rooms: int):
+        """Deletes retired rooms while at least min_rooms are waiting."""
+        while True:
+            with self._lock:
+                if not self._retired or len(self._retired) < min_rooms:
+                    self._deleting = False
+                    return
+                to_delete, self._retired = self._retired, []
+            self._delete_rooms(to_delete)
+
+    def sweep(self):
+        """
+        Deletes the retired rooms however few there are, along with the idle rooms past
+        their TTL, or every idle room once the pool is closed.
+        """
+        with self._lock:
+            if self.closed:
+                self._retired.extend(room_id for _, room_id in self._idle)
+                self._idle.clear()
+            else:
+                self._retire_expired()
+            if not self._retired or self._deleting:
+                return
+            self._deleting = True
+        self._drain(1)
+
+    def retire(self):
+        """
+        Closes the pool without waiting on SEMOSS. The sweeps delete its idle rooms, and
+        the rooms in use once they're released.
+        """
+        with self._lock:
+            self.closed = True
+            self._pending = 0
+
+    @property
+    def finished(self) -> bool:
+        """Closed, with every room it handed out released and deleted."""
+        with self._lock:
+            return (
+                self.closed
+                and not self._in_use
+                and not self._idle
+                and not self._retired
+                and not self._deleting
+            )
+
+    def _retire_expired(self):
+        now = time.monotonic()
+        while self._idle and now - self._idle[0][0] > self.idle_ttl_seconds:
+            _, room_id = self._idle.popleft()
+            self._retired.append(room_id)
+
+    def _delete_rooms(self, room_ids: List[str]):
+        for start in range(0, len(room_ids), self.batch_size):
+            batch = room_ids[start : start + self.batch_size]
+            pixel = "".join(DELETE_ROOM_PIXEL.format(room_id=room_id) for room_id in batch)
+            try:
+                self.client.run_pixel(pixel, timeout=timeouts.pixel_seconds)
+                with self._lock:
+                    self.deleted += len(batch)
+            except Exception as e:
+                print(f"Failed to delete rooms {batch}: {e}")
+
+    def close(self):
+        """Deletes every idle and retired room."""
+        with self._lock:
+            self._pending = 0
+            to_delete = self._retired + [room_id for _, room_id in self._idle]
+            self._retired = []
+            self._idle.clear()
+        if to_delete:
+            self._delete_rooms(to_delete)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+                "pending": self._pending,
+                "retired": len(self._retired),
+                "created": self.created,
+                "deleted": self.deleted,
+                "recycled": self.recycled,
+                "acquired": self.acquired,
+                "avg_wait_seconds": (
+                    self.total_wait_seconds / self.acquired if self.acquired else 0.0
+                ),
+                "max_wait_seconds": self.max_wait_seconds,
+            }
+
+
+SWEEP_INTERVAL_SECONDS = 60
+
+_room_pools: List[RoomPool] = []
+_room_pools_lock = threading.Lock()
+_sweeper: Optional[threading.Thread] = None
+
+
+def get_room_pool(client: ServerClient) -> RoomPool:
+    """The client's pool, kept on the client so a pool never outlives it or changes hands."""
+    global _sweeper
+    with _room_pools_lock:
+        pool = getattr(client, "room_pool", None)
+        if pool is None:
+            pool = RoomPool(client)
+            client.room_pool = pool
+            _room_pools.append(pool)
+        if _sweeper is None:
+            _sweeper = threading.Thread(
+                target=_sweep_room_pools, name="room-pool-sweeper", daemon=True
+            )
+            _sweeper.start()
+        return pool
+
+
+def retire_room_pool(client: ServerClient):
+    """Closes the pool of a client evicted from the client pool."""
+    pool = getattr(client, "room_pool", None)
+    if pool is not None:
+        pool.retire()
+
+
+def _sweep_room_pools():
+    while True:
+        time.sleep(SWEEP_INTERVAL_SECONDS)
+        with _room_pools_lock:
+            pools = list(_room_pools)
+        for pool in pools:
+            pool.sweep()
+        with _room_pools_lock:
+            _room_pools[:] = [pool for pool in _room_pools if not pool.finished]
+
+
+def room_pool_stats() -> List[dict]:
+    with _room_pools_lock:
+        pools = list(_room_pools)
+    return [{"url": pool.client.main_url, **pool.stats()} for pool in pools]
+
+
+def close_room_pools():
+    with _room_pools_lock:
+        pools = list(_room_pools)
+    for pool in pools:
+        pool.close()
+
+
+atexit.register(close_room_pools)
@@ -0,0 +1,146 @@
+import os
+import threading
+import time
+from typing import Dict, List, Literal, Optional
+from pydantic import BaseModel, Field
+from src.utils.models import Model
+
+CircuitState = Literal["closed", "open", "half_open"]
+
+
+class BreakerPolicy(BaseModel):
+    # Consecutive infrastructure failures that open an engine's circuit
+    engine_failures: int = Field(3, ge=1)
+    # Higher than an engine's, so a single dead engine doesn't open its whole provider
+    provider_failures: int = Field(10, ge=1)
+    # How long a circuit stays open before a probe cell is let through
+    cooldown_seconds: float = Field(30.0, ge=0)
+
+
+class Circuit:
+    def __init__(self, threshold: int):
+        self.threshold = threshold
+        self.state: CircuitState = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.last_error: Optional[str] = None
+        self.opened = 0
+        self.rejected = 0
+
+    def available(self, now: float, cooldown_seconds: float) -> bool:
+        """Whether a cell may run, moving an open circuit to half open after its cooldown."""
+        if self.state == "open" and now - self.opened_at >= cooldown_seconds:
+            self.state = "half_open"
+        if self.state == "open":
+            return False
+        return not (self.state == "half_open" and self.probe_in_flight)
+
+    def record(self, failed: bool, error: Optional[str], now: float):
+        self.probe_in_flight = False
+        if not failed:
+            self.state = "closed"
+            self.consecutive_failures = 0
+            return
+        self.consecutive_failures += 1
+        self.last_error = error
+        if self.state == "half_open" or (
+            self.state == "closed" and self.consecutive_failures >= self.threshold
+        ):
+            self.state = "open"
+            self.opened_at = now
+            self.opened += 1
+
+
+class CircuitBreakers:
+    """
+    Circuit breakers keyed by engine ID and by provider (`Model.client`), shared by every
+    run on the server. After enough consecutive infrastructure failures (pixel errors other
+    than rate limits, room errors) a circuit opens and the cells of its engine or provider
+    fail right away instead of each waiting for the same failure. Once the cooldown has
+    passed a single probe cell is let through, which closes the circuit if it succeeds and
+    opens it again if it fails.
+    """
+
+    def __init__(self, policy: BreakerPolicy = BreakerPolicy()):
+        self.policy = policy
+        self._engines: Dict[str, Circuit] = {}
+        self._providers: Dict[str, Circuit] = {}
+        self._lock = threading.Lock()
+
+    def _circuits(self, model: Model) -> List[Circuit]:
+        engine = self._engines.get(model.id)
+        if engine is None:
+            engine = self._engines[model.id] = Circuit(self.policy.engine_failures)
+        provider = self._providers.get(model.client)
+        if provider is None:
+            provider = self._providers[model.client] = Circuit(
+                self.policy.provider_failures
+            )
+        return [engine, provider]
+
+    def allow(self, model: Model) -> Optional[str]:
+        """
+        Returns None if the model's cell may run, taking the probe of any half open circuit,
+        otherwise why it's rejected.
+        """
+        with self._lock:
+            now = time.monotonic()
+            engine, provider = circuits = self._circuits(model)
+            for circuit, key in ((engine, f"engine {model.id}"), (provider, model.client)):
+                if not circuit.available(now, self.policy.cooldown_seconds):
+                    circuit.rejected += 1
+                    retry_in = max(
+                        0.0, circuit.opened_at + self.policy.cooldown_seconds - now
+                    )
+                    return (
+                        f"Circuit open: {key} failed {circuit.consecutive_failures} times "
+                        f"in a row, retrying in {retry_in:.0f}s. "
+                        f"Last error: {circuit.last_error}"
+                    )
+            for circuit in circuits:
+                if circuit.state == "half_open":
+                    circuit.probe_in_flight = True
+            return None
+
+    def record(self, model: Model, error: Optional[BaseException]):
+        """Records the outcome of an allowed cell, error is its infrastructure failure."""
+        with self._lock:
+            now = time.monotonic()
+            message = None if error is None else str(error)[:200]
+            for circuit in self._circuits(model):
+                circuit.record(error is not None, message, now)
+
+    def abandon(self, model: Model):
+        """For an allowed cell that stopped without telling whether the engine works."""
+        with self._lock:
+            for circuit in self._circuits(model):
+                circuit.probe_in_flight = False
+
+    def stats(self) -> Dict[str, Dict[str, dict]]:
+        def circuit_stats(circuits: Dict[str, Circuit]) -> Dict[str, dict]:
+            return {
+                key: {
+                    "state": circuit.state,
+                    "consecutive_failures": circuit.consecutive_failures,
+                    "opened": circuit.opened,
+                    "rejected": circuit.rejected,
+                    "last_error": circuit.last_error,
+                }
+                for key, circuit in circuits.items()
+            }
+
+        with self._lock:
+            return {
+                "engines": circuit_stats(self._engines),
+                "providers": circuit_stats(self._providers),
+            }
+
+
+circuit_breakers = CircuitBreakers(
+    BreakerPolicy(
+        engine_failures=int(os.getenv("CIRCUIT_ENGINE_FAILURES", "3")),
+        provider_failures=int(os.getenv("CIRCUIT_PROVIDER_FAILURES", "10")),
+        cooldown_seconds=float(os.getenv("CIRCUIT_COOLDOWN_SECONDS", "30")),
+    )
+)
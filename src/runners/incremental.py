@@ -0,0 +1,176 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Dict, Literal, Optional, TextIO
+from pydantic import ValidationError
+from src.history.run_history import run_history
+from src.runners.plan import TESTERS, ExecutionPlan, PlannedCell, ReusedCell
+from src.tests.response_models import StandardResponse
+
+# all: run every cell, failed: skip cells with a fresh passing result, changed: skip cells
+# with any fresh result, so only new or changed cells run
+RerunMode = Literal["all", "failed", "changed"]
+
+CHECKPOINT_DIR = os.getenv("CHECKPOINT_DIR", "checkpoints")
+# How old a result can be and still be reused by a rerun
+RERUN_MAX_AGE_SECONDS = float(os.getenv("RERUN_MAX_AGE_SECONDS", "86400"))
+
+
+class InvalidRunIdError(ValueError):
+    pass
+
+
+def checkpoint_run_id(run_id: str) -> str:
+    """
+    The canonical form of a run ID, which names its checkpoint file. Run IDs are UUIDs, so
+    one from a request can't point the checkpoint outside CHECKPOINT_DIR.
+    """
+    try:
+        return str(uuid.UUID(run_id))
+    except (TypeError, ValueError, AttributeError):
+        raise InvalidRunIdError(f"Run ID {run_id!r} is not a UUID")
+
+
+def cell_fingerprint(cell: PlannedCell, confirmer_model: Optional[str]) -> str:
+    """
+    Identifies what a cell's result depends on: the engine, the test's definition (prompt,
+    param_dict, schema...) and the confirmer model. Results with the same fingerprint are
+    interchangeable.
+    """
+    return hashlib.sha256(
+        json.dumps(
+            {
+                "engine_id": cell.model.id,
+                "test": cell.test,
+                "definition": TESTERS[cell.test].definition(),
+                "confirmer_model": confirmer_model,
+            },
+            sort_keys=True,
+            default=str,
+        ).encode()
+    ).hexdigest()
+
+
+class Checkpoint:
+    """
+    A run's finished cells, appended to a JSON lines file as soon as each one finishes so a
+    crashed or cancelled run can be resumed from it. A line cut short by a crash, or that
+    otherwise isn't a recorded cell, is ignored.
+    """
+
+    def __init__(self, run_id: str, directory: str = CHECKPOINT_DIR):
+        self.run_id = checkpoint_run_id(run_id)
+        self.path = os.path.join(directory, f"{self.run_id}.jsonl")
+        self._file: Optional[TextIO] = None
+        self._lock = threading.Lock()
+
+    def append(self, fingerprint: str, cell: PlannedCell, response: StandardResponse):
+        line = json.dumps(
+            {
+                "fingerprint": fingerprint,
+                "model_id": cell.model.id,
+                "test": cell.test,
+                "response": response.model_dump(),
+            }
+        )
+        with self._lock:
+            if self._file is None:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def load(self) -> Dict[str, StandardResponse]:
+        """The recorded responses by fingerprint, empty if there's no checkpoint."""
+        responses = {}
+        if not os.path.exists(self.path):
+            return responses
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    responses[entry["fingerprint"]] = StandardResponse.model_validate(
+                        entry["response"]
+                    )
+                except (json.JSONDecodeError, KeyError, TypeError, ValidationError):
+                    continue
+        return responses
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def remove(self):
+        """Once the run has finished every cell, its history has everything."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def plan_reruns(
+    plan: ExecutionPlan,
+    confirmer_model: Optional[str],
+    rerun: RerunMode = "all",
+    resume_run_id: Optional[str] = None,
+    max_age_seconds: float = RERUN_MAX_AGE_SECONDS,
+) -> ExecutionPlan:
+    """
+    Moves the cells that don't need to run again to plan.reused, with the result they're
+    reusing. Resuming a run reuses the cells its checkpoint recorded (only the passing ones
+    with rerun=failed). rerun=failed and rerun=changed also reuse results from the run
+    history that are younger than max_age_seconds and have the same fingerprint.
+    """
+    if rerun == "all" and not resume_run_id:
+        return plan
+
+    fingerprints = {
+        (cell.model.id, cell.test): cell_fingerprint(cell, confirmer_model)
+        for cell in plan.cells
+    }
+    previous: Dict[str, StandardResponse] = {}
+    sources: Dict[str, str] = {}
+    if rerun != "all":
+        # Cells of a run that just finished may still be queued for the history
+        run_history.flush(timeout=10)
+        for fingerprint, response in run_history.latest_results(
+            list(fingerprints.values()), since=time.time() - max_age_seconds
+        ).items():
+            previous[fingerprint] = response
+            sources[fingerprint] = "history"
+    if resume_run_id:
+        for fingerprint, response in Checkpoint(resume_run_id).load().items():
+            previous[fingerprint] = response
+            sources[fingerprint] = "checkpoint"
+
+    cells, reused = [], []
+    for cell in plan.cells:
+        fingerprint = fingerprints[(cell.model.id, cell.test)]
+        response = previous.get(fingerprint)
+        # Cells that timed out or hit an open circuit never really ran
+        unfinished = response is None or response.timed_out or response.circuit_open
+        if unfinished or (rerun == "failed" and not response.success):
+            cells.append(cell)
+            continue
+        reused.append(
+            ReusedCell(
+                model=cell.model,
+                test=cell.test,
+                fingerprint=fingerprint,
+                source=sources[fingerprint],
+                response=response,
+            )
+        )
+    return plan.model_copy(
+        update={
+            "cells": cells,
+            "reused": [*plan.reused, *reused],
+            "resumed_from": resume_run_id,
+        }
+    )
@@ -0,0 +1,206 @@
+import asyncio
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Literal, Optional
+from pydantic import BaseModel
+from src.confirmations.pipeline import apply_batch_results
+from src.runners.plan import ExecutionPlan
+from src.runners.runners import (
+    TestResults,
+    iter_test_cells_async,
+    record_confirmed_cells,
+)
+from src.tests.response_models import StandardConfirmation
+from src.utils.models import DeploymentKeys
+from src.utils.timings import summarize_result_timings
+from src.utils.tracing import correlation_id
+
+
+JobState = Literal["queued", "running", "completed", "cancelled", "failed"]
+
+
+class JobStatus(BaseModel):
+    job_id: str
+    correlation_id: Optional[str] = None
+    status: JobState
+    created_at: float
+    finished_at: Optional[float] = None
+    completed: int = 0
+    timed_out: int = 0
+    total: int = 0
+    error: Optional[str] = None
+    plan: Optional[ExecutionPlan] = None
+    results: Optional[Dict[str, TestResults]] = None
+    timings: Optional[dict] = None
+
+
+class JobLimitError(Exception):
+    pass
+
+
+class Job:
+    def __init__(self, plan: ExecutionPlan, confirmer_model: Optional[str] = None):
+        self.job_id = str(uuid.uuid4())
+        # The submitting request's, the job's run is traced under it
+        self.correlation_id = correlation_id.get()
+        self.plan = plan
+        self.confirmer_model = confirmer_model
+        self.status: JobState = "queued"
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.completed = 0
+        self.timed_out = 0
+        self.error: Optional[str] = None
+        self.results: Dict[str, TestResults] = {
+            cell.model.name: TestResults() for cell in [*plan.cells, *plan.reused]
+        }
+        self.cancel_event = threading.Event()
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "cancelled", "failed")
+
+    def to_status(self, include_results: bool = True) -> JobStatus:
+        return JobStatus(
+            job_id=self.job_id,
+            correlation_id=self.correlation_id,
+            status=self.status,
+            created_at=self.created_at,
+            finished_at=self.finished_at,
+            completed=self.completed,
+            timed_out=self.timed_out,
+            total=len(self.plan.cells) + len(self.plan.reused),
+            error=self.error,
+            plan=self.plan if include_results else None,
+            results=self.results if include_results else None,
+            timings=self.timing_summary() if include_results else None,
+        )
+
+    def apply_batch_results(self, confirmations: Dict[str, StandardConfirmation]) -> int:
+        """
+        Fills in the cells pending offline confirmation and records them in the run
+        history. Returns how many cells were confirmed.
+        """
+        confirmed = apply_batch_results(self.results, confirmations)
+        record_confirmed_cells(self.job_id, self.plan, self.confirmer_model, confirmed)
+        return len(confirmed)
+
+    def timing_summary(self) -> dict:
+        return summarize_result_timings(self.results)
+
+
+class JobStore:
+    """
+    Runs test plans as background tasks on the server's event loop so clients can submit a
+    run, poll it, fetch the result and cancel it without holding a request open.
+
+    Finished jobs are kept for retention_seconds, and only the newest max_jobs of them, so
+    a long-lived server doesn't accumulate results.
+    """
+
+    def __init__(
+        self,
+        max_jobs: int = 100,
+        max_active_jobs: int = 10,
+        retention_seconds: float = 3600,
+    ):
+        self.max_jobs = max_jobs
+        self.max_active_jobs = max_active_jobs
+        self.retention_seconds = retention_seconds
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+
+    def submit(
+        self,
+        plan: ExecutionPlan,
+        deployment_keys: DeploymentKeys,
+        confirmer_model: Optional[str] = "gpt-4.1-nano",
+        max_concurrency: Optional[int] = 64,
+        deadline_seconds: Optional[float] = None,
+    ) -> Job:
+        self._evict()
+        active = sum(1 for job in self._jobs.values() if not job.finished)
+        if active >= self.max_active_jobs:
+            raise JobLimitError(
+                f"{active} jobs are already in progress, try again once one finishes."
+            )
+
+        job = Job(plan, confirmer_model)
+        self._jobs[job.job_id] = job
+        job.task = asyncio.create_task(
+            self._run(
+                job, deployment_keys, confirmer_model, max_concurrency, deadline_seconds
+            )
+        )
+        return job
+
+    async def _run(
+        self,
+        job: Job,
+        deployment_keys: DeploymentKeys,
+        confirmer_model: Optional[str],
+        max_concurrency: Optional[int],
+        deadline_seconds: Optional[float],
+    ):
+        job.status = "running"
+        try:
+            async for cell, response in iter_test_cells_async(
+                job.plan,
+                deployment_keys,
+                confirmer_model,
+                max_concurrency,
+                job.cancel_event,
+                deadline_seconds,
+                job.job_id,
+            ):
+                setattr(job.results[cell.model.name], cell.test, response)
+                job.completed += 1
+                job.timed_out += int(response.timed_out)
+            job.status = "completed"
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+        except Exception as e:
+            print(f"Job {job.job_id} failed: {e}")
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self._evict()
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """
+        Drops the job's queued cells, in-flight cells stop at their next pixel and their
+        results are discarded.
+        """
+        job = self.get(job_id)
+        if job and not job.finished:
+            job.cancel_event.set()
+            if job.status == "queued":
+                # The task hasn't started yet, so it won't get to record the cancellation
+                job.status = "cancelled"
+                job.finished_at = time.time()
+            if job.task:
+                job.task.cancel()
+        return job
+
+    def list(self) -> list[Job]:
+        self._evict()
+        return list(self._jobs.values())
+
+    def _evict(self):
+        now = time.time()
+        finished = [job for job in self._jobs.values() if job.finished]
+        for job in finished:
+            if now - job.finished_at > self.retention_seconds:
+                del self._jobs[job.job_id]
+        finished = [job for job in self._jobs.values() if job.finished]
+        for job in finished[: max(0, len(finished) - self.max_jobs)]:
+            del self._jobs[job.job_id]
+
+
+job_store = JobStore()
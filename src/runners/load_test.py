@@ -0,0 +1,303 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Literal, Optional, Tuple
+from pydantic import BaseModel, Field
+from src.clients.clients import get_semoss_client
+from src.rooms.room_pool import get_room_pool
+from src.runners.plan import TESTERS, PlannedCell
+from src.utils.deadline import Deadline
+from src.utils.models import DeploymentKeys, Model
+from src.utils.timings import percentile
+
+LoadTestState = Literal["running", "completed", "cancelled", "failed"]
+
+LATENCY_PERCENTILES = (50, 90, 95, 99)
+
+
+class LoadTestConfig(BaseModel):
+    test: str = "standard_text_test"
+    # Requests kept in flight at each step, each step runs closed loop for step_seconds
+    concurrency: List[int] = [1, 2, 4, 8, 16, 32, 64]
+    step_seconds: float = Field(30.0, gt=0)
+    # A step is past the knee once its median latency is this many times the first
+    # step's, or more than knee_error_rate of its requests fail
+    knee_latency_factor: float = Field(1.5, gt=1)
+    knee_error_rate: float = Field(0.05, ge=0, le=1)
+
+
+class LoadStep(BaseModel):
+    concurrency: int
+    seconds: float
+    requests: int
+    errors: int
+    error_rate: float
+    # Successful requests per second
+    throughput: float
+    retries: int
+    # p50, p90, p95, p99 and max seconds of the successful requests
+    latency: Dict[str, float]
+
+
+class EngineLoadResult(BaseModel):
+    model_id: str
+    model_name: str
+    client: str
+    steps: List[LoadStep] = []
+    # The highest concurrency before latency or errors jumped. None with a knee_reason
+    # if the first step was already past it, None without one if no step was
+    knee: Optional[int] = None
+    knee_reason: Optional[str] = None
+
+
+class LoadTestStatus(BaseModel):
+    load_test_id: str
+    status: LoadTestState
+    config: LoadTestConfig
+    created_at: float
+    finished_at: Optional[float] = None
+    # The engine and concurrency running now
+    current: Optional[str] = None
+    steps_completed: int = 0
+    steps_total: int = 0
+    engines: List[EngineLoadResult] = []
+    error: Optional[str] = None
+
+
+class LoadTestLimitError(Exception):
+    pass
+
+
+def run_load_request(
+    cell: PlannedCell,
+    deployment_keys: DeploymentKeys,
+    cancel_event: threading.Event,
+    deadline: Deadline,
+) -> Tuple[float, bool, int]:
+    """
+    Sends one cell's requests and returns (seconds, succeeded, retries). Only the test's
+    pixels are timed: the room comes from the pool and confirmations are skipped, since
+    it's the engine being measured.
+    """
+    tester = TESTERS[cell.test](
+        models=[cell.model], deployment_keys=deployment_keys, deadline=deadline
+    )
+    tester.cancel_event = cancel_event
+    tester.defer_confirmations = True
+    try:
+        start = time.perf_counter()
+        response = tester.test()[0]
+        seconds = time.perf_counter() - start
+        return seconds, response.success, tester.call_counts.retries
+    finally:
+        tester.release_room()
+
+
+def run_load_step(
+    cell: PlannedCell,
+    deployment_keys: DeploymentKeys,
+    concurrency: int,
+    step_seconds: float,
+    executor: ThreadPoolExecutor,
+    cancel_event: threading.Event,
+) -> LoadStep:
+    """
+    Keeps `concurrency` requests in flight for step_seconds, each worker sending its
+    next request as soon as its last one returns. Requests still in flight when the step
+    ends are waited for and counted.
+    """
+    get_room_pool(get_semoss_client(deployment_keys)).prewarm(concurrency)
+    samples: List[Tuple[float, bool, int]] = []
+    lock = threading.Lock()
+    start = time.monotonic()
+    end = start + step_seconds
+
+    def worker():
+        while time.monotonic() < end and not cancel_event.is_set():
+            try:
+                sample = run_load_request(
+                    cell, deployment_keys, cancel_event, Deadline()
+                )
+            except Exception as e:
+                print(f"Load test request to {cell.model.name} failed: {e}")
+                sample = (0.0, False, 0)
+            with lock:
+                samples.append(sample)
+
+    wait([executor.submit(worker) for _ in range(concurrency)])
+    seconds = time.monotonic() - start
+    latencies = [latency for latency, success, _ in samples if success]
+    errors = len(samples) - len(latencies)
+    return LoadStep(
+        concurrency=concurrency,
+        seconds=seconds,
+        requests=len(samples),
+        errors=errors,
+        error_rate=errors / len(samples) if samples else 0.0,
+        throughput=len(latencies) / seconds,
+        retries=sum(retries for _, _, retries in samples),
+        latency={
+            **{f"p{pct}": percentile(latencies, pct) for pct in LATENCY_PERCENTILES},
+            "max": max(latencies, default=0.0),
+        },
+    )
+
+
+def find_knee(result: EngineLoadResult, config: LoadTestConfig):
+    """
+    Sets the engine's knee to the step before the first one whose median latency grew
+    past knee_latency_factor times the first step's, or whose error rate passed
+    knee_error_rate.
+    """
+    result.knee, result.knee_reason = None, None
+    baseline = next(
+        (step.latency["p50"] for step in result.steps if step.latency["p50"]), 0.0
+    )
+    previous: Optional[LoadStep] = None
+    for step in result.steps:
+        if step.error_rate > config.knee_error_rate:
+            reason = (
+                f"{step.error_rate:.0%} of requests failed at concurrency "
+                f"{step.concurrency}"
+            )
+        elif baseline and step.latency["p50"] > config.knee_latency_factor * baseline:
+            reason = (
+                f"median latency rose from {baseline:.2f}s to "
+                f"{step.latency['p50']:.2f}s at concurrency {step.concurrency}"
+            )
+        else:
+            previous = step
+            continue
+        result.knee = previous.concurrency if previous else None
+        result.knee_reason = reason
+        return
+
+
+class LoadTest:
+    def __init__(self, models: List[Model], config: LoadTestConfig):
+        self.load_test_id = str(uuid.uuid4())
+        self.config = config
+        self.status: LoadTestState = "running"
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.current: Optional[str] = None
+        self.steps_completed = 0
+        self.cells = [PlannedCell(model=model, test=config.test) for model in models]
+        self.engines = [
+            EngineLoadResult(
+                model_id=model.id, model_name=model.name, client=model.client
+            )
+            for model in models
+        ]
+        self.error: Optional[str] = None
+        self.cancel_event = threading.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status != "running"
+
+    def run(self, deployment_keys: DeploymentKeys):
+        """
+        Sweeps each engine through the concurrency ladder in turn, so engines sharing a
+        provider don't load each other.
+        """
+        executor = ThreadPoolExecutor(
+            max_workers=max(self.config.concurrency), thread_name_prefix="load-test"
+        )
+        try:
+            for cell, result in zip(self.cells, self.engines):
+                for concurrency in self.config.concurrency:
+                    if self.cancel_event.is_set():
+                        break
+                    self.current = f"{cell.model.name} at concurrency {concurrency}"
+                    step = run_load_step(
+                        cell,
+                        deployment_keys,
+                        concurrency,
+                        self.config.step_seconds,
+                        executor,
+                        self.cancel_event,
+                    )
+                    if self.cancel_event.is_set():
+                        # The step was cut short, its requests were failed by the cancel
+                        break
+                    result.steps.append(step)
+                    find_knee(result, self.config)
+                    self.steps_completed += 1
+            self.status = "cancelled" if self.cancel_event.is_set() else "completed"
+        except Exception as e:
+            print(f"Load test {self.load_test_id} failed: {e}")
+            self.status = "failed"
+            self.error = str(e)
+        finally:
+            executor.shutdown(wait=False)
+            self.current = None
+            self.finished_at = time.time()
+
+    def to_status(self) -> LoadTestStatus:
+        return LoadTestStatus(
+            load_test_id=self.load_test_id,
+            status=self.status,
+            config=self.config,
+            created_at=self.created_at,
+            finished_at=self.finished_at,
+            current=self.current,
+            steps_completed=self.steps_completed,
+            steps_total=len(self.cells) * len(self.config.concurrency),
+            engines=self.engines,
+            error=self.error,
+        )
+
+
+class LoadTestStore:
+    """
+    Runs concurrency sweeps on a background thread, one at a time so two sweeps don't
+    skew each other's measurements. Only the newest max_load_tests are kept.
+    """
+
+    def __init__(self, max_load_tests: int = 20):
+        self.max_load_tests = max_load_tests
+        self._load_tests: "OrderedDict[str, LoadTest]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        models: List[Model],
+        config: LoadTestConfig,
+        deployment_keys: DeploymentKeys,
+    ) -> LoadTest:
+        with self._lock:
+            running = next(
+                (test for test in self._load_tests.values() if not test.finished), None
+            )
+            if running:
+                raise LoadTestLimitError(
+                    f"Load test {running.load_test_id} is still running, "
+                    "try again once it finishes."
+                )
+            load_test = LoadTest(models, config)
+            self._load_tests[load_test.load_test_id] = load_test
+            while len(self._load_tests) > self.max_load_tests:
+                self._load_tests.popitem(last=False)
+        threading.Thread(
+            target=load_test.run, args=(deployment_keys,), name="load-test", daemon=True
+        ).start()
+        return load_test
+
+    def get(self, load_test_id: str) -> Optional[LoadTest]:
+        return self._load_tests.get(load_test_id)
+
+    def cancel(self, load_test_id: str) -> Optional[LoadTest]:
+        """Stops the sweep after the requests in flight, keeping the finished steps."""
+        load_test = self.get(load_test_id)
+        if load_test:
+            load_test.cancel_event.set()
+        return load_test
+
+    def list(self) -> List[LoadTest]:
+        return list(self._load_tests.values())
+
+
+load_test_store = LoadTestStore()
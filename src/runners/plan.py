@@ -0,0 +1,79 @@
+from typing import Dict, List, Literal, Optional, Type
+from pydantic import BaseModel
+from src.utils.models import Model
+from src.tests.abstract_tests import AbstractTests
+from src.tests.response_models import StandardResponse
+from src.tests.standard_text_test import StandardTextTest
+from src.tests.basic_param_values_test import BasicParamValuesTest
+from src.tests.image_urls_test import ImageURLsTest
+from src.tests.tool_calling_with_tool_choice_test import ToolCallingWithToolChoiceTest
+from src.tests.structured_json_test import StructuredJSONTest
+
+
+# Maps a TestSelections / TestResults field to the tester class that runs it.
+# Tests missing from this mapping are not runnable yet (ie. base64 images).
+TESTERS: Dict[str, Type[AbstractTests]] = {
+    "standard_text_test": StandardTextTest,
+    "basic_param_values": BasicParamValuesTest,
+    "prompt_with_image_urls": ImageURLsTest,
+    "tool_calling_with_tool_choice": ToolCallingWithToolChoiceTest,
+    "structured_json_test": StructuredJSONTest,
+}
+
+
+class PlannedCell(BaseModel):
+    model: Model
+    test: str
+
+
+class SkippedCell(PlannedCell):
+    reason: str
+
+
+class ReusedCell(PlannedCell):
+    fingerprint: str
+    # The run history, or the checkpoint of the run being resumed
+    source: Literal["history", "checkpoint"]
+    response: StandardResponse
+
+
+class ExecutionPlan(BaseModel):
+    cells: List[PlannedCell] = []
+    skipped: List[SkippedCell] = []
+    # Cells that won't run again because an earlier result still holds
+    reused: List[ReusedCell] = []
+    resumed_from: Optional[str] = None
+
+    def cells_by_model(self) -> Dict[str, List[PlannedCell]]:
+        grouped: Dict[str, List[PlannedCell]] = {}
+        for cell in self.cells:
+            grouped.setdefault(cell.model.id, []).append(cell)
+        return grouped
+
+
+def build_execution_plan(models: list[Model], selections: BaseModel) -> ExecutionPlan:
+    """
+    Crosses the selected models with the selected tests and returns the cells that will
+    actually run, along with the ones skipped because the model or test doesn't support it.
+    """
+    selected_tests = [
+        field for field, selected in selections.model_dump().items() if selected
+    ]
+
+    plan = ExecutionPlan()
+    for model in models:
+        for test in selected_tests:
+            if test not in TESTERS:
+                plan.skipped.append(
+                    SkippedCell(model=model, test=test, reason="Test is not available")
+                )
+            elif not getattr(model.capabilities, test, False):
+                plan.skipped.append(
+                    SkippedCell(
+                        model=model, test=test, reason="Model does not support this test"
+                    )
+                )
+            else:
+                plan.cells.append(PlannedCell(model=model, test=test))
+
+    return plan
@@ -1,17 +1,51 @@
-from typing import Dict, Optional, Tuple
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import asyncio
+import os
+import threading
+import time
+import requests
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pydantic import BaseModel
 from src.utils.models import Model, models
 from src.tests.response_models import StandardResponse
-from src.tests.standard_text_test import StandardTextTest
-from src.tests.basic_param_values_test import BasicParamValuesTest
-from src.tests.image_urls_test import ImageURLsTest
-from src.tests.tool_calling_with_tool_choice_test import ToolCallingWithToolChoiceTest
-from src.tests.structured_json_test import StructuredJSONTest
-from src.tests.image_base64_test import ImageBase64Test
+from src.clients.clients import get_semoss_client
+from src.rooms.room_pool import get_room_pool
+from src.runners.plan import (
+    TESTERS,
+    ExecutionPlan,
+    PlannedCell,
+    build_execution_plan,
+)
+from src.history.run_history import run_history
+from src.runners.circuit_breaker import circuit_breakers
+from src.runners.incremental import (
+    Checkpoint,
+    RerunMode,
+    cell_fingerprint,
+    plan_reruns,
+)
+from src.runners.scheduler import CellQueue, provider_scheduler
+from src.tests.abstract_tests import RunCancelledError
+from src.confirmations.reference_data import reference_data
+from src.confirmations.pipeline import (
+    PendingConfirmation,
+    apply_confirmation,
+    confirmation_stage,
+    pending_offline,
+)
 from src.utils.models import DeploymentKeys
+from src.utils.constants import REFERENCE_TICKER
+from src.utils.deadline import Deadline, DeadlineExceeded, timeouts
+from src.utils.metrics import cell_seconds, cell_workers, cells_in_flight, cells_total
+from src.utils.tracing import Span, tracer
 
 
+CELL_WORKERS = int(os.getenv("CELL_WORKERS", "64"))
+_cell_executor: Optional[ThreadPoolExecutor] = None
+_cell_executor_lock = threading.Lock()
+# Upper bound on how long a dispatch loop sleeps before re-checking provider capacity
+SCHEDULER_POLL_SECONDS = 0.25
+
 available_tests = [
     "Standard Text Test",
     "Basic Param Values Test",
@@ -52,125 +86,565 @@ class TestResults(BaseModel):
     prompt_with_base64_images: Optional[StandardResponse] = None
 
 
-def run_tests_for_single_model(
-    model: Model,
-    selections: TestSelections,
+def run_test_cell(
+    cell: PlannedCell,
     deployment_keys: DeploymentKeys,
     confirmer_model: Optional[str],
-) -> Tuple[str, TestResults]:
+    cancel_event: Optional[threading.Event] = None,
+) -> StandardResponse:
     """
-    Runs the selected tests for a SINGLE model.
-    Returns a tuple of (model_name, test_results).
+    Creates the tester for a single model x test cell and runs it, confirmation included.
     """
-    results = TestResults()
+    response, pending = generate_test_cell(
+        cell, deployment_keys, confirmer_model, cancel_event
+    )
+    if pending:
+        return apply_confirmation(response, pending.run(), pending)
+    return response
 
-    # --- 1. Initialize Testers based on Capabilities ---
 
-    standard_text_tester = None
-    if model.capabilities.standard_text_test:
-        standard_text_tester = StandardTextTest(
-            models=[model],
-            deployment_keys=deployment_keys,
-            confirmer_model=confirmer_model,
-        )
+def generate_test_cell(
+    cell: PlannedCell,
+    deployment_keys: DeploymentKeys,
+    confirmer_model: Optional[str],
+    cancel_event: Optional[threading.Event] = None,
+    span: Optional[Span] = None,
+    deadline: Optional[Deadline] = None,
+) -> Tuple[StandardResponse, Optional[PendingConfirmation]]:
+    """
+    Creates the tester for a single model x test cell and runs it up to, but not including,
+    the confirmation, which is returned for the confirmation stage to run.
+    Once cancel_event is set the cell stops at its next pixel. The cell's pixels and
+    confirmation are traced under span, and limited by what's left of the run's deadline.
+    Cells of an engine or provider whose circuit is open fail without being run.
+    """
+    if cancel_event and cancel_event.is_set():
+        raise RunCancelledError("Run was cancelled")
+    rejection = circuit_breakers.allow(cell.model)
+    if rejection:
+        return circuit_open_cell_response(cell, rejection), None
+    with tracer.activate(span):
+        try:
+            tester = TESTERS[cell.test](
+                models=[cell.model],
+                deployment_keys=deployment_keys,
+                confirmer_model=confirmer_model,
+                deadline=deadline,
+            )
+        except Exception as e:
+            # The room couldn't be created
+            circuit_breakers.record(cell.model, e)
+            raise
+        tester.cancel_event = cancel_event
+        tester.defer_confirmations = True
+        try:
+            # .test() returns a list, we take the first item [0]
+            response = tester.test()[0]
+            if tester.infrastructure_error:
+                circuit_breakers.record(cell.model, tester.infrastructure_error)
+            elif tester.timed_out or (cancel_event and cancel_event.is_set()):
+                # The run ran out of time or was cancelled, that says nothing about the engine
+                circuit_breakers.abandon(cell.model)
+            else:
+                circuit_breakers.record(cell.model, None)
+            pending = tester.pending_confirmations.get(id(response))
+            response = response.model_copy(
+                update={
+                    "timings": tester.timings,
+                    "retries": tester.call_counts.retries,
+                    "hedges": tester.call_counts.hedges,
+                    "timed_out": tester.timed_out,
+                }
+            )
+            return response, pending
+        except BaseException:
+            circuit_breakers.abandon(cell.model)
+            raise
+        finally:
+            tester.release_room()
+
+
+def failed_cell_response(cell: PlannedCell, exc: BaseException) -> StandardResponse:
+    return StandardResponse(
+        model_name=cell.model.name,
+        model_id=cell.model.id,
+        client=cell.model.client,
+        response=str(exc),
+        success=False,
+        pixel=[],
+        timed_out=isinstance(exc, (requests.Timeout, DeadlineExceeded)),
+    )
+
+
+def run_deadline(deadline_seconds: Optional[float] = None) -> Deadline:
+    return Deadline(
+        deadline_seconds if deadline_seconds is not None else timeouts.run_seconds
+    )
+
+
+def abandon_cells(
+    queue: CellQueue, generating: dict, confirming: dict, cancel_event: threading.Event
+) -> List[PlannedCell]:
+    """
+    Stops waiting on a run's unfinished cells once its deadline expired: queued cells are
+    dropped, in-flight ones stop at their next pixel and their confirmations are cancelled.
+    """
+    cancel_event.set()
+    for future in confirming:
+        future.cancel()
+    cells = [*queue.drain(), *generating.values(), *confirming.values()]
+    generating.clear()
+    confirming.clear()
+    return cells
+
+
+def timed_out_cell_response(cell: PlannedCell, deadline: Deadline) -> StandardResponse:
+    return StandardResponse(
+        model_name=cell.model.name,
+        model_id=cell.model.id,
+        client=cell.model.client,
+        response=f"Timed out: the run's {deadline.seconds:g}s deadline expired "
+        "before the cell finished",
+        success=False,
+        pixel=[],
+        timed_out=True,
+    )
+
+
+def circuit_open_cell_response(cell: PlannedCell, rejection: str) -> StandardResponse:
+    return StandardResponse(
+        model_name=cell.model.name,
+        model_id=cell.model.id,
+        client=cell.model.client,
+        response=rejection,
+        success=False,
+        pixel=[],
+        circuit_open=True,
+    )
+
+
+def release_cell(engine: str, provider: str, dispatched_at: float):
+    """Called once a cell's generation is done, whether or not it succeeded."""
+    provider_scheduler.release(provider, dispatched_at)
+    cells_in_flight.dec(engine)
+
+
+def record_cell(cell: PlannedCell, response: StandardResponse):
+    labels = (cell.model.name, cell.test, cell.model.client)
+    cells_total.inc(*labels, "passed" if response.success else "failed")
+    cell_seconds.observe(sum(timing.seconds for timing in response.timings), *labels)
+
+
+def prepare_run(plan: ExecutionPlan, deployment_keys: DeploymentKeys):
+    """
+    Starts the run's setup in the background so it overlaps with generation: rooms for
+    every cell, and the reference price if the tool calling test will be confirmed.
+    """
+    if plan.cells:
+        get_room_pool(get_semoss_client(deployment_keys)).prewarm(len(plan.cells))
+    if any(cell.test == "tool_calling_with_tool_choice" for cell in plan.cells):
+        reference_data.prefetch(REFERENCE_TICKER)
 
-    basic_param_values_tester = None
-    if model.capabilities.basic_param_values:
-        basic_param_values_tester = BasicParamValuesTest(
-            models=[model],
-            deployment_keys=deployment_keys,
-            confirmer_model=confirmer_model,
-        )
 
-    image_urls_tester = None
-    if model.capabilities.prompt_with_image_urls:
-        image_urls_tester = ImageURLsTest(
-            models=[model],
-            deployment_keys=deployment_keys,
-            confirmer_model=confirmer_model,
-        )
+class RunSpans:
+    """
+    The run, model and cell spans of one run. A model's span lasts from its first cell
+    starting to its last finishing, a cell's from its dispatch to its confirmed response.
+    Every method is a no-op when tracing is off.
+    """
 
-    tool_calling_tester = None
-    if model.capabilities.tool_calling_with_tool_choice:
-        tool_calling_tester = ToolCallingWithToolChoiceTest(
-            models=[model],
-            deployment_keys=deployment_keys,
-            confirmer_model=confirmer_model,
+    def __init__(self, plan: ExecutionPlan, engine: str):
+        self.root = tracer.start_trace(
+            "run",
+            engine=engine,
+            cells=len(plan.cells),
+            skipped=len(plan.skipped),
         )
-
-    structured_json_tester = None
-    if model.capabilities.structured_json_test:
-        structured_json_tester = StructuredJSONTest(
-            models=[model],
-            deployment_keys=deployment_keys,
-            confirmer_model=confirmer_model,
+        self.models: Dict[str, Span] = {}
+        self.cells: Dict[Tuple[str, str], Span] = {}
+        self.remaining: Dict[str, int] = {}
+        if self.root:
+            for cell in plan.cells:
+                self.remaining[cell.model.id] = self.remaining.get(cell.model.id, 0) + 1
+
+    def start_cell(self, cell: PlannedCell) -> Optional[Span]:
+        if not self.root:
+            return None
+        model_span = self.models.get(cell.model.id)
+        if model_span is None:
+            model_span = tracer.start_span(
+                cell.model.name,
+                self.root,
+                category="model",
+                track=cell.model.name,
+                engine_id=cell.model.id,
+                client=cell.model.client,
+            )
+            self.models[cell.model.id] = model_span
+        span = tracer.start_span(
+            cell.test,
+            model_span,
+            category="cell",
+            track=f"{cell.model.name} / {cell.test}",
+            engine_id=cell.model.id,
+            client=cell.model.client,
         )
+        self.cells[(cell.model.id, cell.test)] = span
+        return span
+
+    def finish_cell(self, cell: PlannedCell, response: StandardResponse):
+        span = self.cells.pop((cell.model.id, cell.test), None)
+        if span is None:
+            return
+        span.set(
+            success=response.success,
+            confirmation_cached=response.confirmation_cached,
+        )
+        span.end()
+        self.remaining[cell.model.id] -= 1
+        if not self.remaining[cell.model.id]:
+            self.models[cell.model.id].end()
+
+    def finish(self) -> Optional[str]:
+        """Ends the spans of cells that never finished and writes the trace."""
+        for span in self.cells.values():
+            span.set(cancelled=True)
+            span.end()
+        for span in self.models.values():
+            span.end()
+        return tracer.finish_trace(self.root)
+
+
+class RunRecord:
+    """
+    Where a run's finished cells are recorded: the metrics, the run history and the run's
+    checkpoint. The checkpoint starts with the cells the run reuses, and is removed once
+    every cell finished. Otherwise it's kept so the run can be resumed.
+    """
 
-    # image_base64_tester = None
-    # if model.capabilities.prompt_with_base64_images:
-    #     image_base64_tester = ImageBase64Test(
-    #         models=[model], confirmer_model=confirmer_model
-    #     )
-
-    # --- 2. Execute Tests based on Selections ---
-
-    if selections.standard_text_test and standard_text_tester:
-        # .test() returns a list, we take the first item [0]
-        results.standard_text_test = standard_text_tester.test()[0]
-
-    if selections.basic_param_values and basic_param_values_tester:
-        results.basic_param_values = basic_param_values_tester.test()[0]
-
-    if selections.prompt_with_image_urls and image_urls_tester:
-        results.prompt_with_image_urls = image_urls_tester.test()[0]
-
-    if selections.tool_calling_with_tool_choice and tool_calling_tester:
-        results.tool_calling_with_tool_choice = tool_calling_tester.test()[0]
+    def __init__(
+        self,
+        plan: ExecutionPlan,
+        engine: str,
+        confirmer_model: Optional[str],
+        run_id: Optional[str] = None,
+    ):
+        self.confirmer_model = confirmer_model
+        self.run_id = run_history.start_run(plan, engine, confirmer_model, run_id)
+        self.checkpoint = Checkpoint(self.run_id)
+        self.remaining = len(plan.cells)
+        for cell in plan.reused:
+            self.checkpoint.append(cell.fingerprint, cell, cell.response)
+        if plan.resumed_from:
+            # This run's checkpoint now carries everything the resumed one had
+            Checkpoint(plan.resumed_from).remove()
+
+    def record(self, cell: PlannedCell, response: StandardResponse):
+        fingerprint = cell_fingerprint(cell, self.confirmer_model)
+        record_cell(cell, response)
+        # Cells pending offline confirmation aren't final yet, they're recorded by
+        # record_confirmed_cells once their batch results are applied
+        if pending_offline(response):
+            return
+        run_history.record_cell(self.run_id, cell, response, fingerprint)
+        # Cells that timed out or hit an open circuit are left for a resume to run
+        if not response.timed_out and not response.circuit_open:
+            self.checkpoint.append(fingerprint, cell, response)
+            self.remaining -= 1
+
+    def finish(self):
+        run_history.finish_run(self.run_id)
+        if self.remaining:
+            self.checkpoint.close()
+        else:
+            self.checkpoint.remove()
+
+
+def record_confirmed_cells(
+    run_id: str,
+    plan: ExecutionPlan,
+    confirmer_model: Optional[str],
+    confirmed: List[Tuple[str, str, StandardResponse]],
+):
+    """
+    Records cells of a finished run whose offline confirmation arrived, given as (model
+    name, test, response), in the run history and the run's checkpoint.
+    """
+    cells = {(cell.model.name, cell.test): cell for cell in plan.cells}
+    checkpoint = Checkpoint(run_id)
+    try:
+        for model_name, test, response in confirmed:
+            cell = cells.get((model_name, test))
+            if cell is None:
+                continue
+            fingerprint = cell_fingerprint(cell, confirmer_model)
+            run_history.record_cell(run_id, cell, response, fingerprint)
+            checkpoint.append(fingerprint, cell, response)
+    finally:
+        checkpoint.close()
+
+
+def get_cell_executor() -> ThreadPoolExecutor:
+    """
+    Process-wide worker pool that runs model x test cells for every threaded run.
+    """
+    global _cell_executor
+    with _cell_executor_lock:
+        if _cell_executor is None:
+            _cell_executor = ThreadPoolExecutor(
+                max_workers=CELL_WORKERS, thread_name_prefix="test-cell"
+            )
+            cell_workers.set("threaded", value=CELL_WORKERS)
+        return _cell_executor
 
-    if selections.structured_json_test and structured_json_tester:
-        results.structured_json_test = structured_json_tester.test()[0]
 
-    # if selections.prompt_with_base64_images and image_base64_tester:
-    #    results.prompt_with_base64_images = image_base64_tester.test()[0]
+def run_selected_tests(
+    models: list[Model],
+    selections: TestSelections,
+    deployment_keys: DeploymentKeys,
+    confirmer_model: Optional[str] = "gpt-4.1-nano",
+    batch_size: Optional[int] = None,
+    deadline_seconds: Optional[float] = None,
+    rerun: RerunMode = "all",
+    resume_run_id: Optional[str] = None,
+) -> Dict[str, TestResults]:
+    """
+    Runs every planned model x test cell on the shared cell worker pool, so a run takes
+    about as long as its slowest cell rather than its slowest model's tests added up.
+    batch_size optionally caps how many cells of this run are in flight at once.
+    Cells unfinished once deadline_seconds (default RUN_DEADLINE_SECONDS) have passed
+    are returned timed out. rerun and resume_run_id reuse earlier results instead of
+    running every cell again, see plan_reruns.
+    """
+    plan = plan_reruns(
+        build_execution_plan(models, selections), confirmer_model, rerun, resume_run_id
+    )
+    spans = RunSpans(plan, "threaded")
+    record = RunRecord(plan, "threaded", confirmer_model)
+    prepare_run(plan, deployment_keys)
+    selected_responses = {model.name: TestResults() for model in models}
+    for cell in plan.reused:
+        setattr(selected_responses[cell.model.name], cell.test, cell.response)
+
+    executor = get_cell_executor()
+    queue = CellQueue(provider_scheduler, plan.cells)
+    in_flight_limit = batch_size or len(plan.cells)
+    deadline = run_deadline(deadline_seconds)
+    cancel_event = threading.Event()
+    generating = {}
+    confirming = {}
+
+    try:
+        while len(queue) or generating or confirming:
+            if deadline.expired:
+                for cell in abandon_cells(queue, generating, confirming, cancel_event):
+                    response = timed_out_cell_response(cell, deadline)
+                    spans.finish_cell(cell, response)
+                    record.record(cell, response)
+                    setattr(selected_responses[cell.model.name], cell.test, response)
+                break
+
+            ready, retry_in = queue.pop_ready(in_flight_limit - len(generating))
+            for cell in ready:
+                future = executor.submit(
+                    generate_test_cell,
+                    cell,
+                    deployment_keys,
+                    confirmer_model,
+                    cancel_event,
+                    spans.start_cell(cell),
+                    deadline,
+                )
+                cells_in_flight.inc("threaded")
+                future.add_done_callback(
+                    lambda _, provider=cell.model.client, at=time.monotonic(): (
+                        release_cell("threaded", provider, at)
+                    )
+                )
+                generating[future] = cell
+
+            poll_seconds = deadline.cap(
+                min(retry_in or SCHEDULER_POLL_SECONDS, SCHEDULER_POLL_SECONDS)
+            )
+            if not generating and not confirming:
+                # Every remaining provider is throttled or busy with other runs
+                time.sleep(poll_seconds)
+                continue
+
+            done, _ = wait(
+                [*generating, *confirming],
+                timeout=poll_seconds,
+                return_when=FIRST_COMPLETED,
+            )
+            for future in done:
+                if future in generating:
+                    cell = generating.pop(future)
+                    try:
+                        response, pending = future.result()
+                    except Exception as exc:
+                        print(f"Model {cell.model.name} generated an exception: {exc}")
+                        response, pending = failed_cell_response(cell, exc), None
+                    if pending:
+                        confirming[confirmation_stage.submit(response, pending)] = cell
+                        continue
+                else:
+                    cell = confirming.pop(future)
+                    response = future.result()
+                spans.finish_cell(cell, response)
+                record.record(cell, response)
+                setattr(selected_responses[cell.model.name], cell.test, response)
+    finally:
+        queue.close()
+        spans.finish()
+        record.finish()
 
-    return model.name, results
+    return selected_responses
 
 
-def run_selected_tests(
+async def run_selected_tests_async(
     models: list[Model],
     selections: TestSelections,
     deployment_keys: DeploymentKeys,
     confirmer_model: Optional[str] = "gpt-4.1-nano",
-    batch_size: Optional[int] = 5,
+    max_concurrency: Optional[int] = 64,
+    deadline_seconds: Optional[float] = None,
+    rerun: RerunMode = "all",
+    resume_run_id: Optional[str] = None,
 ) -> Dict[str, TestResults]:
     """
-    Runs tests in parallel batches using ThreadPoolExecutor.
-    """
-    selected_responses = {}
-
-    with ThreadPoolExecutor(max_workers=batch_size) as executor:
-        future_to_model = {
-            executor.submit(
-                run_tests_for_single_model,
-                model,
-                selections,
-                deployment_keys,
-                confirmer_model,
-            ): model
-            for model in models
-        }
-
-        for future in as_completed(future_to_model):
-            model_obj = future_to_model[future]
-            try:
-                model_name, result = future.result()
-                selected_responses[model_name] = result
-            except Exception as exc:
-                print(f"Model {model_obj.name} generated an exception: {exc}")
-                selected_responses[model_obj.name] = TestResults()
+    Runs every planned model x test cell from the event loop without blocking it.
+    The blocking SEMOSS and OpenAI calls of each cell are offloaded to a thread pool bounded
+    by max_concurrency, so other requests keep being served while a run is in progress.
+    """
+    # Reusing results can wait on the run history, so it's kept off the event loop too
+    plan = await asyncio.to_thread(
+        plan_reruns,
+        build_execution_plan(models, selections),
+        confirmer_model,
+        rerun,
+        resume_run_id,
+    )
+    selected_responses = {model.name: TestResults() for model in models}
+
+    async for cell, response in iter_test_cells_async(
+        plan,
+        deployment_keys,
+        confirmer_model,
+        max_concurrency,
+        deadline_seconds=deadline_seconds,
+    ):
+        setattr(selected_responses[cell.model.name], cell.test, response)
 
     return selected_responses
 
 
+async def iter_test_cells_async(
+    plan: ExecutionPlan,
+    deployment_keys: DeploymentKeys,
+    confirmer_model: Optional[str] = "gpt-4.1-nano",
+    max_concurrency: Optional[int] = 64,
+    cancel_event: Optional[threading.Event] = None,
+    deadline_seconds: Optional[float] = None,
+    run_id: Optional[str] = None,
+) -> AsyncIterator[Tuple[PlannedCell, StandardResponse]]:
+    """
+    Runs the planned cells like run_selected_tests_async and yields each (cell, response)
+    as soon as the cell finishes. Closing the iterator drops the cells still queued and
+    sets cancel_event so the cells in flight stop at their next pixel. Once the deadline
+    expires the unfinished cells are yielded timed out. The plan's reused cells are
+    yielded first. The run is recorded in the run history under run_id, a new one by
+    default.
+    """
+    cancel_event = cancel_event or threading.Event()
+    spans = RunSpans(plan, "async")
+    # Starting the record touches the checkpoint files, and preparing the run can log in
+    # to SEMOSS, so neither runs on the event loop
+    record = await asyncio.to_thread(RunRecord, plan, "async", confirmer_model, run_id)
+    await asyncio.to_thread(prepare_run, plan, deployment_keys)
+
+    queue = CellQueue(provider_scheduler, plan.cells)
+    executor = ThreadPoolExecutor(
+        max_workers=max_concurrency, thread_name_prefix="test-cell"
+    )
+    cell_workers.inc("async", amount=max_concurrency)
+    deadline = run_deadline(deadline_seconds)
+    generating = {}
+    confirming = {}
+
+    try:
+        for cell in plan.reused:
+            yield cell, cell.response
+
+        while len(queue) or generating or confirming:
+            if deadline.expired:
+                for cell in abandon_cells(queue, generating, confirming, cancel_event):
+                    response = timed_out_cell_response(cell, deadline)
+                    spans.finish_cell(cell, response)
+                    record.record(cell, response)
+                    yield cell, response
+                break
+
+            ready, retry_in = queue.pop_ready(max_concurrency - len(generating))
+            for cell in ready:
+                cell_future = executor.submit(
+                    generate_test_cell,
+                    cell,
+                    deployment_keys,
+                    confirmer_model,
+                    cancel_event,
+                    spans.start_cell(cell),
+                    deadline,
+                )
+                cells_in_flight.inc("async")
+                # Free the provider slot when the cell's thread is actually done,
+                # even if this iterator was closed and stopped waiting for it
+                cell_future.add_done_callback(
+                    lambda _, provider=cell.model.client, at=time.monotonic(): (
+                        release_cell("async", provider, at)
+                    )
+                )
+                generating[asyncio.wrap_future(cell_future)] = cell
+
+            poll_seconds = deadline.cap(
+                min(retry_in or SCHEDULER_POLL_SECONDS, SCHEDULER_POLL_SECONDS)
+            )
+            if not generating and not confirming:
+                await asyncio.sleep(poll_seconds)
+                continue
+
+            done, _ = await asyncio.wait(
+                [*generating, *confirming],
+                timeout=poll_seconds,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            for future in done:
+                if future in generating:
+                    cell = generating.pop(future)
+                    try:
+                        response, pending = future.result()
+                    except Exception as exc:
+                        print(f"Model {cell.model.name} generated an exception: {exc}")
+                        response, pending = failed_cell_response(cell, exc), None
+                    if pending:
+                        confirmation = confirmation_stage.submit(response, pending)
+                        confirming[asyncio.wrap_future(confirmation)] = cell
+                        continue
+                else:
+                    cell = confirming.pop(future)
+                    response = future.result()
+                spans.finish_cell(cell, response)
+                record.record(cell, response)
+                yield cell, response
+    finally:
+        cancel_event.set()
+        queue.close()
+        executor.shutdown(wait=False, cancel_futures=True)
+        for future in confirming:
+            future.cancel()
+        cell_workers.dec("async", amount=max_concurrency)
+        spans.finish()
+        record.finish()
+
+
 def get_available_models() -> list[Model]:
     return models
@@ -0,0 +1,223 @@
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Deque, Dict, List, Optional, Tuple
+from pydantic import BaseModel, Field
+
+if TYPE_CHECKING:
+    # The testers report rate limits to the scheduler, so the plan can't be imported at runtime
+    from src.runners.plan import PlannedCell
+
+
+RATE_LIMIT_ERROR = re.compile(
+    r"\b429\b|rate.?limit|too many requests|resource.?exhausted|quota exceeded",
+    re.IGNORECASE,
+)
+
+
+def is_rate_limit_error(error: BaseException | str) -> bool:
+    return bool(RATE_LIMIT_ERROR.search(str(error)))
+
+
+class ProviderLimits(BaseModel):
+    max_concurrency: int = Field(16, gt=0)
+    rate_per_second: float = Field(10.0, gt=0)
+    burst: int = Field(20, gt=0)
+
+
+class ProviderState:
+    def __init__(self, limits: ProviderLimits):
+        self.limits = limits
+        self.tokens = float(limits.burst)
+        self.last_refill = time.monotonic()
+        self.in_flight = 0
+        self.queued = 0
+        self.dispatched = 0
+        self.rate_limited = 0
+        # Time cells spent queued before dispatch, waiting for a slot as well as a token
+        self.queued_seconds = 0.0
+        self.backoff_seconds = 0.0
+        self.backoff_until = 0.0
+        self.rate_limited_at = float("-inf")
+
+    def refill(self, now: float):
+        elapsed = now - self.last_refill
+        self.tokens = min(
+            float(self.limits.burst), self.tokens + elapsed * self.limits.rate_per_second
+        )
+        self.last_refill = now
+
+
+class ProviderScheduler:
+    """
+    Process-wide concurrency caps and token buckets keyed by provider (`Model.client`), so
+    each provider is driven up to its own quota no matter how many runs are in progress.
+    Rate-limit errors put the provider into an exponential backoff that decays as cells
+    finish without the provider being rate limited while they ran.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, ProviderLimits]] = None,
+        default_limits: Optional[ProviderLimits] = None,
+        max_backoff_seconds: float = 60,
+    ):
+        self.limits = limits or {}
+        self.default_limits = default_limits or ProviderLimits()
+        self.max_backoff_seconds = max_backoff_seconds
+        self._providers: Dict[str, ProviderState] = {}
+        self._lock = threading.Lock()
+
+    def _state(self, provider: str) -> ProviderState:
+        state = self._providers.get(provider)
+        if state is None:
+            state = ProviderState(self.limits.get(provider, self.default_limits))
+            self._providers[provider] = state
+        return state
+
+    def try_acquire(self, provider: str) -> Optional[float]:
+        """
+        Takes a slot and a token for the provider. Returns 0 when acquired, otherwise the
+        seconds until a token frees up, or None if the provider is at its concurrency cap.
+        """
+        with self._lock:
+            state = self._state(provider)
+            now = time.monotonic()
+            if state.in_flight >= state.limits.max_concurrency:
+                return None
+            if now < state.backoff_until:
+                return state.backoff_until - now
+            state.refill(now)
+            if state.tokens < 1:
+                return (1 - state.tokens) / state.limits.rate_per_second
+            state.tokens -= 1
+            state.in_flight += 1
+            state.dispatched += 1
+            return 0
+
+    def release(self, provider: str, dispatched_at: float):
+        """
+        Frees the slot of a cell dispatched at dispatched_at (time.monotonic()). The backoff
+        only decays if the provider wasn't rate limited since, so it builds up under
+        sustained rate limits.
+        """
+        with self._lock:
+            state = self._state(provider)
+            state.in_flight -= 1
+            if state.rate_limited_at < dispatched_at:
+                state.backoff_seconds /= 2
+
+    def report_rate_limit(self, provider: str):
+        with self._lock:
+            state = self._state(provider)
+            state.rate_limited += 1
+            state.rate_limited_at = time.monotonic()
+            state.backoff_seconds = min(
+                self.max_backoff_seconds, max(1.0, state.backoff_seconds * 2)
+            )
+            state.backoff_until = time.monotonic() + state.backoff_seconds
+            state.tokens = 0
+
+    def _add_queued(self, provider: str, count: int, queued_seconds: float = 0.0):
+        with self._lock:
+            state = self._state(provider)
+            state.queued += count
+            state.queued_seconds += queued_seconds
+
+    def stats(self) -> Dict[str, dict]:
+        with self._lock:
+            return {
+                provider: {
+                    "max_concurrency": state.limits.max_concurrency,
+                    "rate_per_second": state.limits.rate_per_second,
+                    "in_flight": state.in_flight,
+                    "queued": state.queued,
+                    "dispatched": state.dispatched,
+                    "rate_limited": state.rate_limited,
+                    "queued_seconds": state.queued_seconds,
+                    "backoff_seconds": state.backoff_seconds,
+                }
+                for provider, state in self._providers.items()
+            }
+
+
+class CellQueue:
+    """
+    A run's cells queued per provider. `pop_ready` hands out the cells whose provider has
+    capacity, round-robin across providers so one slow provider doesn't hold up the others.
+    """
+
+    def __init__(self, scheduler: ProviderScheduler, cells: List["PlannedCell"]):
+        self.scheduler = scheduler
+        self._queues: Dict[str, Deque[Tuple[float, "PlannedCell"]]] = {}
+        now = time.monotonic()
+        for cell in cells:
+            self._queues.setdefault(cell.model.client, deque()).append((now, cell))
+        for provider, queue in self._queues.items():
+            scheduler._add_queued(provider, len(queue))
+
+    def __len__(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def pop_ready(self, max_cells: int) -> Tuple[List["PlannedCell"], Optional[float]]:
+        """
+        Returns the cells to dispatch now, and how long to wait before trying again if some
+        are still held back by a rate limit (None when they're only waiting on a free slot).
+        """
+        ready: List["PlannedCell"] = []
+        retry_in: Optional[float] = None
+        progressed = True
+        while progressed and len(ready) < max_cells:
+            progressed = False
+            for provider, queue in self._queues.items():
+                if not queue or len(ready) >= max_cells:
+                    continue
+                wait_seconds = self.scheduler.try_acquire(provider)
+                if wait_seconds == 0:
+                    enqueued_at, cell = queue.popleft()
+                    self.scheduler._add_queued(
+                        provider, -1, time.monotonic() - enqueued_at
+                    )
+                    ready.append(cell)
+                    progressed = True
+                elif wait_seconds is not None:
+                    retry_in = (
+                        wait_seconds if retry_in is None else min(retry_in, wait_seconds)
+                    )
+        return ready, retry_in
+
+    def drain(self) -> List["PlannedCell"]:
+        """Drops every cell still queued and returns them."""
+        cells = []
+        for provider, queue in self._queues.items():
+            self.scheduler._add_queued(provider, -len(queue))
+            cells.extend(cell for _, cell in queue)
+            queue.clear()
+        return cells
+
+    def close(self):
+        """Drops every cell still queued."""
+        self.drain()
+
+
+def load_provider_limits() -> Dict[str, ProviderLimits]:
+    """
+    Reads per-provider limits from the PROVIDER_LIMITS environment variable, a JSON object
+    keyed by `Model.client`, ie. {"Anthropic - Vertex": {"max_concurrency": 2, "rate_per_second": 1}}
+    A "default" entry sets the limits of every provider not listed.
+    """
+    raw = os.getenv("PROVIDER_LIMITS")
+    if not raw:
+        return {}
+    return {
+        provider: ProviderLimits(**limits) for provider, limits in json.loads(raw).items()
+    }
+
+
+_provider_limits = load_provider_limits()
+provider_scheduler = ProviderScheduler(
+    _provider_limits, default_limits=_provider_limits.pop("default", None)
+)
@@ -0,0 +1,109 @@
+import asyncio
+import time
+import uuid
+from typing import AsyncIterator, Optional
+from src.runners.plan import ExecutionPlan
+from src.runners.runners import iter_test_cells_async
+from src.utils.models import DeploymentKeys
+from src.utils.timings import summarize_timings
+
+
+async def stream_run_events(
+    plan: ExecutionPlan,
+    deployment_keys: DeploymentKeys,
+    confirmer_model: Optional[str] = "gpt-4.1-nano",
+    max_concurrency: Optional[int] = 64,
+    progress_interval: float = 2.0,
+    deadline_seconds: Optional[float] = None,
+) -> AsyncIterator[dict]:
+    """
+    Runs the plan and yields events as it goes:
+    - plan: the run's ID, and the cells that will run, reused or skipped, sent first
+    - result: a cell's StandardResponse as soon as the cell finishes, reused cells first
+    - progress: completed / total, after each result and every progress_interval seconds
+    - summary: totals and per-model / per-test phase timings once every cell is done
+
+    Once the run's deadline expires, the unfinished cells are sent as timed out results
+    and the summary follows.
+    """
+    start = time.monotonic()
+    # Resumable with resume_run_id if the run doesn't finish
+    run_id = str(uuid.uuid4())
+    total = len(plan.cells) + len(plan.reused)
+    completed = passed = timed_out = 0
+    finished = []
+
+    def progress() -> dict:
+        return {
+            "event": "progress",
+            "completed": completed,
+            "total": total,
+            "elapsed_seconds": time.monotonic() - start,
+        }
+
+    yield {"event": "plan", "run_id": run_id, "plan": plan.model_dump()}
+
+    cells = iter_test_cells_async(
+        plan,
+        deployment_keys,
+        confirmer_model,
+        max_concurrency,
+        deadline_seconds=deadline_seconds,
+        run_id=run_id,
+    )
+    next_cell = None
+    try:
+        while True:
+            if next_cell is None:
+                next_cell = asyncio.ensure_future(cells.__anext__())
+            done, _ = await asyncio.wait({next_cell}, timeout=progress_interval)
+            if not done:
+                yield progress()
+                continue
+
+            try:
+                cell, response = next_cell.result()
+            except StopAsyncIteration:
+                next_cell = None
+                break
+            next_cell = None
+
+            completed += 1
+            passed += int(response.success)
+            timed_out += int(response.timed_out)
+            finished.append((cell.model.name, cell.test, response))
+            yield {
+                "event": "result",
+                "model_name": cell.model.name,
+                "test": cell.test,
+                "result": response.model_dump(),
+            }
+            yield progress()
+    finally:
+        try:
+            if next_cell is not None:
+                next_cell.cancel()
+                try:
+                    await next_cell
+                except asyncio.CancelledError:
+                    # The cell we just cancelled, unless the stream is being cancelled
+                    if asyncio.current_task().cancelling():
+                        raise
+                except StopAsyncIteration:
+                    pass
+                except Exception as e:
+                    print(f"Failed to stop waiting for the next cell: {e}")
+        finally:
+            await cells.aclose()
+
+    yield {
+        "event": "summary",
+        "total": total,
+        "passed": passed,
+        "failed": completed - passed,
+        "timed_out": timed_out,
+        "reused": len(plan.reused),
+        "skipped": len(plan.skipped),
+        "elapsed_seconds": time.monotonic() - start,
+        "timings": summarize_timings(finished),
+    }
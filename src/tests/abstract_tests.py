@@ -1,47 +1,167 @@
+import re
+import threading
+import requests
 from typing import Optional
-from src.clients.clients import get_openai_client, get_semoss_client
+from src.clients.clients import get_semoss_client
+from src.clients.resilience import CallCounts, pixel_runner
 from src.utils.models import Model
-from src.utils.constants import CREATE_ROOM_PIXEL
+from src.rooms.room_pool import get_room_pool
+from src.runners.scheduler import is_rate_limit_error, provider_scheduler
 from src.pixels.pixel_maker import PixelMaker
-from src.confirmations.openai_confirmations import OpenAIConfirmations
+from src.confirmations.openai_confirmations import (
+    ConfirmationKind,
+    OpenAIConfirmations,
+)
+from src.confirmations.pipeline import PendingConfirmation, apply_confirmation
+from src.tests.response_models import PhaseTiming, StandardResponse
 from src.utils.models import DeploymentKeys
+from src.utils.deadline import Deadline, DeadlineExceeded, timeouts
+from src.utils.metrics import pixel_seconds, pixels_total
+from src.utils.timings import timed
+
+PIXEL_NAME = re.compile(r"\s*([A-Za-z]+)\(")
+
+
+class RunCancelledError(Exception):
+    pass
 
 
 class AbstractTests:
+    # The AskPlayground selections besides the room and engine, ie. prompt and param_dict
+    SELECTIONS: dict = {}
+
+    @classmethod
+    def definition(cls) -> dict:
+        """What the test sends to the model, a change to it invalidates earlier results."""
+        return {"selections": cls.SELECTIONS}
+
     def __init__(
         self,
         models: list[Model],
         deployment_keys: DeploymentKeys,
         confirmer_model: Optional[str] = "gpt-4.1-nano",
+        deadline: Optional[Deadline] = None,
     ):
         self.models = models
         self.openai_confirmer = OpenAIConfirmations(
             deployment_keys=deployment_keys, model=confirmer_model
         )
         self.semoss_client = get_semoss_client(deployment_keys)
-        self.openai_client = get_openai_client(deployment_keys.openai_secret_key)
         self.pixel_maker = PixelMaker()
+        self.room_pool = get_room_pool(self.semoss_client)
+        self.room_used = False
+        # Set by the runner, checked before every pixel so cancelled runs stop early
+        self.cancel_event: Optional[threading.Event] = None
+        # The run's deadline, the room, every pixel and the confirmation are limited by
+        # what's left of it
+        self.deadline = deadline or Deadline()
+        self.timed_out = False
+        # The last pixel error that wasn't a rate limit or the run's deadline running out,
+        # reported to the circuit breakers by the runner
+        self.infrastructure_error: Optional[Exception] = None
+        # When set, confirmations are handed to the runner's confirmation stage instead of
+        # running inline, keyed by id() of the StandardResponse they belong to
+        self.defer_confirmations = False
+        self.pending_confirmations: dict[int, PendingConfirmation] = {}
+        # How long each phase of the test took, attached to the response by the runner
+        self.timings: list[PhaseTiming] = []
+        self.call_counts = CallCounts()
         self.room_id = self.create_room()
 
     def create_room(self) -> str:
-        room_id = self.semoss_client.run_pixel(CREATE_ROOM_PIXEL).get("roomId", None)
-        if not room_id:
-            raise ValueError("Failed to create room")
-        return room_id
+        with timed(self.timings, "room"):
+            return self.room_pool.acquire(self.deadline)
+
+    def release_room(self):
+        """Hands the room back to the pool, it's only recycled if no pixel ran in it."""
+        if self.room_id:
+            self.room_pool.release(self.room_id, reusable=not self.room_used)
+            self.room_id = None
+
+    def run_pixel(self, pixel: str):
+        if self.cancel_event and self.cancel_event.is_set():
+            raise RunCancelledError("Run was cancelled")
+        self.room_used = True
+        match = PIXEL_NAME.match(pixel)
+        pixel_name = match.group(1) if match else None
+        provider = self.models[0].client
+        outcome = "error"
+        try:
+            with timed(
+                self.timings,
+                "run_pixel",
+                pixel_name,
+                engine_id=self.models[0].id,
+                client=provider,
+                payload_bytes=len(pixel),
+            ):
+                output = pixel_runner.run(
+                    lambda: self.semoss_client.run_pixel(
+                        pixel, timeout=self.deadline.timeout(timeouts.pixel_seconds)
+                    ),
+                    pixel,
+                    pixel_name,
+                    self.models[0].id,
+                    provider,
+                    self.call_counts,
+                    self.cancel_event,
+                    self.deadline,
+                    on_error=self._report_rate_limit,
+                )
+            outcome = "ok"
+            return output
+        except Exception as e:
+            if is_rate_limit_error(e):
+                outcome = "rate_limited"
+            elif isinstance(e, (requests.Timeout, DeadlineExceeded)):
+                outcome = "timed_out"
+                self.timed_out = True
+            # A timeout cut short by the run's deadline isn't the engine's fault
+            if not is_rate_limit_error(e) and not self.deadline.expired:
+                self.infrastructure_error = e
+            raise
+        finally:
+            pixels_total.inc(provider, pixel_name or "unknown", outcome)
+            pixel_seconds.observe(
+                self.timings[-1].seconds, provider, pixel_name or "unknown"
+            )
+
+    def _report_rate_limit(self, error: Exception):
+        """Backs the provider off for every rate limited attempt, retried or not."""
+        if is_rate_limit_error(error):
+            for model in self.models:
+                provider_scheduler.report_rate_limit(model.client)
+
+    def confirm(
+        self, standard_response: StandardResponse, kind: ConfirmationKind
+    ) -> StandardResponse:
+        """
+        Confirms the model's response with the confirmer model, or queues the confirmation
+        when it's deferred to the runner's confirmation stage.
+        """
+        pending = PendingConfirmation(
+            self.openai_confirmer, kind, standard_response.response, self.deadline
+        )
+        if self.defer_confirmations:
+            self.pending_confirmations[id(standard_response)] = pending
+            return standard_response
+        return apply_confirmation(standard_response, pending.run(), pending)
 
     def _extract_text_response(self, response: dict) -> str:
-        response_block = response.get("responseMessage", None)
-        if not response_block:
-            raise ValueError("Response message not found")
-        response_message = response_block.get("content", None)
-        if not response_message:
-            raise ValueError("Response content not found")
+        with timed(self.timings, "extraction"):
+            response_block = response.get("responseMessage", None)
+            if not response_block:
+                raise ValueError("Response message not found")
+            response_message = response_block.get("content", None)
+            if not response_message:
+                raise ValueError("Response content not found")
 
-        return response_message
+            return response_message
 
     def _extract_tool_response(self, response: dict) -> str:
-        response_message = response.get("response", None)
-        if not response_message:
-            raise ValueError("Response message not found")
+        with timed(self.timings, "extraction"):
+            response_message = response.get("response", None)
+            if not response_message:
+                raise ValueError("Response message not found")
 
-        return response_message
+            return response_message
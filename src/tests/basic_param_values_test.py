@@ -4,6 +4,7 @@ from src.pixels.pixel_maker import PixelSelections
 from src.tests.response_models import StandardResponse
 from src.tests.abstract_tests import AbstractTests
 from src.utils.models import DeploymentKeys
+from src.utils.deadline import Deadline
 
 
 class BasicParamValuesTest(AbstractTests):
@@ -11,13 +12,19 @@ class BasicParamValuesTest(AbstractTests):
     Basic Param Values Test: Tests the model's response to a prompt with basic parameter values (ie. temperature, max_tokens, top_p).
     """
 
+    SELECTIONS = {
+        "prompt": "Tell me a story about World War 2.",
+        "param_dict": {"temperature": 0.7, "max_tokens": 2000},
+    }
+
     def __init__(
         self,
         models: list[Model],
         deployment_keys: DeploymentKeys,
         confirmer_model: Optional[str] = "gpt-4.1-nano",
+        deadline: Optional[Deadline] = None,
     ):
-        super().__init__(models, deployment_keys, confirmer_model)
+        super().__init__(models, deployment_keys, confirmer_model, deadline)
 
     def test(self) -> list[StandardResponse]:
         responses = []
@@ -25,13 +32,12 @@ class BasicParamValuesTest(AbstractTests):
             selections = PixelSelections(
                 room_id=self.room_id,
                 model_id=model.id,
-                prompt="Tell me a story about World War 2.",
-                param_dict={"temperature": 0.7, "max_tokens": 2000},
+                **self.SELECTIONS,
             )
             pixel = self.pixel_maker.create_ask_playground_pixel(selections)
 
             try:
-                response = self.semoss_client.run_pixel(pixel)
+                response = self.run_pixel(pixel)
                 response = self._extract_text_response(response)
 
                 standard_response_with_confirmation = StandardResponse(
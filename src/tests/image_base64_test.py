@@ -4,6 +4,7 @@ from src.pixels.pixel_maker import PixelSelections
 from src.tests.response_models import StandardResponse
 from src.tests.abstract_tests import AbstractTests
 from src.utils.models import DeploymentKeys
+from src.utils.deadline import Deadline
 
 
 class ImageBase64Test(AbstractTests):
@@ -16,8 +17,9 @@ class ImageBase64Test(AbstractTests):
         models: list[Model],
         deployment_keys: DeploymentKeys,
         confirmer_model: Optional[str] = "gpt-4.1-nano",
+        deadline: Optional[Deadline] = None,
     ):
-        super().__init__(models, deployment_keys, confirmer_model)
+        super().__init__(models, deployment_keys, confirmer_model, deadline)
 
     def prompt_with_base64_images(self) -> list[StandardResponse]:
         import base64
@@ -36,18 +38,19 @@ class ImageBase64Test(AbstractTests):
             )
             pixel = self.pixel_maker.create_ask_playground_pixel(selections)
             try:
-                response = self.semoss_client.run_pixel(pixel)
+                response = self.run_pixel(pixel)
                 response = self._extract_text_response(response)
 
-                confirmation = self.openai_confirmer.confirm_image_response(response)
-                standard_response_with_confirmation = StandardResponse(
-                    model_name=model.name,
-                    model_id=model.id,
-                    client=model.client,
-                    response=response,
-                    pixel=[pixel],
-                    success=confirmation.confirmed,
-                    confirmation_response=confirmation.confirmation_response,
+                standard_response_with_confirmation = self.confirm(
+                    StandardResponse(
+                        model_name=model.name,
+                        model_id=model.id,
+                        client=model.client,
+                        response=response,
+                        pixel=[pixel],
+                        success=True,
+                    ),
+                    "image",
                 )
                 responses.append(standard_response_with_confirmation)
 
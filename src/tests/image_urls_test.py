@@ -4,6 +4,7 @@ from src.pixels.pixel_maker import PixelSelections
 from src.tests.response_models import StandardResponse
 from src.tests.abstract_tests import AbstractTests
 from src.utils.models import DeploymentKeys
+from src.utils.deadline import Deadline
 
 
 class ImageURLsTest(AbstractTests):
@@ -11,13 +12,21 @@ class ImageURLsTest(AbstractTests):
     Image URLs Test: Tests the model's ability to process and respond to prompts that include image URLs.
     """
 
+    SELECTIONS = {
+        "prompt": "Describe the image.",
+        "image_urls": [
+            "https://huggingface.co/datasets/huggingface/documentation-images/resolve/main/transformers/tasks/car.jpg?download=true",
+        ],
+    }
+
     def __init__(
         self,
         models: list[Model],
         deployment_keys: DeploymentKeys,
         confirmer_model: Optional[str] = "gpt-4.1-nano",
+        deadline: Optional[Deadline] = None,
     ):
-        super().__init__(models, deployment_keys, confirmer_model)
+        super().__init__(models, deployment_keys, confirmer_model, deadline)
 
     def test(self) -> list[StandardResponse]:
         responses = []
@@ -25,26 +34,24 @@ class ImageURLsTest(AbstractTests):
             selections = PixelSelections(
                 room_id=self.room_id,
                 model_id=model.id,
-                prompt="Describe the image.",
-                image_urls=[
-                    "https://huggingface.co/datasets/huggingface/documentation-images/resolve/main/transformers/tasks/car.jpg?download=true",
-                ],
+                **self.SELECTIONS,
             )
             pixel = self.pixel_maker.create_ask_playground_pixel(selections)
 
             try:
-                response = self.semoss_client.run_pixel(pixel)
+                response = self.run_pixel(pixel)
                 response = self._extract_text_response(response)
 
-                confirmation = self.openai_confirmer.confirm_image_response(response)
-                standard_response_with_confirmation = StandardResponse(
-                    model_name=model.name,
-                    model_id=model.id,
-                    client=model.client,
-                    response=response,
-                    success=confirmation.confirmed,
-                    pixel=[pixel],
-                    confirmation_response=confirmation.confirmation_response,
+                standard_response_with_confirmation = self.confirm(
+                    StandardResponse(
+                        model_name=model.name,
+                        model_id=model.id,
+                        client=model.client,
+                        response=response,
+                        success=True,
+                        pixel=[pixel],
+                    ),
+                    "image",
                 )
                 responses.append(standard_response_with_confirmation)
 
@@ -2,6 +2,14 @@ from typing import Optional, List
 from pydantic import BaseModel, Field
 
 
+class PhaseTiming(BaseModel):
+    # room, run_pixel, extraction, validation, reference_data or confirmation
+    phase: str
+    # The pixel for run_pixel, ie. AskPlayground
+    name: Optional[str] = None
+    seconds: float
+
+
 class StandardResponse(BaseModel):
     model_name: str
     model_id: str
@@ -10,6 +18,15 @@ class StandardResponse(BaseModel):
     success: bool
     pixel: List[str]
     confirmation_response: Optional[str] = None
+    confirmation_cached: bool = False
+    timings: List[PhaseTiming] = []
+    # Pixels sent again after a transient error, and duplicates sent for slow pixels
+    retries: int = 0
+    hedges: int = 0
+    # Set when a call or the run's deadline ran out before the cell finished
+    timed_out: bool = False
+    # Set when the cell wasn't run because its engine's or provider's circuit is open
+    circuit_open: bool = False
 
 
 class StandardConfirmation(BaseModel):
@@ -17,3 +34,11 @@ class StandardConfirmation(BaseModel):
         ..., description="Explanation of the confirmation"
     )
     confirmed: bool
+
+
+class BatchVerdict(StandardConfirmation):
+    id: str = Field(..., description="Id of the response this verdict is for")
+
+
+class BatchConfirmation(BaseModel):
+    verdicts: List[BatchVerdict]
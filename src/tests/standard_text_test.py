@@ -4,6 +4,7 @@ from src.pixels.pixel_maker import PixelSelections
 from src.tests.response_models import StandardResponse
 from src.tests.abstract_tests import AbstractTests
 from src.utils.models import DeploymentKeys
+from src.utils.deadline import Deadline
 
 
 class StandardTextTest(AbstractTests):
@@ -11,13 +12,16 @@ class StandardTextTest(AbstractTests):
     Standard Text Test: Most basic test to check if the model can respond to a simple text prompt.
     """
 
+    SELECTIONS = {"prompt": "What is the capital of France?"}
+
     def __init__(
         self,
         models: list[Model],
         deployment_keys: DeploymentKeys,
         confirmer_model: Optional[str] = "gpt-4.1-nano",
+        deadline: Optional[Deadline] = None,
     ):
-        super().__init__(models, deployment_keys, confirmer_model)
+        super().__init__(models, deployment_keys, confirmer_model, deadline)
 
     def test(self) -> list[StandardResponse]:
         responses = []
@@ -25,12 +29,12 @@ class StandardTextTest(AbstractTests):
             selections = PixelSelections(
                 room_id=self.room_id,
                 model_id=model.id,
-                prompt="What is the capital of France?",
+                **self.SELECTIONS,
             )
             pixel = self.pixel_maker.create_ask_playground_pixel(selections)
 
             try:
-                response = self.semoss_client.run_pixel(pixel)
+                response = self.run_pixel(pixel)
                 standard_response = StandardResponse(
                     model_name=model.name,
                     model_id=model.id,
@@ -1,9 +1,44 @@
+import os
 from typing import Optional
+from src.confirmations.json_schema import compile_schema, validate_json
 from src.utils.models import Model
 from src.pixels.pixel_maker import PixelSelections
 from src.tests.response_models import StandardResponse
 from src.tests.abstract_tests import AbstractTests
 from src.utils.models import DeploymentKeys
+from src.utils.deadline import Deadline
+from src.utils.timings import timed
+
+
+PLAYERS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "players": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string"},
+                    "position": {"type": "string"},
+                    "country": {"type": "string"},
+                    "skill": {"type": "integer"},
+                },
+                "required": [
+                    "name",
+                    "position",
+                    "country",
+                    "skill",
+                ],
+            },
+        }
+    },
+    "required": ["players"],
+}
+
+PLAYERS_VALIDATOR = compile_schema(PLAYERS_SCHEMA)
+
+# The schema check is deterministic, the confirmer model only adds a check of the content
+JSON_SEMANTIC_CHECK = os.getenv("JSON_SEMANTIC_CHECK", "false").lower() == "true"
 
 
 class StructuredJSONTest(AbstractTests):
@@ -11,13 +46,19 @@ class StructuredJSONTest(AbstractTests):
     Structured JSON Test: Tests the model's ability to process and respond to prompts that require structured JSON outputs.
     """
 
+    SELECTIONS = {
+        "prompt": "Name a few Manchester United players you know with their positions, countries, and skill ratings.",
+        "param_dict": {"schema": PLAYERS_SCHEMA},
+    }
+
     def __init__(
         self,
         models: list[Model],
         deployment_keys: DeploymentKeys,
         confirmer_model: Optional[str] = "gpt-4.1-nano",
+        deadline: Optional[Deadline] = None,
     ):
-        super().__init__(models, deployment_keys, confirmer_model)
+        super().__init__(models, deployment_keys, confirmer_model, deadline)
 
     def test(self) -> list[StandardResponse]:
         responses = []
@@ -25,52 +66,30 @@ class StructuredJSONTest(AbstractTests):
             selections = PixelSelections(
                 room_id=self.room_id,
                 model_id=model.id,
-                prompt="Name a few Manchester United players you know with their positions, countries, and skill ratings.",
-                param_dict={
-                    "schema": {
-                        "type": "object",
-                        "properties": {
-                            "players": {
-                                "type": "array",
-                                "items": {
-                                    "type": "object",
-                                    "properties": {
-                                        "name": {"type": "string"},
-                                        "position": {"type": "string"},
-                                        "country": {"type": "string"},
-                                        "skill": {"type": "integer"},
-                                    },
-                                    "required": [
-                                        "name",
-                                        "position",
-                                        "country",
-                                        "skill",
-                                    ],
-                                },
-                            }
-                        },
-                        "required": ["players"],
-                    }
-                },
+                **self.SELECTIONS,
             )
             pixel = self.pixel_maker.create_ask_playground_pixel(selections)
 
             try:
-                response = self.semoss_client.run_pixel(pixel)
+                response = self.run_pixel(pixel)
                 text_response = self._extract_text_response(response)
-                confirmation = self.openai_confirmer.confirm_json_structure(
-                    text_response
-                )
-
+                with timed(self.timings, "validation"):
+                    errors = validate_json(text_response, PLAYERS_VALIDATOR)
                 standard_response = StandardResponse(
                     model_name=model.name,
                     model_id=model.id,
                     client=model.client,
                     response=text_response,
-                    success=confirmation.confirmed,
+                    success=not errors,
                     pixel=[pixel],
-                    confirmation_response=confirmation.confirmation_response,
+                    confirmation_response=(
+                        "Schema validation failed: " + "; ".join(errors)
+                        if errors
+                        else "Response matches the schema."
+                    ),
                 )
+                if not errors and JSON_SEMANTIC_CHECK:
+                    standard_response = self.confirm(standard_response, "json_structure")
                 responses.append(standard_response)
             except Exception as e:
                 standard_response = StandardResponse(
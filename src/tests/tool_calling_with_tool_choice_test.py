@@ -4,6 +4,8 @@ from src.pixels.pixel_maker import PixelSelections
 from src.tests.response_models import StandardResponse
 from src.tests.abstract_tests import AbstractTests
 from src.utils.models import DeploymentKeys
+from src.utils.deadline import Deadline
+from src.utils.constants import REFERENCE_TICKER
 
 
 class ToolCallingWithToolChoiceTest(AbstractTests):
@@ -11,13 +13,35 @@ class ToolCallingWithToolChoiceTest(AbstractTests):
     Tool Calling with Tool Choice Test: Tests the model's ability to call a tool with tool choice set to AUTO.
     """
 
+    ROOM_OPTIONS = {
+        "instructions": "",
+        "mcp": [
+            {
+                "id": "29e9e371-9243-4293-ad3b-4be08ef95ab5",
+                "type": "PROJECT",
+                "name": "MCP",
+            }
+        ],
+        "temperature": 0.3,
+    }
+    SELECTIONS = {
+        "mcp_tool_id": "29e9e371-9243-4293-ad3b-4be08ef95ab5",
+        "prompt": f"What is the price of {REFERENCE_TICKER}?",
+        "param_dict": {"tool_choice": {"type": "AUTO"}},
+    }
+
+    @classmethod
+    def definition(cls) -> dict:
+        return {**super().definition(), "room_options": cls.ROOM_OPTIONS}
+
     def __init__(
         self,
         models: list[Model],
         deployment_keys: DeploymentKeys,
         confirmer_model: Optional[str] = "gpt-4.1-nano",
+        deadline: Optional[Deadline] = None,
     ):
-        super().__init__(models, deployment_keys, confirmer_model)
+        super().__init__(models, deployment_keys, confirmer_model, deadline)
 
     def test(self) -> list[StandardResponse]:
         responses = []
@@ -25,24 +49,14 @@ class ToolCallingWithToolChoiceTest(AbstractTests):
         for model in self.models:
             room_id = self.room_id
             model_id = model.id
-            instructions = {
-                "instructions": "",
-                "mcp": [
-                    {
-                        "id": "29e9e371-9243-4293-ad3b-4be08ef95ab5",
-                        "type": "PROJECT",
-                        "name": "MCP",
-                    }
-                ],
-                "temperature": 0.3,
-            }
+            instructions = self.ROOM_OPTIONS
 
             update_room_pixel = (
                 f'UpdateRoomOptions(roomId="{room_id}", roomOptions=[{instructions}]);'
             )
 
             try:
-                update_room_response = self.semoss_client.run_pixel(update_room_pixel)
+                update_room_response = self.run_pixel(update_room_pixel)
                 print(update_room_response)
                 if not update_room_response:
                     responses.append(
@@ -73,9 +87,7 @@ class ToolCallingWithToolChoiceTest(AbstractTests):
             selections = PixelSelections(
                 room_id=self.room_id,
                 model_id=model.id,
-                mcp_tool_id="29e9e371-9243-4293-ad3b-4be08ef95ab5",
-                prompt="What is the price of META?",
-                param_dict={"tool_choice": {"type": "AUTO"}},
+                **self.SELECTIONS,
             )
 
             ask_playground_pixel = self.pixel_maker.create_ask_playground_pixel(
@@ -84,7 +96,7 @@ class ToolCallingWithToolChoiceTest(AbstractTests):
             print(f"Running MCP Tool Pixel: {ask_playground_pixel}")
 
             try:
-                ask_playground_response = self.semoss_client.run_pixel(
+                ask_playground_response = self.run_pixel(
                     ask_playground_pixel
                 )
                 responseMessage = ask_playground_response.get("responseMessage", None)
@@ -111,7 +123,7 @@ class ToolCallingWithToolChoiceTest(AbstractTests):
                 run_mcp_tool_pixel = f'RunMCPTool(project=["29e9e371-9243-4293-ad3b-4be08ef95ab5"], function=["{function_name}"], paramValues=[{param_values}])'
 
                 try:
-                    run_mcp_tool_response = self.semoss_client.run_pixel(
+                    run_mcp_tool_response = self.run_pixel(
                         run_mcp_tool_pixel
                     )
                     if not run_mcp_tool_response:
@@ -150,7 +162,7 @@ class ToolCallingWithToolChoiceTest(AbstractTests):
                 add_tool_execution_pixel = f'AddToolExecution(engine=["{model_id}"], roomId=["{room_id}"], toolId=["{tool_call_id}"], toolName=["{function_name}"], tool_execution_response=["{run_mcp_tool_response}"])'
 
                 try:
-                    add_tool_execution_response = self.semoss_client.run_pixel(
+                    add_tool_execution_response = self.run_pixel(
                         add_tool_execution_pixel
                     )
                     if not add_tool_execution_response:
@@ -199,23 +211,21 @@ class ToolCallingWithToolChoiceTest(AbstractTests):
                 else:
                     response = self._extract_text_response(ask_playground_response)
 
-                confirmation = self.openai_confirmer.confirm_tool_calling_response(
-                    response
-                )
-
-                standard_response_with_confirmation = StandardResponse(
-                    model_name=model.name,
-                    model_id=model.id,
-                    client=model.client,
-                    response=response,
-                    success=confirmation.confirmed,
-                    pixel=[
-                        update_room_pixel,
-                        ask_playground_pixel,
-                        run_mcp_tool_pixel,
-                        add_tool_execution_pixel,
-                    ],
-                    confirmation_response=confirmation.confirmation_response,
+                standard_response_with_confirmation = self.confirm(
+                    StandardResponse(
+                        model_name=model.name,
+                        model_id=model.id,
+                        client=model.client,
+                        response=response,
+                        success=True,
+                        pixel=[
+                            update_room_pixel,
+                            ask_playground_pixel,
+                            run_mcp_tool_pixel,
+                            add_tool_execution_pixel,
+                        ],
+                    ),
+                    "tool_calling",
                 )
                 responses.append(standard_response_with_confirmation)
 
@@ -1 +1,4 @@
 CREATE_ROOM_PIXEL = "CreateRoom();"
+DELETE_ROOM_PIXEL = 'RemoveUserRoom(roomId=["{room_id}"]);'
+# Ticker the tool calling test asks for and the confirmer checks the price of
+REFERENCE_TICKER = "META"
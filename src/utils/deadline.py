@@ -0,0 +1,61 @@
+import os
+import time
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+class Timeouts(BaseModel):
+    """Per-call timeouts, and the default deadline of a run, None means no limit."""
+
+    pixel_seconds: Optional[float] = Field(120.0, gt=0)
+    confirmation_seconds: Optional[float] = Field(60.0, gt=0)
+    run_seconds: Optional[float] = Field(None, gt=0)
+
+
+class Deadline:
+    """
+    The point in time a run must finish by, shared by every cell of the run so each call
+    is limited by the run's remaining budget as well as its own timeout.
+    """
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.seconds = seconds
+        self.expires_at = None if seconds is None else time.monotonic() + seconds
+
+    def remaining(self) -> Optional[float]:
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+    def cap(self, seconds: Optional[float]) -> Optional[float]:
+        """seconds, or the remaining budget if that's shorter."""
+        remaining = self.remaining()
+        if remaining is None:
+            return seconds
+        return remaining if seconds is None else min(seconds, remaining)
+
+    def timeout(self, phase_seconds: Optional[float]) -> Optional[float]:
+        """The timeout for a call of the phase, raises once there's no budget left."""
+        if self.expired:
+            raise DeadlineExceeded(f"Run deadline of {self.seconds:g}s expired")
+        return self.cap(phase_seconds)
+
+
+def _optional_seconds(name: str, default: Optional[str]) -> Optional[float]:
+    value = os.getenv(name, default)
+    return float(value) if value and float(value) > 0 else None
+
+
+timeouts = Timeouts(
+    pixel_seconds=_optional_seconds("PIXEL_TIMEOUT_SECONDS", "120"),
+    confirmation_seconds=_optional_seconds("CONFIRMATION_TIMEOUT_SECONDS", "60"),
+    run_seconds=_optional_seconds("RUN_DEADLINE_SECONDS", None),
+)
@@ -0,0 +1,222 @@
+import bisect
+import math
+import threading
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# Seconds, from a cached confirmation up to the slowest reasoning models
+DEFAULT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+Sample = Tuple[Dict[str, str], float]
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def render_family(
+    name: str, metric_type: str, help_text: str, samples: Iterable[Sample]
+) -> List[str]:
+    """A metric family in the Prometheus text exposition format."""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+    for labels, value in samples:
+        lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+    return lines
+
+
+class _Metric:
+    metric_type = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: tuple) -> tuple:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {labels}")
+        return tuple(str(label) for label in labels)
+
+    def _labels(self, key: tuple) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+
+class Counter(_Metric):
+    metric_type = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1.0):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return render_family(
+            self.name,
+            self.metric_type,
+            self.help_text,
+            [(self._labels(key), value) for key, value in values],
+        )
+
+
+class Gauge(Counter):
+    metric_type = "gauge"
+
+    def dec(self, *labels, amount: float = 1.0):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels, value: float):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: the count of each bucket (not cumulative, the last is +Inf), sum
+        self._values: Dict[tuple, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.setdefault(
+                key, ([0] * (len(self.buckets) + 1), [0.0])
+            )
+            counts[index] += 1
+            total[0] += value
+
+    def collect(self) -> List[str]:
+        with self._lock:
+            values = [
+                (key, list(counts), total[0]) for key, (counts, total) in self._values.items()
+            ]
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for key, counts, total in values:
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, count in zip([*self.buckets, math.inf], counts):
+                cumulative += count
+                bucket_labels = _format_labels({**labels, "le": _format_value(bound)})
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+
+class Registry:
+    """
+    The metrics the runner records as it goes. Pool and queue sizes that are already
+    tracked elsewhere are read from their stats() when scraped instead.
+    """
+
+    def __init__(self):
+        self.metrics: List[_Metric] = []
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help_text, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def _register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def collect(self) -> List[str]:
+        return [line for metric in self.metrics for line in metric.collect()]
+
+
+registry = Registry()
+
+cells_total = registry.counter(
+    "playground_cells_total",
+    "Finished model x test cells, by outcome (passed or failed)",
+    ["model", "test", "provider", "outcome"],
+)
+cell_seconds = registry.histogram(
+    "playground_cell_seconds",
+    "Time a cell spent on its phases, confirmation included",
+    ["model", "test", "provider"],
+)
+cells_in_flight = registry.gauge(
+    "playground_cells_in_flight",
+    "Cells generating on a cell worker thread",
+    ["engine"],
+)
+cell_workers = registry.gauge(
+    "playground_cell_workers",
+    "Cell worker threads available, in_flight / workers is the pools' occupancy",
+    ["engine"],
+)
+pixels_total = registry.counter(
+    "playground_pixels_total",
+    "Pixels sent to SEMOSS, by outcome (ok, error, rate_limited or timed_out)",
+    ["provider", "pixel", "outcome"],
+)
+pixel_seconds = registry.histogram(
+    "playground_pixel_seconds",
+    "Pixel round trip time",
+    ["provider", "pixel"],
+)
+pixel_retries_total = registry.counter(
+    "playground_pixel_retries_total",
+    "Pixels sent again after a transient error",
+    ["provider", "pixel"],
+)
+pixel_hedges_total = registry.counter(
+    "playground_pixel_hedges_total",
+    "Hedged pixels, by which request answered first (primary or hedge)",
+    ["provider", "pixel", "winner"],
+)
+confirmations_total = registry.counter(
+    "playground_confirmations_total",
+    "Confirmed cells, by outcome (confirmed, rejected, error or offline)",
+    ["kind", "outcome"],
+)
+confirmer_seconds = registry.histogram(
+    "playground_confirmer_seconds",
+    "Confirmer request latency, a batched request is observed once",
+    ["kind", "mode"],
+)
+confirmer_errors_total = registry.counter(
+    "playground_confirmer_errors_total",
+    "Confirmer requests that raised",
+    ["kind", "mode"],
+)
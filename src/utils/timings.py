@@ -0,0 +1,79 @@
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from src.tests.response_models import PhaseTiming, StandardResponse
+from src.utils.tracing import tracer
+
+
+@contextmanager
+def timed(
+    timings: List[PhaseTiming], phase: str, name: Optional[str] = None, **attributes
+) -> Iterator[None]:
+    """
+    Appends how long the block took to timings, whether or not it raised. When the run is
+    traced the block is also a span, with attributes.
+    """
+    start = time.perf_counter()
+    try:
+        with tracer.span(name or phase, category=phase, **attributes):
+            yield
+    finally:
+        timings.append(
+            PhaseTiming(phase=phase, name=name, seconds=time.perf_counter() - start)
+        )
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile, 0 for no values."""
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, round(pct / 100 * len(values)) - 1))
+    return values[index]
+
+
+def _summarize(samples: Dict[str, List[float]]) -> Dict[str, dict]:
+    return {
+        phase: {
+            "count": len(seconds),
+            "p50": percentile(seconds, 50),
+            "p95": percentile(seconds, 95),
+        }
+        for phase, seconds in samples.items()
+    }
+
+
+def summarize_timings(
+    cells: Iterable[Tuple[str, str, StandardResponse]],
+) -> dict:
+    """
+    p50/p95 seconds of each phase, per model and per test, from (model name, test,
+    response) cells. "total" is the sum of a cell's phases.
+    """
+    by_model: Dict[str, Dict[str, List[float]]] = defaultdict(lambda: defaultdict(list))
+    by_test: Dict[str, Dict[str, List[float]]] = defaultdict(lambda: defaultdict(list))
+    for model_name, test, response in cells:
+        if not response.timings:
+            continue
+        phases: Dict[str, float] = defaultdict(float)
+        for timing in response.timings:
+            phases[timing.phase] += timing.seconds
+        phases["total"] = sum(timing.seconds for timing in response.timings)
+        for phase, seconds in phases.items():
+            by_model[model_name][phase].append(seconds)
+            by_test[test][phase].append(seconds)
+    return {
+        "by_model": {model: _summarize(phases) for model, phases in by_model.items()},
+        "by_test": {test: _summarize(phases) for test, phases in by_test.items()},
+    }
+
+
+def summarize_result_timings(results: Dict[str, Iterable]) -> dict:
+    """summarize_timings of a run's results, test results keyed by model name."""
+    return summarize_timings(
+        (model_name, test, response)
+        for model_name, test_results in results.items()
+        for test, response in test_results
+        if response is not None
+    )
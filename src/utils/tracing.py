@@ -0,0 +1,257 @@
+import itertools
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+CORRELATION_HEADER = "X-Correlation-ID"
+
+# Set per request by the server, and inherited by the runs, tasks and threads it starts
+correlation_id: ContextVar[Optional[str]] = ContextVar("correlation_id", default=None)
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+def new_correlation_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+def current_span() -> Optional["Span"]:
+    return _current_span.get()
+
+
+class Span:
+    """
+    A timed operation within a trace. Spans are drawn on the track of their parent unless
+    they start their own, ie. one track per model and one per cell.
+    """
+
+    __slots__ = (
+        "trace",
+        "name",
+        "category",
+        "span_id",
+        "parent_id",
+        "track",
+        "attributes",
+        "thread",
+        "start",
+        "end_time",
+    )
+
+    def __init__(
+        self,
+        trace: "Trace",
+        name: str,
+        parent: Optional["Span"],
+        category: Optional[str] = None,
+        track: Optional[str] = None,
+        attributes: Optional[dict] = None,
+    ):
+        self.trace = trace
+        self.name = name
+        self.category = category or name
+        self.span_id = next(trace.ids)
+        self.parent_id = parent.span_id if parent else None
+        self.track = track or (parent.track if parent else name)
+        self.attributes = attributes or {}
+        self.thread = threading.current_thread().name
+        self.start = time.perf_counter()
+        self.end_time: Optional[float] = None
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def end(self):
+        if self.end_time is None:
+            self.end_time = time.perf_counter()
+            self.trace.add(self)
+
+
+class Trace:
+    """The spans of one run, collected until the run finishes."""
+
+    def __init__(self, name: str, correlation_id: str, attributes: dict):
+        self.correlation_id = correlation_id
+        self.started_at = time.time()
+        self.ids = itertools.count(1)
+        self.spans: List[Span] = []
+        self.closed = False
+        self._lock = threading.Lock()
+        self.root = Span(self, name, None, track=name, attributes=attributes)
+
+    def add(self, span: Span):
+        with self._lock:
+            # Spans of cells abandoned by a cancelled run may end after it was written
+            if not self.closed:
+                self.spans.append(span)
+
+    def close(self):
+        with self._lock:
+            self.closed = True
+
+    def to_chrome(self) -> dict:
+        """The trace in Chrome's Trace Event Format, which Perfetto opens directly."""
+        origin = self.root.start
+        tracks = {}
+        events = []
+        for span in sorted(self.spans, key=lambda span: span.start):
+            tid = tracks.setdefault(span.track, len(tracks) + 1)
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": span.category,
+                    "ph": "X",
+                    "ts": (span.start - origin) * 1e6,
+                    "dur": (span.end_time - span.start) * 1e6,
+                    "pid": 1,
+                    "tid": tid,
+                    "args": {
+                        **span.attributes,
+                        "span_id": span.span_id,
+                        "parent_id": span.parent_id,
+                        "thread": span.thread,
+                    },
+                }
+            )
+        metadata = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": 1,
+                "args": {"name": f"run {self.correlation_id}"},
+            }
+        ]
+        for track, tid in tracks.items():
+            metadata.append(
+                {"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": track}}
+            )
+            metadata.append(
+                {
+                    "name": "thread_sort_index",
+                    "ph": "M",
+                    "pid": 1,
+                    "tid": tid,
+                    "args": {"sort_index": tid},
+                }
+            )
+        return {
+            "traceEvents": metadata + events,
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "correlation_id": self.correlation_id,
+                "started_at": self.started_at,
+            },
+        }
+
+
+class Tracer:
+    """
+    Records run, model, cell, pixel and confirmation spans, and writes each run to its own
+    trace file in directory, to open in https://ui.perfetto.dev or chrome://tracing.
+
+    Tracing is off without a directory: no trace is started, so there's never a current
+    span and every span() is a no-op.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self.traces_written = 0
+        self.last_trace: Optional[str] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.directory)
+
+    def start_trace(self, name: str = "run", **attributes) -> Optional[Span]:
+        """Starts a run's trace and returns its root span, None when tracing is off."""
+        if not self.enabled:
+            return None
+        trace_correlation_id = correlation_id.get() or new_correlation_id()
+        attributes["correlation_id"] = trace_correlation_id
+        return Trace(name, trace_correlation_id, attributes).root
+
+    def finish_trace(self, root: Optional[Span]) -> Optional[str]:
+        """Ends the root span and writes the trace, returns the file it was written to."""
+        if root is None:
+            return None
+        root.end()
+        trace = root.trace
+        trace.close()
+        path = os.path.join(
+            self.directory,
+            f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(trace.started_at))}"
+            f"-{trace.correlation_id}-{uuid.uuid4().hex[:6]}.trace.json",
+        )
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path, "w") as trace_file:
+                json.dump(trace.to_chrome(), trace_file)
+        except OSError as e:
+            print(f"Failed to write trace {path}: {e}")
+            return None
+        with self._lock:
+            self.traces_written += 1
+            self.last_trace = path
+        return path
+
+    def start_span(
+        self,
+        name: str,
+        parent: Optional[Span],
+        category: Optional[str] = None,
+        track: Optional[str] = None,
+        **attributes,
+    ) -> Optional[Span]:
+        """A span that's ended explicitly, for operations that span threads or callbacks."""
+        if parent is None:
+            return None
+        return Span(parent.trace, name, parent, category, track, attributes)
+
+    @contextmanager
+    def span(
+        self, name: str, category: Optional[str] = None, **attributes
+    ) -> Iterator[Optional[Span]]:
+        """Times the block as a child of the current span, if there is one."""
+        parent = _current_span.get()
+        if parent is None:
+            yield None
+            return
+        span = Span(parent.trace, name, parent, category, attributes=attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set(error=f"{type(e).__name__}: {e}"[:500])
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+
+    @contextmanager
+    def activate(self, span: Optional[Span]) -> Iterator[None]:
+        """Makes span the current span in this thread, ie. a cell's span in its worker."""
+        if span is None:
+            yield
+            return
+        token = _current_span.set(span)
+        try:
+            yield
+        finally:
+            _current_span.reset(token)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "directory": self.directory,
+                "traces_written": self.traces_written,
+                "last_trace": self.last_trace,
+            }
+
+
+tracer = Tracer(os.getenv("TRACE_DIR") or None)